@@ -0,0 +1,114 @@
+import os
+from typing import Dict
+
+import requests
+
+from .file_utils import read_json, write_json_atomic
+
+
+class ApiDocumentCache:
+    """
+    On-disk cache for the OpenAPI document of the ZOO-Project.
+
+    The document is stored together with the ETag and Last-Modified headers of the
+    response that delivered it. Later runs revalidate the cached copy with a conditional
+    GET and only download the document again if the server reports a change.
+
+    :param cache_dir: Directory in which the document and its headers are stored.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        self.document_path = os.path.join(cache_dir, "api.json")
+        self.headers_path = os.path.join(cache_dir, "api.headers.json")
+
+    def retrieve(self, url: str, session=requests) -> Dict | None:
+        """
+        Retrieve the API document, revalidating the cached copy if one exists.
+
+        Args:
+            url (str): The URL of the API document.
+            session: Object providing ``get``, either the requests module or a requests.Session.
+
+        Returns:
+            dict or None: The API document, or None if it is neither retrievable nor cached.
+        """
+        cached_headers = self.load_headers(url=url)
+        cached_document = self.load_document() if cached_headers else None
+        request_headers = self.get_conditional_headers(cached_headers) if cached_document is not None else {}
+
+        try:
+            response = session.get(url, headers=request_headers, timeout=60)
+            if response.status_code == 304:
+                return cached_document
+            response.raise_for_status()
+            document = response.json()
+        except requests.exceptions.RequestException as e:
+            print("Failed to retrieve API document:", e)
+            if cached_document is not None:
+                print("Using cached API document from", self.document_path)
+            return cached_document
+
+        self.store(document=document, headers=response.headers, url=url)
+        return document
+
+    def get_conditional_headers(self, cached_headers: Dict) -> Dict:
+        """
+        Build the request headers of a conditional GET from the cached validators.
+
+        Args:
+            cached_headers (dict): The stored ETag and Last-Modified values.
+
+        Returns:
+            dict: The If-None-Match and If-Modified-Since headers that are available.
+        """
+        headers = {}
+        if cached_headers.get("etag"):
+            headers["If-None-Match"] = cached_headers["etag"]
+        if cached_headers.get("last_modified"):
+            headers["If-Modified-Since"] = cached_headers["last_modified"]
+        return headers
+
+    def load_headers(self, url: str) -> Dict | None:
+        """
+        Load the cached validators, or None if there is no usable cache entry.
+
+        An entry stored for another URL is not usable, so that a cache directory reused
+        against another server never returns the document of the first one.
+        """
+        headers = read_json(self.headers_path)
+        if not headers or not (headers.get("etag") or headers.get("last_modified")):
+            return None
+        if headers.get("url") != url:
+            return None
+        return headers
+
+    def load_document(self) -> Dict | None:
+        """
+        Load the cached API document, or None if it is missing or unreadable.
+        """
+        return read_json(self.document_path)
+
+    def store(self, document: Dict, headers, url: str):
+        """
+        Store the API document and its validators in the cache directory.
+
+        Nothing is stored if the server sent neither ETag nor Last-Modified, because the
+        copy could never be revalidated.
+
+        Args:
+            document (dict): The API document.
+            headers: The response headers of the request that delivered the document.
+            url (str): The URL of the API document.
+        """
+        validators = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+        }
+        if not (validators["etag"] or validators["last_modified"]):
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # The document is written first, so that headers never describe a missing document
+        write_json_atomic(self.document_path, document)
+        write_json_atomic(self.headers_path, validators)
@@ -0,0 +1,55 @@
+from typing import Dict, List
+
+
+class ApiPathIndex:
+    """
+    Index of the OpenAPI paths of the ZOO-Project by process ID.
+
+    The index is built once when the API document is loaded. Afterwards the path entry and
+    the test examples of a process are found with a dictionary lookup instead of scanning
+    and splitting every path of the document for each tool.
+
+    :param paths: The "paths" object of the OpenAPI document.
+    """
+
+    def __init__(self, paths: Dict) -> None:
+        self.path_entries = {}
+        self.examples = {}
+        for path, path_entry in paths.items():
+            parts = path.split("/")
+            # Keep the first matching path, as the linear scan over the document did
+            if len(parts) > 2 and parts[2] not in self.path_entries:
+                self.path_entries[parts[2]] = path_entry
+        for process, path_entry in self.path_entries.items():
+            self.examples[process] = self.extract_examples(path_entry)
+
+    def get_path_entry(self, process: str) -> Dict | None:
+        """
+        Return the OpenAPI path entry of a process, or None if the process has no path.
+        """
+        return self.path_entries.get(process)
+
+    def get_examples(self, process: str) -> List | None:
+        """
+        Return the example execution payloads of a process, or None if the process has no path.
+        """
+        return self.examples.get(process)
+
+    @staticmethod
+    def extract_examples(path_entry: Dict) -> List:
+        """
+        Extract the example values of the execution request body of a path entry.
+
+        Args:
+            path_entry (dict): The OpenAPI path entry of a process.
+
+        Returns:
+            list: A list of example values.
+        """
+        post_data = path_entry.get("post", {})
+        request_body = post_data.get("requestBody", {})
+        content = request_body.get("content", {})
+        json_content = content.get("application/json", {})
+        examples_dict = json_content.get("examples", {})
+
+        return [example.get("value") for example in examples_dict.values()]
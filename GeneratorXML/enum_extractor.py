@@ -0,0 +1,106 @@
+from typing import Dict, List
+
+# Keywords with lists of subschemas, in the reverse of the order they are searched
+REVERSED_SUBSCHEMA_LIST_KEYWORDS = ("anyOf", "oneOf", "allOf")
+
+
+class EnumExtractor:
+    """
+    Collect the enum values of a JSON schema, like the media types of an extended schema.
+
+    The schema is walked with an explicit stack instead of recursion, so that deeply nested
+    schemas cannot exceed the recursion limit. A subschema with an `enum` contributes its values,
+    and the search continues in `properties`, `allOf`, `oneOf`, `anyOf`, `items` and local `$ref`
+    references (`#/...`), in this order. Every subschema is visited at most once, so reference
+    cycles terminate. The values are returned once each, in the order they are found.
+
+    The result of every schema is cached by identity, so that a schema that is looked up again,
+    for example by the ProcessIRBuilder of every tool of a batch, is walked only once.
+    """
+
+    def __init__(self) -> None:
+        # id(schema) -> (schema, values). The schema is kept so that its id is not reused.
+        self.cache = {}
+
+    def extract(self, schema: Dict) -> List:
+        """
+        Return the enum values of a schema.
+
+        Args:
+            schema (dict): The JSON schema to search.
+
+        Returns:
+            list: The de-duplicated enum values in the order they are found.
+        """
+        entry = self.cache.get(id(schema))
+        if entry is None or entry[0] is not schema:
+            entry = (schema, tuple(self.walk(schema)))
+            self.cache[id(schema)] = entry
+        return list(entry[1])
+
+    def walk(self, root: Dict) -> List:
+        """
+        Walk a schema depth-first and collect its enum values.
+        """
+        values = []
+        seen_values = set()
+        visited = set()
+        stack = [root]
+        while stack:
+            schema = stack.pop()
+            if not isinstance(schema, dict) or id(schema) in visited:
+                continue
+            visited.add(id(schema))
+
+            enum = schema.get("enum")
+            if enum is not None:
+                for value in enum:
+                    if type(value) is str:
+                        key = value
+                    else:
+                        # The type is part of the key, so that 1 and True stay apart. Lists and objects are unhashable.
+                        key = (type(value), value if isinstance(value, (int, float)) or value is None else repr(value))
+                    if key not in seen_values:
+                        seen_values.add(key)
+                        values.append(value)
+                continue
+
+            # Subschemas are pushed in reverse, so that they are popped in search order
+            reference = schema.get("$ref")
+            if isinstance(reference, str):
+                stack.append(self.resolve_reference(reference, root))
+            items = schema.get("items")
+            if isinstance(items, list):
+                stack.extend(reversed(items))
+            elif items is not None:
+                stack.append(items)
+            for keyword in REVERSED_SUBSCHEMA_LIST_KEYWORDS:
+                subschemas = schema.get(keyword)
+                if subschemas:
+                    stack.extend(reversed(subschemas))
+            properties = schema.get("properties")
+            if isinstance(properties, dict):
+                stack.extend(reversed(properties.values()))
+        return values
+
+    def resolve_reference(self, reference: str, root: Dict):
+        """
+        Resolve a local reference like `#/definitions/format` against the root schema.
+
+        Returns:
+            The referenced subschema, or None if the reference is not local or does not exist.
+        """
+        if not reference.startswith("#"):
+            return None
+        target = root
+        for part in reference[1:].split("/"):
+            if not part:
+                continue
+            part = part.replace("~1", "/").replace("~0", "~")
+            if isinstance(target, dict):
+                target = target.get(part)
+            elif isinstance(target, list) and part.isdigit() and int(part) < len(target):
+                target = target[int(part)]
+            else:
+                return None
+        return target
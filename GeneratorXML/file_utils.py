@@ -0,0 +1,41 @@
+import json
+import os
+import tempfile
+from typing import Any
+
+
+def read_json(file_path: str) -> Any:
+    """
+    Read a JSON file, returning None if it does not exist or cannot be parsed.
+
+    Args:
+        file_path (str): The path of the JSON file.
+
+    Returns:
+        Any: The parsed data, or None.
+    """
+    try:
+        with open(file_path, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json_atomic(file_path: str, data: Any):
+    """
+    Write a JSON file atomically by writing a temporary file and renaming it.
+
+    Readers either see the previous file or the complete new file, never a partial write.
+
+    Args:
+        file_path (str): The path of the JSON file.
+        data (Any): The JSON-serialisable data.
+    """
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(file_path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "w") as file:
+            json.dump(data, file)
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
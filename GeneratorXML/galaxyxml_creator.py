@@ -1,12 +1,25 @@
 import re
-import math
 import os
 from typing import Dict, List
 
-from galaxyxml import tool
 import galaxyxml.tool.parameters as gtpx
 
+from .api_path_index import ApiPathIndex
+from .enum_extractor import EnumExtractor
 from .macros_xml_generator import MacrosXMLGenerator
+from .process_ir import OUTPUT_TYPE, CommandLineEmitter, GalaxyXmlEmitter, ProcessIR, ProcessIRBuilder, TestEmitter
+from .schema_resolver import SchemaResolver
+from .xml_stream_writer import StreamingTool
+
+# Galaxy datatypes of the media types whose datasets create_api_json.py sends inline
+INLINE_DATATYPES = {
+    "image/tiff": "tiff",
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/gif": "gif",
+    "application/pdf": "pdf",
+    "application/zip": "zip",
+}
 
 
 class GalaxyXmlTool:
@@ -22,22 +35,28 @@ class GalaxyXmlTool:
 
     - **executable**: Path to the executable script for creating API JSON.
     - **macros_file_name**: Path to the macros file associated with the tool.
-    - **gxt**: An instance of the `tool.Tool` class, initialized with the provided parameters and additional defaults.
+    - **gxt**: An instance of the `StreamingTool` class, initialized with the provided parameters and additional defaults.
     - **tool_name**: The identifier of the tool.
     - **version**: The version of the tool.
     - **version_suffix**: A suffix for the tool version, defaulting to "0".
     - **gxtp**: An external `gtpx` parameter (please provide its description if needed).
-    - **executable_dict**: A dictionary to store executable-related data.
-    - **output_type_dictionary**: A dictionary to store output type information.
+    - **process_ir**: The intermediate representation of the inputs and outputs, set by `create_params`.
     - **output_type**: A string indicating the output type, defaulting to "outputType".
-    - **output_name_list**: A list to store output names.
     - **output_data**: A string indicating the output data, defaulting to "output_data".
+    - **macros_generator**: The in-memory macros file, written once by `commit_macros`.
     """
 
-    def __init__(self, name, id, version, description) -> None:
+    def __init__(
+        self,
+        name,
+        id,
+        version,
+        description,
+        schema_resolver: SchemaResolver | None = None,
+    ) -> None:
         self.executable = "$__tool_directory__/Code/create_api_json.py"
         self.macros_file_name = f"Macros/{name}_macros_.xml"
-        self.gxt = tool.Tool(
+        self.gxt = StreamingTool(
             name=name,
             id=id,
             version="@TOOL_VERSION@+galaxy@VERSION_SUFFIX@",
@@ -49,11 +68,14 @@ class GalaxyXmlTool:
         self.version = version
         self.version_suffix = "0"
         self.gxtp = gtpx
-        self.executable_dict = {}
-        self.output_type_dictionary = {}
-        self.output_type = "outputType"
-        self.output_name_list = []
+        self.process_ir = ProcessIR(inputs=(), outputs=(), transmission_modes=())
+        self.output_type = OUTPUT_TYPE
+        # The files written besides the tool XML, like the macros file and the test inputs
+        self.written_files = []
         self.output_data = "output_data"
+        self.macros_generator = MacrosXMLGenerator()
+        self.enum_extractor = EnumExtractor()
+        self.schema_resolver = schema_resolver
 
     def get_tool(self):
         """
@@ -282,123 +304,45 @@ class GalaxyXmlTool:
 
         return self.gxtp.FloatParam(name=param_name, label=title, help=description, value=default_value)
 
-    def create_data_param(
+    def create_data_param_from_types(
         self,
         param_name: str,
-        param_extended_schema: Dict,
+        media_types: List,
         is_nullable: bool,
-        is_array: bool,
         title: str,
         description: str,
     ):
         """
-        Create a data parameter based on the provided schema and other properties.
+        Create a data parameter that accepts a txt file with links to datasets of the given media types.
 
         Args:
             param_name (str): The name of the parameter.
-            param_extended_schema (Dict): The extended schema for the parameter.
+            media_types (List): The media types the process accepts for the input.
             is_nullable (bool): Indicates if the parameter is nullable.
-            is_array (bool): Indicates if the parameter is an array.
             title (str): The title of the parameter.
             description (str): The description of the parameter.
 
         Returns:
             DataParam: The created data parameter.
         """
-        enum_values = []
-        array_status_key = f"isArray{param_name}"
-        # Extract enum values based on whether the parameter is an array
-        if is_array:
-            self.extract_enum(param_extended_schema.get("items", {}), enum_values)
-            self.executable_dict[array_status_key] = True
-        else:
-            self.extract_enum(param_extended_schema, enum_values)
-            self.executable_dict[array_status_key] = False
-
         # Generate a string of allowed data types from enum values
-        data_types = ", ".join(value.split("/")[-1] for value in enum_values)
+        data_types = ", ".join(value.split("/")[-1] for value in media_types)
+        help_text = f"{description} The following data types are allowed in the txt file: {data_types}"
+
+        # Datasets of these types can be selected directly and are sent inline instead of as links
+        inline_formats = list(dict.fromkeys(INLINE_DATATYPES[value] for value in media_types if value in INLINE_DATATYPES))
+        if inline_formats:
+            help_text += f". Datasets of type {', '.join(inline_formats)} are sent directly."
 
         # Create and return the data parameter
         return self.gxtp.DataParam(
             name=param_name,
             label=title,
-            help=f"{description} The following data types are allowed in the txt file: {data_types}",
-            format="txt",
+            help=help_text,
+            format=",".join(["txt"] + inline_formats),
             optional=is_nullable,
         )
 
-    def create_object_param(
-        self,
-        param_name: str,
-        param_schema: Dict,
-        is_nullable: bool,
-        title: str,
-        description: str,
-    ):
-        """
-        Create an object parameter with the specified schema, title, and description.
-
-        Args:
-            param_name (str): The name of the parameter.
-            param_schema (Dict): The schema of the parameter which includes its properties and required fields.
-            is_nullable (bool): Indicates if the parameter is nullable.
-            title (str): The title of the parameter.
-            description (str): The description of the parameter.
-
-        Returns:
-            section: The section containing the created parameters.
-        """
-        required_fields = param_schema.get("required", [])
-        section = self.create_section(name=param_name, title=title, description=description)
-        for field in required_fields:
-            field_schema = param_schema["properties"][field]
-            field_type = field_schema.get("type")
-            if field_type == "string":
-                param = self.create_select_param(
-                    param_name=field,
-                    param_schema=field_schema,
-                    is_nullable=is_nullable,
-                    param_type_bool=False,
-                    title=field,
-                    description="",
-                )
-            elif field_type == "array":
-                array_items = field_schema.get("items")
-                min_items, max_items = self.get_array_items(field_schema)
-                array_type = array_items.get("type")
-                param = self.create_array_param(
-                    name=field,
-                    item_type=array_type,
-                    min_items=min_items,
-                    max_items=max_items,
-                    title=None,
-                    description=None,
-                    item_name=f"{array_type}Data",
-                )
-            section.append(param)
-
-        return section
-
-    def get_array_items(self, schema: Dict):
-        """
-        Get the minimum and maximum number of items allowed in an array based on the schema.
-
-        Args:
-            schema (Dict): The schema defining the array and its constraints.
-
-        Returns:
-            tuple: A tuple containing the minimum and maximum number of items allowed in the array.
-        """
-        constraints = schema.get("oneOf", [])
-        min_items = math.inf
-        max_items = -math.inf
-
-        for constraint in constraints:
-            max_items = max(max_items, constraint.get("maxItems", -math.inf))
-            min_items = min(min_items, constraint.get("minItems", math.inf))
-
-        return min_items, max_items
-
     def create_array_param(
         self,
         name: str,
@@ -475,6 +419,9 @@ class GalaxyXmlTool:
         Generate parameters based on the provided input, output, and transmission schemas.
         All parameters will be placed in the input tab of the Galaxy XML.
 
+        The schemas are compiled by the ProcessIRBuilder and rendered by the GalaxyXmlEmitter. The
+        intermediate representation is kept in `process_ir` for the outputs, the command and the tests.
+
         Example of XML representation:
         <inputs>
             <param name="input_param" type="data" />
@@ -489,95 +436,14 @@ class GalaxyXmlTool:
         Returns:
         List: A list of generated parameters.
         """
-        inputs = self.gxtp.Inputs()
-        for param_name, param_info in input_schema.items():
-            param_name = self.replace_dot_with_underscore(param_name)
-            param_schema = param_info.get("schema")
-            param_extended_schema = param_info.get("extended-schema")
-            param_type = param_schema.get("type")
-            is_nullable = param_schema.get("nullable", False)
-            title = param_info.get("title")
-            description = param_info.get("description")
-            if title != description:
-                description = f"{title} {description}"
-            title = param_name
-
-            if param_type == "string":
-                if param_schema.get("enum"):
-                    param = self.create_select_param(
-                        param_name=param_name,
-                        param_schema=param_schema,
-                        is_nullable=is_nullable,
-                        param_type_bool=False,
-                        title=title,
-                        description=description,
-                    )
-                else:
-                    param = self.create_text_param(
-                        param_name=param_name,
-                        param_schema=param_schema,
-                        is_nullable=is_nullable,
-                        title=title,
-                        description=description,
-                    )
-            elif param_type == "integer":
-                param = self.create_integer_param(
-                    param_name=param_name,
-                    param_schema=param_schema,
-                    is_nullable=is_nullable,
-                    title=title,
-                    description=description,
-                )
-            elif param_type == "number":
-                param = self.create_float_param(
-                    param_name=param_name,
-                    param_schema=param_schema,
-                    is_nullable=is_nullable,
-                    title=title,
-                    description=description,
-                )
-            elif param_type == "boolean":
-                param = self.create_select_param(
-                    param_name=param_name,
-                    param_schema=param_schema,
-                    is_nullable=is_nullable,
-                    param_type_bool=True,
-                    title=title,
-                    description=description,
-                )
-            elif param_extended_schema is not None:
-                is_array = param_extended_schema.get("type") == "array"
-                is_nullable = param_extended_schema.get("nullable", False)
-                param = self.create_data_param(
-                    param_name=param_name,
-                    param_extended_schema=param_extended_schema,
-                    is_nullable=is_nullable,
-                    is_array=is_array,
-                    title=title,
-                    description=description,
-                )
-            elif param_type == "object":
-                param = self.create_object_param(
-                    param_name=param_name,
-                    param_schema=param_schema,
-                    is_nullable=is_nullable,
-                    title=title,
-                    description=description,
-                )
-
-            else:
-                # Handle unsupported parameter types gracefully
-                print(f"Warning: Parameter '{param_name}' with unsupported type '{param_type}'")
-                continue
-            inputs.append(param)
-        self.choose_prefer(inputs=inputs)
-        self.create_select_raw_param(inputs=inputs)
-        self.create_output_param(
+        builder = ProcessIRBuilder(schema_resolver=self.schema_resolver, enum_extractor=self.enum_extractor)
+        self.process_ir = builder.build_params(
+            input_schema=input_schema,
             output_schema=output_schema,
-            inputs=inputs,
             transmission_schema=transmission_schema,
+            version=self.version,
         )
-        return inputs
+        return GalaxyXmlEmitter(gxt=self).emit_inputs(self.process_ir)
 
     def create_select_raw_param(self, inputs):
         """
@@ -694,142 +560,21 @@ class GalaxyXmlTool:
 
         return section
 
-    def create_output_param(self, output_schema: Dict, inputs: List, transmission_schema: List):
-        """
-        Create output parameters based on provided output schema and transmission schema.
-
-        Args:
-            output_schema (Dict): JSON schema containing output parameters.
-            inputs (List): List of input parameters to which output parameters will be appended.
-                        All input parameters will be in Inputs of the Galaxy XML.
-            transmission_schema (List): JSON schema containing output transmission information.
-
-        Returns:
-            None
-        """
-        for param_name, param_info in output_schema.items():
-            param_name = self.replace_dot_with_underscore(param_name)
-            param_schema = param_info.get("schema")
-            param_extended_schema = param_info.get("extended-schema")
-            param_type = param_schema.get("type")
-            output_param_name = f"{self.output_type}_{param_name}"
-            title = param_info.get("title")
-            description = param_info.get("description")
-            if title != description:
-                description = f"{title} {description}"
-
-            title = param_name
-
-            enum_values = []
-
-            param, enum_values = self.process_output_param(
-                output_param_name=output_param_name,
-                param_extended_schema=param_extended_schema,
-                param_schema=param_schema,
-                param_type=param_type,
-                enum_values=enum_values,
-                title=title,
-                description=description,
-            )
-
-            self.output_type_dictionary[output_param_name] = enum_values
-            self.output_name_list.append(param_name)  # just name of output
-
-            output_param_section_name = f"OutputSection_{param_name}"
-            if param is None:
-                title = f"Select the appropriate transmission mode for {param_name}"
-            else:
-                title = f"Select the appropriate transmission mode for {param_name} and specify an output format"
-            output_param_section = self.create_section(name=output_param_section_name, title=title)
-
-            if param is not None:
-                output_param_section.append(param)
-
-            self.choose_transmission_mode(
-                output_param_section,
-                name=param_name,
-                available_transmissions=transmission_schema,
-            )
-            inputs.append(output_param_section)
-
-    def process_output_param(
-        self,
-        output_param_name: str,
-        param_extended_schema: Dict,
-        param_schema: Dict,
-        param_type: str,
-        enum_values: List,
-        title: str,
-        description: str,
-    ):
+    def create_select_param_from_types(self, param_name: str, media_types: List, title: str, description: str):
         """
-        Process an output parameter based on its type and schema information.
-
-        Args:
-            output_param_name (str): The name of the output parameter.
-            param_extended_schema (Dict): The extended schema for the parameter, if available.
-            param_schema (Dict): The schema for the parameter.
-            param_type (str): The type of the parameter (e.g., 'string', 'number').
-            enum_values (List): A list to store enumeration values if applicable.
-            title (str): The title of the parameter.
-            description (str): The description of the parameter.
-
-        Returns:
-            Tuple[Optional[Param], List]: The processed parameter and its enumeration values.
-        """
-
-        param = None
-        if param_type == "string":
-            if param_schema.get("enum"):
-                param = self.create_select_param(
-                    param_name=output_param_name,
-                    param_schema=param_schema,
-                    is_nullable=False,
-                    param_type_bool=False,
-                    title=title,
-                    description=description,
-                )
-                enum_values = param_schema.get("enum", [])
-
-            else:
-                # No enum values, so no specific parameter is created
-                param = None
-        elif param_extended_schema is not None:
-            param = self.create_select_param_output(
-                param_name=output_param_name,
-                param_extended_schema=param_extended_schema,
-                title=title,
-                description=description,
-            )
-            self.extract_enum(param_extended_schema, enum_values=enum_values)
-        elif param_type in ["number", "integer", "boolean", "object"]:
-            # Currently unsupported types for output parameters, set to None
-            param = None
-        else:
-            # Handle unsupported parameter types gracefully
-            print(f"Warning: Parameter '{output_param_name}' with unsupported type '{param_type}'")
-            param = None
-
-        return param, enum_values
-
-    def create_select_param_output(self, param_name: str, param_extended_schema: Dict, title: str, description: str):
-        """
-        Create a select parameter for the output based on the extended schema.
+        Create a select parameter for the format of an output with the given media types.
 
         Args:
             param_name (str): The name of the parameter.
-            param_extended_schema (Dict): The extended schema containing enumeration values.
+            media_types (List): The media types the process offers for the output.
             title (str): The title of the parameter.
             description (str): The description of the parameter.
 
         Returns:
             SelectParam: The created select parameter.
         """
-        # Extract enumeration values from the extended schema
-        enum_values = []
-        self.extract_enum(schema_item=param_extended_schema, enum_values=enum_values)
-        # Create a dictionary for data types based on the enumeration values
-        data_types_dict = {data_type: data_type.split("/")[-1] for data_type in enum_values}
+        # Create a dictionary for data types based on the media types
+        data_types_dict = {data_type: data_type.split("/")[-1] for data_type in media_types}
 
         # Return the created select parameter
         return self.gxtp.SelectParam(name=param_name, label=title, help=description, options=data_types_dict)
@@ -856,24 +601,11 @@ class GalaxyXmlTool:
 
         return normalized_name
 
-    def replace_dot_with_underscore(self, name: str) -> str:
-        """
-        Replace all dots in the provided string with underscores.
-
-        This method is useful for sanitizing parameter names that may contain dots,
-        which are not always allowed or are problematic in certain contexts.
-
-        Args:
-            name (str): The string in which dots need to be replaced.
-
-        Returns:
-            str: The modified string with dots replaced by underscores.
-        """
-        return name.replace(".", "_")
-
     def extract_enum(self, schema_item: Dict, enum_values: List):
         """
-        Recursively extracts enum values from a JSON schema item.
+        Extracts the enum values of a JSON schema item, each value once.
+
+        The schema is walked by the EnumExtractor of the tool, which caches the result per schema.
 
         Args:
             schema_item (dict): The JSON schema item to extract enum values from.
@@ -882,19 +614,7 @@ class GalaxyXmlTool:
         Returns:
             None
         """
-        lst = []
-        if "enum" in schema_item:
-            enum_values.extend(schema_item["enum"])
-            lst.extend(schema_item["enum"])
-        elif "properties" in schema_item:
-            for prop in schema_item["properties"].values():
-                self.extract_enum(prop, enum_values)
-        elif "oneOf" in schema_item:
-            for option in schema_item["oneOf"]:
-                self.extract_enum(option, enum_values)
-        elif "allOf" in schema_item:
-            for sub_item in schema_item["allOf"]:
-                self.extract_enum(sub_item, enum_values)
+        enum_values.extend(self.enum_extractor.extract(schema_item))
 
     def create_default_value(self, default_value):
         """
@@ -938,8 +658,8 @@ class GalaxyXmlTool:
     def define_command(self, title):
         """
         Define a command line of Galaxy Xml
-        Always add name and title to command line. Additional commands are add with the exectutable dict,
-        command line is a string
+        Always add name and title to command line. The array flags of the data inputs and the output
+        datasets are taken from the inputs and outputs of `create_params`, command line is a string
 
         Args:
             title (str): The title of the command.
@@ -947,46 +667,49 @@ class GalaxyXmlTool:
         Returns:
             str: The formatted command.
         """
-        self.executable_dict["name"] = title
-        return self.executable + self.dict_to_string(self.executable_dict)
+        return CommandLineEmitter(gxt=self).emit(self.process_ir.replace(id=title))
 
     def define_output_options(self):
         """
-        Define output options for each item in self.output_type_dictionray.
-
-        This method creates output schemas for Galaxy XML based on the output types stored in the self.output_type_dictionary.
+        Define one output dataset for each output of `create_params`.
 
-        If an output type has no corresponding value, it is skipped.
-        If an output type has more than one entry, the format is changed to the corresponding chosen format.
+        If an output has no media types, the dataset is a txt file.
+        If an output has more than one media type, the format is changed to the corresponding chosen format.
 
         Returns:
             gxtp.Outputs: An instance of gxtp.Outputs containing the defined output options.
         """
-        outputs = self.gxtp.Outputs()
-        for key, values in self.output_type_dictionary.items():
-            index = self.find_index(string=key, pattern=f"{self.output_type}_")
-            label_name = key[index:]
-            name = f"{self.output_data}_{label_name}"
-            self.executable_dict[name] = f"${name}"
-
-            if not values:
-                param = self.gxtp.OutputData(name=name, format="txt")
-                outputs.append(param)
-                continue
-            form = values[0].split("/")[-1]
-            param = self.gxtp.OutputData(name=name, format=form)
-
-            change = self.gxtp.ChangeFormat()
-            change_response = self.gxtp.ChangeFormatWhen(input="response", value="document", format="txt")
-            change.append(change_response)
-            for value in values[1:]:
-                form = value.split("/")[-1]
-                change_i = self.gxtp.ChangeFormatWhen(input=key, value=value, format=form)
-                change.append(change_i)
-                param.append(change)
-            outputs.append(param)
-
-        return outputs
+        return GalaxyXmlEmitter(gxt=self).emit_outputs(self.process_ir)
+
+    def create_output_data(self, name: str, key: str, values: List):
+        """
+        Create the output dataset of an output.
+
+        The format of the dataset is the first media type of the output. If the user selects another media type
+        with the parameter `key`, or the "document" response, the format changes accordingly.
+
+        Args:
+            name (str): The name of the output dataset, "output_data_" followed by the output name.
+            key (str): The name of the parameter selecting the media type, "outputType_" followed by the output name.
+            values (List): The media types of the output, empty if the output is always a txt file.
+
+        Returns:
+            OutputData: The output dataset.
+        """
+        if not values:
+            return self.gxtp.OutputData(name=name, format="txt")
+        form = values[0].split("/")[-1]
+        param = self.gxtp.OutputData(name=name, format=form)
+
+        change = self.gxtp.ChangeFormat()
+        change_response = self.gxtp.ChangeFormatWhen(input="response", value="document", format="txt")
+        change.append(change_response)
+        for value in values[1:]:
+            form = value.split("/")[-1]
+            change_i = self.gxtp.ChangeFormatWhen(input=key, value=value, format=form)
+            change.append(change_i)
+            param.append(change)
+        return param
 
     def define_requirements(self):
         """
@@ -998,38 +721,67 @@ class GalaxyXmlTool:
         return requirements
 
     def define_macro(self):
-        """Generates the macro.xml"""
-        generator = MacrosXMLGenerator()
-        generator.add_token("@TOOL_VERSION@", self.version)
+        """Adds the version tokens to the macro.xml, which is written by commit_macros"""
+        self.macros_generator.add_token("@TOOL_VERSION@", self.version)
         # starts with 0
-        generator.add_token("@VERSION_SUFFIX@", self.version_suffix)
+        self.macros_generator.add_token("@VERSION_SUFFIX@", self.version_suffix)
+
+    def commit_macros(self):
+        """Writes the macro.xml with all tokens and test macros in a single pass"""
         file_path = f"Tools/{self.macros_file_name}"
-        generator.generate_xml(filename=file_path)
+        self.macros_generator.commit(filename=file_path)
+        self.record_written_file(file_path)
 
-    def define_tests(self, api_dict: Dict, process: str):
+    def define_tests(self, api_dict: Dict, process: str, path_index: ApiPathIndex | None = None):
         """
         Define the tests for the given API dictionary and process.
 
         This method initializes a test dictionary from the given API dictionary
         and process. If the test dictionary is valid, it creates test examples and
         uses them to create tests. If not, it creates a default test setup.
+        If a path index is given, the examples are looked up in the index instead
+        of scanning the API dictionary.
 
         Args:
             api_dict (Dict): The dictionary containing API information.
             process (str): The specific process to define tests for.
+            path_index (ApiPathIndex, optional): Index of the API paths by process ID.
 
         Returns:
             Tests: A Tests object populated with the defined tests.
         """
+        examples = self.find_test_examples(api_dict=api_dict, process=process, path_index=path_index)
+        return TestEmitter(gxt=self).emit(self.process_ir, examples=examples)
+
+    def find_test_examples(self, api_dict: Dict, process: str, path_index: ApiPathIndex | None = None):
+        """
+        Find the example executions of a process in the API dictionary, or in the path index if one is given.
+
+        Args:
+            api_dict (Dict): The dictionary containing API information.
+            process (str): The process to find the examples of.
+            path_index (ApiPathIndex, optional): Index of the API paths by process ID.
+
+        Returns:
+            list or None: The example execution payloads, or None if the process has no path.
+        """
+        if path_index is not None:
+            return path_index.get_examples(process=process)
         # Get the test dictionary using the given API dictionary and process
         test_dictionary = self.get_test_dictionary(api_dict=api_dict, process=process)
-        if test_dictionary is not None:
-            # Get test examples from the test dictionary
-            example_list = self.get_test_examples(data=test_dictionary)
-            # Create and return tests using the examples if any
-            tests_api = self.create_tests(examples=example_list)
-            if tests_api is not None:
-                return tests_api
+        # Get test examples from the test dictionary
+        return self.get_test_examples(data=test_dictionary) if test_dictionary is not None else None
+
+    def create_default_tests(self, output_names: List):
+        """
+        Create the test that is used if a process has no examples. It is expected to fail.
+
+        Args:
+            output_names (List): The names of the outputs of the process.
+
+        Returns:
+            Tests: A Tests object with the default test.
+        """
         # Initialize a default Tests object if no examples are found
         tests = self.gxtp.Tests()
         test_a = self.gxtp.Test(expect_failure="true")
@@ -1037,7 +789,7 @@ class GalaxyXmlTool:
         param = self.gxtp.TestParam(name="response", value="document")
         test_a.append(param)
         # Add default test outputs
-        for output_name in self.output_name_list:
+        for output_name in output_names:
             name = f"{self.output_data}_{output_name}"
             output = self.gxtp.TestOutput(name=name, ftype="txt", value=f"{name}.txt")
             test_a.append(output)
@@ -1133,12 +885,10 @@ class GalaxyXmlTool:
             outputs (dict): A dictionary of output parameters.
             response (str): The response type to determine the format of the output parameter.
         """
-        generator = MacrosXMLGenerator()
-        file_path = f"Tools/{self.macros_file_name}"
         for key, value in outputs.items():
             name, ftype = self.create_test_output_param(key, value, response)
             macro_name = f"file_inputs_{key}{index}"
-            generator.create_macro_file(filename=file_path, name=name, ftype=ftype, macro_name=macro_name)
+            self.macros_generator.add_macro(name=name, ftype=ftype, macro_name=macro_name)
             test.append(self.gxtp.Expand(macro=macro_name))
 
     def create_test_output_param(self, key, value, response):
@@ -1173,24 +923,14 @@ class GalaxyXmlTool:
         Returns:
             list: A list of example values.
         """
-        examples = []
-
-        post_data = data.get("post", {})
-        request_body = post_data.get("requestBody", {})
-        content = request_body.get("content", {})
-        json_content = content.get("application/json", {})
-        examples_dict = json_content.get("examples", {})
-
-        for example in examples_dict.values():
-            examples.append(example.get("value"))
-
-        return examples
+        return ApiPathIndex.extract_examples(path_entry=data)
 
     def get_test_dictionary(self, api_dict, process):
         """
         Extracts and returns the relevant part of the API request
         "https://ospd.geolabs.fr:8300/ogc-api/api",
         when the process has examples. This examples we want to use as test cases.
+        Scans every path, use an ApiPathIndex when converting many processes.
         """
         for pro in api_dict.keys():
             parts = pro.split("/")
@@ -1232,3 +972,14 @@ class GalaxyXmlTool:
         # Write to the file
         with open(file_path, "w") as file:
             file.write(content)
+        self.record_written_file(file_path)
+
+    def record_written_file(self, file_path):
+        """
+        Remember a file written for the tool, so that it can be checked for in the regeneration manifest.
+
+        Parameters:
+        - file_path (str): Path of the written file.
+        """
+        if file_path not in self.written_files:
+            self.written_files.append(file_path)
@@ -2,8 +2,16 @@ import xml.etree.ElementTree as ET
 
 
 class MacrosXMLGenerator:
+    """
+    In-memory macros file of a tool.
+
+    Tokens and macros are collected in one tree, which is written once with commit
+    instead of parsing and rewriting the file for every macro.
+    """
+
     def __init__(self):
         self.root = ET.Element("macros")
+        self.changed = True
 
     def add_token(self, name, value):
         """
@@ -16,6 +24,7 @@ class MacrosXMLGenerator:
         token = ET.Element("token", {"name": name})
         token.text = value
         self.root.append(token)
+        self.changed = True
 
     def generate_xml(self, filename):
         """
@@ -45,10 +54,39 @@ class MacrosXMLGenerator:
 
         return output_element
 
+    def add_macro(self, name, ftype, macro_name):
+        """
+        Add a macro element containing output data to the XML root.
+
+        Args:
+            name (str): The name attribute of the output element within the macro.
+            ftype (str): The ftype attribute of the output element within the macro.
+            macro_name (str): The name attribute of the macro element.
+        """
+        macro_element = ET.Element("xml", {"name": f"{macro_name}"})
+        macro_element.append(self.get_output_data(name=name, ftype=ftype))
+        self.root.append(macro_element)
+        self.changed = True
+
+    def commit(self, filename):
+        """
+        Write the XML tree to a file if tokens or macros were added since the last commit.
+
+        Args:
+            filename (str): The name of the file to write the XML data to.
+        """
+        if not self.changed:
+            return
+        self.generate_xml(filename)
+        self.changed = False
+
     def create_macro_file(self, filename, name, ftype, macro_name):
         """
         Create or update an XML file with a macro element containing output data.
 
+        This parses and rewrites the whole file for a single macro; use add_macro and
+        commit when adding several macros.
+
         Args:
             filename (str): The name of the XML file to read and write.
             name (str): The name attribute of the output element within the macro.
@@ -0,0 +1,101 @@
+import copy
+import threading
+from collections import OrderedDict
+
+
+class ParamCache:
+    """
+    Cache of the Galaxy parameters rendered from the parameter nodes of the process IR.
+
+    Many processes share identical inputs, for example the `ram` input, the raster outputs and the
+    enum lists of the OTB processes. A parameter is rendered once per distinct node, keyed by
+    `ParamNode.get_key`, and later requests get a clone of the rendered parameter subtree. When the
+    cache holds `max_entries` parameters, the least recently used one is dropped.
+
+    :param max_entries: The maximum number of cached parameters, 0 to disable the cache.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        """
+        Look up a rendered parameter and count the hit or miss.
+
+        Args:
+            key (str): The key of the parameter node.
+
+        Returns:
+            A clone of the parameter, or None if the node is not cached.
+        """
+        with self.lock:
+            param = self.entries.get(key)
+            if param is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        return self.clone_param(param)
+
+    def put(self, key: str, param) -> None:
+        """
+        Store a rendered parameter.
+
+        A clone is stored, so that appending the returned parameter to a tool does not change the entry.
+
+        Args:
+            key (str): The key of the parameter node.
+            param: The rendered galaxyxml parameter.
+        """
+        if self.max_entries <= 0:
+            return
+        clone = self.clone_param(param)
+        with self.lock:
+            self.entries[key] = clone
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The share of lookups that were answered from the cache, 0.0 before the first lookup.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @classmethod
+    def clone_param(cls, param, node=None):
+        """
+        Clone a galaxyxml parameter subtree without its parent.
+
+        The XML element is copied in one go by lxml. The parameter objects are copied attribute by
+        attribute and rebound to the copied elements, which is much faster than `copy.deepcopy`
+        or compiling the parameter again.
+
+        Args:
+            param: The galaxyxml parameter to clone.
+            node: The already copied element of the parameter, used for the children of a subtree.
+
+        Returns:
+            The cloned parameter.
+        """
+        clone = object.__new__(type(param))
+        clone.__dict__.update(param.__dict__)
+        clone.parent = None
+        clone.node = copy.deepcopy(param.node) if node is None else node
+        # lxml returns the same proxy for an element while it is referenced, so the children are found by identity
+        positions = {element: index for index, element in enumerate(param.node)}
+        clone.children = []
+        for child in param.children:
+            child_clone = cls.clone_param(child, clone.node[positions[child.node]])
+            child_clone.parent = clone
+            clone.children.append(child_clone)
+        return clone
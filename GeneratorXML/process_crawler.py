@@ -0,0 +1,172 @@
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .file_utils import write_json_atomic
+from .process_snapshot import ProcessSnapshot
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class HostRateLimiter:
+    """
+    Limit the number of requests per second that are sent to each host.
+
+    :param requests_per_second: The maximum request rate per host, None for no limit.
+    """
+
+    def __init__(self, requests_per_second: float | None) -> None:
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.locks = {}
+        self.next_slot = {}
+
+    async def acquire(self, url: str):
+        """
+        Wait until the next request to the host of the URL may be sent.
+
+        Args:
+            url (str): The URL that will be requested.
+        """
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        lock = self.locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        await asyncio.sleep(slot - now)
+
+
+class ProcessCrawler:
+    """
+    Download the GetCapabilities list, the API document and every process description of
+    the ZOO-Project into a local snapshot directory, see ProcessSnapshot for the layout.
+
+    :param base_url: The base URL of the OGC API, ending with a slash.
+    :param snapshot_dir: The directory the snapshot is written to.
+    :param concurrency: The maximum number of requests running at the same time.
+    :param retries: How often a failed request is retried.
+    :param backoff: The base delay in seconds of the exponential backoff between retries.
+    :param requests_per_second: The maximum request rate per host, None for no limit.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        snapshot_dir: str,
+        concurrency: int = 8,
+        retries: int = 3,
+        backoff: float = 0.5,
+        requests_per_second: float | None = None,
+    ) -> None:
+        self.base_url = base_url
+        self.snapshot = ProcessSnapshot(snapshot_dir=snapshot_dir)
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.rate_limiter = HostRateLimiter(requests_per_second=requests_per_second)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def run(self, process_ids: List[str] | None = None) -> Dict[str, bool]:
+        """
+        Run the crawler until the snapshot is complete.
+
+        Args:
+            process_ids (List[str], optional): The processes to download, all processes of
+                the GetCapabilities list if None.
+
+        Returns:
+            Dict[str, bool]: For each process ID whether its description was written.
+        """
+        return asyncio.run(self.crawl(process_ids=process_ids))
+
+    async def crawl(self, process_ids: List[str] | None = None) -> Dict[str, bool]:
+        """
+        Download the GetCapabilities list and the API document, then stream every process
+        description into the snapshot directory as it arrives.
+
+        Args:
+            process_ids (List[str], optional): The processes to download, all processes of
+                the GetCapabilities list if None.
+
+        Returns:
+            Dict[str, bool]: For each process ID whether its description was written.
+        """
+        os.makedirs(self.snapshot.processes_dir, exist_ok=True)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        capabilities, api_data = await asyncio.gather(
+            self.fetch_json(f"{self.base_url}processes", semaphore),
+            self.fetch_json(f"{self.base_url}api", semaphore),
+        )
+        if capabilities is None:
+            raise RuntimeError(f"Failed to retrieve the process list from {self.base_url}processes")
+        write_json_atomic(self.snapshot.capabilities_path, capabilities)
+        if api_data is not None:
+            write_json_atomic(self.snapshot.api_path, api_data)
+
+        if process_ids is None:
+            process_ids = [process["id"] for process in capabilities.get("processes", [])]
+
+        results = {}
+        tasks = [self.fetch_process(process_id, semaphore) for process_id in process_ids]
+        for task in asyncio.as_completed(tasks):
+            process_id, process_data = await task
+            if process_data is not None:
+                write_json_atomic(self.snapshot.get_process_path(process_id), process_data)
+            results[process_id] = process_data is not None
+        return results
+
+    async def fetch_process(self, process_id: str, semaphore: asyncio.Semaphore):
+        """
+        Download the description of one process.
+
+        Returns:
+            Tuple[str, dict | None]: The process ID and its description, None on failure.
+        """
+        return process_id, await self.fetch_json(f"{self.base_url}processes/{process_id}", semaphore)
+
+    async def fetch_json(self, url: str, semaphore: asyncio.Semaphore) -> Dict | None:
+        """
+        Download a JSON document, retrying with jittered exponential backoff.
+
+        Connection errors and the status codes in RETRY_STATUS_CODES are retried, other
+        client errors are not.
+
+        Args:
+            url (str): The URL of the document.
+            semaphore (asyncio.Semaphore): Limits the number of concurrent requests.
+
+        Returns:
+            dict or None: The document, or None if every attempt failed.
+        """
+        for attempt in range(self.retries + 1):
+            async with semaphore:
+                await self.rate_limiter.acquire(url)
+                try:
+                    response = await asyncio.to_thread(self.session.get, url, timeout=60)
+                    if response.status_code not in RETRY_STATUS_CODES:
+                        response.raise_for_status()
+                        return response.json()
+                    error = f"{response.status_code} {response.reason}"
+                except requests.exceptions.HTTPError as e:
+                    print(f"Failed to retrieve {url}:", e, file=sys.stderr)
+                    return None
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    error = e
+            if attempt < self.retries:
+                # Full jitter keeps many failing requests from retrying in lockstep
+                await asyncio.sleep(random.uniform(0, self.backoff * 2**attempt))
+        print(f"Failed to retrieve {url} after {self.retries + 1} attempts:", error, file=sys.stderr)
+        return None
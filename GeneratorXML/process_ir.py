@@ -0,0 +1,555 @@
+import hashlib
+import json
+import math
+from typing import TYPE_CHECKING, Dict, List
+
+from .enum_extractor import EnumExtractor
+from .param_cache import ParamCache
+from .schema_resolver import SchemaResolver
+from .schema_utils import get_array_items, replace_dot_with_underscore, resolve_extended_schema
+
+if TYPE_CHECKING:
+    from .galaxyxml_creator import GalaxyXmlTool
+
+# Prefix of the parameters selecting the format of an output
+OUTPUT_TYPE = "outputType"
+
+
+class IRNode:
+    """
+    Base class of the nodes of the intermediate representation of a process.
+
+    Nodes only hold plain values, so that they can be compared, serialised and cached.
+    Every subclass lists its fields in `__slots__`.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **fields) -> None:
+        for field in self.get_fields():
+            setattr(self, field, fields.get(field))
+
+    @classmethod
+    def get_fields(cls) -> List[str]:
+        """
+        Return the names of the fields of the node, including those of its base classes.
+        """
+        fields = []
+        for klass in reversed(cls.__mro__):
+            fields.extend(klass.__dict__.get("__slots__", ()))
+        return fields
+
+    def replace(self, **changes) -> "IRNode":
+        """
+        Return a copy of the node with the given fields changed.
+        """
+        fields = {field: getattr(self, field) for field in self.get_fields()}
+        fields.update(changes)
+        return type(self)(**fields)
+
+    def to_dict(self) -> Dict:
+        """
+        Return the node as a dictionary of plain values, with the node type under "node".
+        """
+        result = {"node": type(self).__name__}
+        for field in self.get_fields():
+            value = getattr(self, field)
+            if isinstance(value, tuple):
+                value = [item.to_dict() if isinstance(item, IRNode) else item for item in value]
+            result[field] = value
+        return result
+
+    def get_key(self) -> str:
+        """
+        Return the SHA-256 hash of the canonical JSON representation of the node.
+        """
+        canonical = json.dumps(self.to_dict(), sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __hash__(self) -> int:
+        return hash(self.get_key())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.get_fields())
+        return f"{type(self).__name__}({fields})"
+
+
+class ParamNode(IRNode):
+    """
+    An input parameter of the Galaxy tool.
+
+    :param name: The name of the parameter, with dots replaced by underscores.
+    :param title: The label of the parameter.
+    :param description: The help text of the parameter.
+    :param nullable: Whether the parameter is optional.
+    """
+
+    __slots__ = ("name", "title", "description", "nullable")
+
+
+class TextParamNode(ParamNode):
+    """
+    A free text input.
+    """
+
+    __slots__ = ("default",)
+
+
+class SelectParamNode(ParamNode):
+    """
+    An input with a fixed set of values: an enum, or a boolean if `is_boolean` is set.
+    """
+
+    __slots__ = ("options", "default", "is_boolean")
+
+
+class NumberParamNode(ParamNode):
+    """
+    An integer or float input, depending on `kind`.
+    """
+
+    __slots__ = ("kind", "default")
+
+
+class DataParamNode(ParamNode):
+    """
+    A dataset input of one of `media_types`, a list of datasets if `is_array` is set.
+    """
+
+    __slots__ = ("is_array", "media_types")
+
+
+class ArrayParamNode(ParamNode):
+    """
+    A repeated input of `item_type` items.
+    """
+
+    __slots__ = ("item_type", "item_name", "min_items", "max_items")
+
+
+class ObjectParamNode(ParamNode):
+    """
+    An object input, rendered as a section with one parameter per required field.
+    """
+
+    __slots__ = ("fields",)
+
+
+class OutputNode(IRNode):
+    """
+    An output of the process.
+
+    :param name: The name of the output, with dots replaced by underscores.
+    :param title: The label of the format parameter.
+    :param description: The help text of the format parameter.
+    :param format_choice: "enum" if the user chooses one of `media_types` given as a string enum,
+        "media_type" if the user chooses one of the media types of the extended schema, or None.
+    :param media_types: The media types or enum values of the output.
+    :param default: The default value of an "enum" format parameter.
+    """
+
+    __slots__ = ("name", "title", "description", "format_choice", "media_types", "default")
+
+
+class ProcessIR(IRNode):
+    """
+    Intermediate representation of a process, produced by ProcessIRBuilder and rendered by the emitters.
+
+    :param id: The process ID.
+    :param version: The version of the process.
+    :param title: The title of the process.
+    :param description: The description of the process.
+    :param inputs: The ParamNode of every supported input.
+    :param outputs: The OutputNode of every output.
+    :param transmission_modes: The transmission modes the server supports for outputs.
+    """
+
+    __slots__ = ("id", "version", "title", "description", "inputs", "outputs", "transmission_modes")
+
+
+class ProcessIRBuilder:
+    """
+    Build the intermediate representation of a process in one pass over its description.
+
+    This is the only place that decides which Galaxy parameter an input or output becomes.
+
+    :param schema_resolver: The resolver of the `$ref` references of the extended schemas, or None.
+    :param enum_extractor: The extractor of the media types of the extended schemas, a new one if None.
+    """
+
+    def __init__(self, schema_resolver: SchemaResolver | None = None, enum_extractor: EnumExtractor | None = None) -> None:
+        self.schema_resolver = schema_resolver
+        self.enum_extractor = enum_extractor if enum_extractor is not None else EnumExtractor()
+
+    def build(self, process_data: Dict) -> ProcessIR:
+        """
+        Build the intermediate representation of a process description.
+
+        Args:
+            process_data (dict): The process description of the OGC API.
+
+        Returns:
+            ProcessIR: The intermediate representation.
+        """
+        return self.build_params(
+            input_schema=process_data["inputs"],
+            output_schema=process_data["outputs"],
+            transmission_schema=process_data["outputTransmission"],
+            id=process_data["id"],
+            version=process_data["version"],
+            title=process_data["title"],
+            description=process_data.get("description"),
+        )
+
+    def build_params(self, input_schema: Dict, output_schema: Dict, transmission_schema: List, **process) -> ProcessIR:
+        """
+        Build the intermediate representation of the inputs and outputs of a process.
+
+        Args:
+            input_schema (dict): The inputs of the process description.
+            output_schema (dict): The outputs of the process description.
+            transmission_schema (list): The transmission modes the server supports for outputs.
+            **process: The other fields of the ProcessIR, like id and version.
+
+        Returns:
+            ProcessIR: The intermediate representation.
+        """
+        inputs = []
+        for name, info in input_schema.items():
+            node = self.build_input(name=name, info=info)
+            if node is not None:
+                inputs.append(node)
+        return ProcessIR(
+            **process,
+            inputs=tuple(inputs),
+            outputs=tuple(self.build_output(name=name, info=info) for name, info in output_schema.items()),
+            transmission_modes=tuple(transmission_schema),
+        )
+
+    def get_label(self, name: str, info: Dict):
+        """
+        Return the normalised name, the title and the description of an input or output.
+        """
+        name = replace_dot_with_underscore(name)
+        title = info.get("title")
+        description = info.get("description")
+        if title != description:
+            description = f"{title} {description}"
+        return name, name, description
+
+    def build_input(self, name: str, info: Dict) -> ParamNode | None:
+        """
+        Build the node of an input.
+
+        Args:
+            name (str): The name of the input in the process description.
+            info (dict): The description of the input.
+
+        Returns:
+            ParamNode or None: The node, or None if the input type is not supported.
+        """
+        name, title, description = self.get_label(name=name, info=info)
+        schema = info.get("schema")
+        extended_schema = resolve_extended_schema(info.get("extended-schema"), self.schema_resolver)
+        param_type = schema.get("type")
+        label = {"name": name, "title": title, "description": description, "nullable": schema.get("nullable", False)}
+
+        if param_type == "string" and schema.get("enum"):
+            return SelectParamNode(**label, options=tuple(schema["enum"]), default=schema.get("default"), is_boolean=False)
+        if param_type == "string":
+            return TextParamNode(**label, default=schema.get("default"))
+        if param_type in ("integer", "number"):
+            kind = "integer" if param_type == "integer" else "float"
+            return NumberParamNode(**label, kind=kind, default=schema.get("default"))
+        if param_type == "boolean":
+            enum_values = schema.get("enum")
+            options = tuple(enum_values) if enum_values is not None else None
+            return SelectParamNode(**label, options=options, default=schema.get("default"), is_boolean=True)
+        if extended_schema is not None:
+            is_array = extended_schema.get("type") == "array"
+            media_types = self.enum_extractor.extract(extended_schema.get("items", {}) if is_array else extended_schema)
+            label["nullable"] = extended_schema.get("nullable", False)
+            return DataParamNode(**label, is_array=is_array, media_types=tuple(media_types))
+        if param_type == "object":
+            return ObjectParamNode(**label, fields=tuple(self.build_object_fields(schema, label["nullable"])))
+        print(f"Warning: Parameter '{name}' with unsupported type '{param_type}'")
+        return None
+
+    def build_object_fields(self, schema: Dict, nullable: bool) -> List[ParamNode]:
+        """
+        Build the nodes of the required fields of an object input.
+        """
+        fields = []
+        for field in schema.get("required", []):
+            field_schema = schema["properties"][field]
+            field_type = field_schema.get("type")
+            if field_type == "string":
+                enum_values = field_schema.get("enum")
+                fields.append(
+                    SelectParamNode(
+                        name=field,
+                        title=field,
+                        description="",
+                        nullable=nullable,
+                        options=tuple(enum_values) if enum_values is not None else None,
+                        default=field_schema.get("default"),
+                        is_boolean=False,
+                    )
+                )
+            elif field_type == "array":
+                min_items, max_items = get_array_items(field_schema)
+                item_type = field_schema.get("items").get("type")
+                fields.append(
+                    ArrayParamNode(
+                        name=field,
+                        title=None,
+                        description=None,
+                        nullable=False,
+                        item_type=item_type,
+                        item_name=f"{item_type}Data",
+                        # Infinite bounds cannot be serialised as JSON
+                        min_items=None if math.isinf(min_items) else min_items,
+                        max_items=None if math.isinf(max_items) else max_items,
+                    )
+                )
+        return fields
+
+    def build_output(self, name: str, info: Dict) -> OutputNode:
+        """
+        Build the node of an output.
+
+        Args:
+            name (str): The name of the output in the process description.
+            info (dict): The description of the output.
+
+        Returns:
+            OutputNode: The node.
+        """
+        name, title, description = self.get_label(name=name, info=info)
+        schema = info.get("schema")
+        extended_schema = resolve_extended_schema(info.get("extended-schema"), self.schema_resolver)
+        param_type = schema.get("type")
+        node = OutputNode(name=name, title=title, description=description, media_types=())
+
+        if param_type == "string":
+            if schema.get("enum"):
+                node.format_choice = "enum"
+                node.media_types = tuple(schema["enum"])
+                node.default = schema.get("default")
+        elif extended_schema is not None:
+            media_types = self.enum_extractor.extract(extended_schema)
+            node.format_choice = "media_type"
+            node.media_types = tuple(media_types)
+        elif param_type not in ["number", "integer", "boolean", "object"]:
+            print(f"Warning: Parameter '{OUTPUT_TYPE}_{name}' with unsupported type '{param_type}'")
+        return node
+
+
+class GalaxyXmlEmitter:
+    """
+    Render the intermediate representation of a process to the inputs and outputs of a Galaxy tool.
+
+    The parameters are created with the builders of the GalaxyXmlTool. If a ParamCache is given, the
+    parameter of every distinct node is created once and cloned afterwards.
+
+    :param gxt: The tool the parameters are created for.
+    :param param_cache: The cache of compiled parameters, or None.
+    """
+
+    def __init__(self, gxt: "GalaxyXmlTool", param_cache: ParamCache | None = None) -> None:
+        self.gxt = gxt
+        self.param_cache = param_cache
+
+    def emit_inputs(self, process_ir: ProcessIR):
+        """
+        Render the inputs, the prefer and response sections and the output sections of a process.
+
+        Returns:
+            Inputs: The inputs of the Galaxy tool.
+        """
+        inputs = self.gxt.gxtp.Inputs()
+        for node in process_ir.inputs:
+            inputs.append(self.emit_cached_param(node))
+        self.gxt.choose_prefer(inputs=inputs)
+        self.gxt.create_select_raw_param(inputs=inputs)
+        for node in process_ir.outputs:
+            inputs.append(self.emit_output_section(node, process_ir.transmission_modes))
+        return inputs
+
+    def emit_cached_param(self, node: ParamNode):
+        """
+        Render a parameter, reusing the cached parameter of an identical node if a cache is set.
+        """
+        if self.param_cache is None:
+            return self.emit_param(node)
+        key = node.get_key()
+        cached = self.param_cache.get(key)
+        if cached is not None:
+            return cached
+        param = self.emit_param(node)
+        self.param_cache.put(key, param)
+        return param
+
+    def emit_param(self, node: ParamNode):
+        """
+        Render one parameter node.
+        """
+        gxt = self.gxt
+        label = {"title": node.title, "description": node.description}
+        if isinstance(node, SelectParamNode):
+            schema = {"default": node.default}
+            if node.options is not None:
+                schema["enum"] = list(node.options)
+            return gxt.create_select_param(
+                param_name=node.name,
+                param_schema=schema,
+                is_nullable=node.nullable,
+                param_type_bool=node.is_boolean,
+                **label,
+            )
+        if isinstance(node, TextParamNode):
+            return gxt.create_text_param(
+                param_name=node.name, param_schema={"default": node.default}, is_nullable=node.nullable, **label
+            )
+        if isinstance(node, NumberParamNode):
+            create = gxt.create_integer_param if node.kind == "integer" else gxt.create_float_param
+            return create(param_name=node.name, param_schema={"default": node.default}, is_nullable=node.nullable, **label)
+        if isinstance(node, DataParamNode):
+            return gxt.create_data_param_from_types(
+                param_name=node.name, media_types=list(node.media_types), is_nullable=node.nullable, **label
+            )
+        if isinstance(node, ArrayParamNode):
+            return gxt.create_array_param(
+                name=node.name,
+                item_type=node.item_type,
+                min_items=math.inf if node.min_items is None else node.min_items,
+                max_items=-math.inf if node.max_items is None else node.max_items,
+                item_name=node.item_name,
+                **label,
+            )
+        if isinstance(node, ObjectParamNode):
+            section = gxt.create_section(name=node.name, title=node.title, description=node.description)
+            for field in node.fields:
+                section.append(self.emit_param(field))
+            return section
+        raise TypeError(f"Unknown parameter node {type(node).__name__}")
+
+    def emit_output_section(self, node: OutputNode, transmission_modes):
+        """
+        Render the section with the format and transmission mode parameters of an output.
+        """
+        gxt = self.gxt
+        output_param_name = f"{gxt.output_type}_{node.name}"
+        param = None
+        if node.format_choice == "enum":
+            param = gxt.create_select_param(
+                param_name=output_param_name,
+                param_schema={"enum": list(node.media_types), "default": node.default},
+                is_nullable=False,
+                param_type_bool=False,
+                title=node.title,
+                description=node.description,
+            )
+        elif node.format_choice == "media_type":
+            param = gxt.create_select_param_from_types(
+                param_name=output_param_name,
+                media_types=list(node.media_types),
+                title=node.title,
+                description=node.description,
+            )
+
+        if param is None:
+            title = f"Select the appropriate transmission mode for {node.name}"
+        else:
+            title = f"Select the appropriate transmission mode for {node.name} and specify an output format"
+        section = gxt.create_section(name=f"OutputSection_{node.name}", title=title)
+        if param is not None:
+            section.append(param)
+        gxt.choose_transmission_mode(section, name=node.name, available_transmissions=list(transmission_modes))
+        return section
+
+    def emit_outputs(self, process_ir: ProcessIR):
+        """
+        Render the output datasets of a process.
+
+        Returns:
+            Outputs: The outputs of the Galaxy tool.
+        """
+        outputs = self.gxt.gxtp.Outputs()
+        for node in process_ir.outputs:
+            outputs.append(
+                self.gxt.create_output_data(
+                    name=f"{self.gxt.output_data}_{node.name}",
+                    key=f"{self.gxt.output_type}_{node.name}",
+                    values=list(node.media_types),
+                )
+            )
+        return outputs
+
+
+class CommandLineEmitter:
+    """
+    Render the intermediate representation of a process to the command line of create_api_json.py.
+
+    :param gxt: The tool the command line is created for.
+    """
+
+    def __init__(self, gxt: "GalaxyXmlTool") -> None:
+        self.gxt = gxt
+
+    def get_arguments(self, process_ir: ProcessIR) -> Dict:
+        """
+        Return the arguments of the command line in order: the array flags of the data inputs,
+        the output datasets, the process name and the process version.
+        """
+        arguments = {}
+        for node in process_ir.inputs:
+            if isinstance(node, DataParamNode):
+                arguments[f"isArray{node.name}"] = node.is_array
+        for node in process_ir.outputs:
+            name = f"{self.gxt.output_data}_{node.name}"
+            arguments[name] = f"${name}"
+        arguments["name"] = process_ir.id
+        # Part of the key of the result cache of create_api_json.py
+        arguments["processVersion"] = "@TOOL_VERSION@"
+        return arguments
+
+    def emit(self, process_ir: ProcessIR) -> str:
+        """
+        Return the command line of a process.
+        """
+        return self.gxt.executable + self.gxt.dict_to_string(self.get_arguments(process_ir))
+
+
+class TestEmitter:
+    """
+    Render the tests of a Galaxy tool from the intermediate representation of its process and the examples of the API.
+
+    :param gxt: The tool the tests are created for. Its macros file receives the test output macros.
+    """
+
+    # Not a test class, despite the name
+    __test__ = False
+
+    def __init__(self, gxt: "GalaxyXmlTool") -> None:
+        self.gxt = gxt
+
+    def emit(self, process_ir: ProcessIR, examples: List | None):
+        """
+        Create one test per example, or the default test that is expected to fail if there are no examples.
+
+        Args:
+            process_ir (ProcessIR): The intermediate representation of the process.
+            examples (list or None): The example execution payloads of the process.
+
+        Returns:
+            Tests: The tests of the Galaxy tool.
+        """
+        if examples is not None:
+            tests = self.gxt.create_tests(examples=examples)
+            if tests is not None:
+                return tests
+        return self.gxt.create_default_tests(output_names=[node.name for node in process_ir.outputs])
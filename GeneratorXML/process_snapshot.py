@@ -0,0 +1,76 @@
+import os
+from typing import Dict, List
+
+from .file_utils import read_json
+
+
+class ProcessSnapshot:
+    """
+    Local mirror of the ZOO-Project OGC API, as written by the ProcessCrawler.
+
+    The snapshot directory has the following layout:
+
+    - **processes.json**: The GetCapabilities response.
+    - **api.json**: The OpenAPI document.
+    - **processes/{id}.json**: One process description per process.
+
+    :param snapshot_dir: The directory of the snapshot.
+    """
+
+    def __init__(self, snapshot_dir: str) -> None:
+        self.snapshot_dir = snapshot_dir
+        self.processes_dir = os.path.join(snapshot_dir, "processes")
+        self.api_path = os.path.join(snapshot_dir, "api.json")
+        self.capabilities_path = os.path.join(snapshot_dir, "processes.json")
+
+    def get_process_path(self, process_id: str) -> str:
+        """
+        Return the path of the description of a process within the snapshot.
+        """
+        file_name = process_id.replace(os.sep, "_")
+        return os.path.join(self.processes_dir, f"{file_name}.json")
+
+    def load_api(self) -> Dict | None:
+        """
+        Load the OpenAPI document, or None if the snapshot does not contain it.
+        """
+        api_data = read_json(self.api_path)
+        if api_data is None:
+            print(f"API document not found in snapshot {self.snapshot_dir}")
+        return api_data
+
+    def load_process(self, process_id: str) -> Dict | None:
+        """
+        Load the description of a process, or None if the snapshot does not contain it.
+        """
+        process_data = read_json(self.get_process_path(process_id))
+        if process_data is None:
+            print(f"Process {process_id} not found in snapshot {self.snapshot_dir}")
+        return process_data
+
+    def get_process_ids(self) -> List[str]:
+        """
+        Return the IDs of all processes in the snapshot, sorted by name.
+
+        The file names of the descriptions are not used, since the separators in an ID are
+        replaced within them. The IDs are taken from the GetCapabilities list, or from the
+        `id` field of each description if the snapshot does not contain the list.
+        """
+        if not os.path.isdir(self.processes_dir):
+            return []
+        capabilities = read_json(self.capabilities_path)
+        if isinstance(capabilities, dict) and isinstance(capabilities.get("processes"), list):
+            process_ids = (process.get("id") for process in capabilities["processes"] if isinstance(process, dict))
+            return sorted(
+                process_id
+                for process_id in set(process_ids)
+                if isinstance(process_id, str) and os.path.isfile(self.get_process_path(process_id))
+            )
+        process_ids = []
+        for file_name in os.listdir(self.processes_dir):
+            if not file_name.endswith(".json"):
+                continue
+            process_data = read_json(os.path.join(self.processes_dir, file_name))
+            process_id = process_data.get("id") if isinstance(process_data, dict) else None
+            process_ids.append(process_id if isinstance(process_id, str) else file_name[: -len(".json")])
+        return sorted(process_ids)
@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+from typing import Dict, List
+
+from .file_utils import read_json, write_json_atomic
+
+
+class RegenerationManifest:
+    """
+    Record of the inputs each generated tool was built from.
+
+    For every process the manifest stores a content hash of its description, of its slice
+    of the OpenAPI document and of the generator itself, together with the paths of all files
+    that were written for the tool. A tool only has to be generated again if one of these hashes
+    changed or one of its files, including its test inputs, is missing.
+
+    :param manifest_path: Path of the JSON file the manifest is stored in.
+    :param generator_version: Hash or version string identifying the generator code.
+    """
+
+    def __init__(self, manifest_path: str, generator_version: str) -> None:
+        self.manifest_path = manifest_path
+        self.generator_version = generator_version
+        self.entries = (read_json(manifest_path) or {}).get("tools", {})
+
+    @staticmethod
+    def compute_hash(data) -> str:
+        """
+        Return the SHA-256 hash of the canonical JSON representation of the data.
+        """
+        canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def compute_generator_version(source_paths: List[str]) -> str:
+        """
+        Return a hash over the source files of the generator.
+
+        Any change of the generator code therefore regenerates every tool.
+
+        Args:
+            source_paths (List[str]): The source files that determine the generated output.
+
+        Returns:
+            str: The SHA-256 hash of the file contents.
+        """
+        digest = hashlib.sha256()
+        for source_path in sorted(source_paths):
+            with open(source_path, "rb") as file:
+                digest.update(file.read())
+        return digest.hexdigest()
+
+    def get_fingerprint(self, process_data: Dict, path_entry: Dict | None) -> Dict[str, str]:
+        """
+        Compute the hashes of all inputs of a tool.
+
+        Args:
+            process_data (dict): The process description.
+            path_entry (dict or None): The OpenAPI path entry of the process.
+
+        Returns:
+            Dict[str, str]: The hashes of the process description, the path entry and the generator.
+        """
+        return {
+            "process": self.compute_hash(process_data),
+            "api": self.compute_hash(path_entry),
+            "generator": self.generator_version,
+        }
+
+    def is_up_to_date(self, process_id: str, fingerprint: Dict[str, str]) -> bool:
+        """
+        Check whether a tool was generated from the given inputs and all its recorded files still exist.
+
+        Args:
+            process_id (str): The process ID.
+            fingerprint (Dict[str, str]): The current hashes of the inputs of the tool.
+
+        Returns:
+            bool: True if the tool does not have to be generated again.
+        """
+        entry = self.entries.get(process_id)
+        if not isinstance(entry, dict) or entry.get("fingerprint") != fingerprint:
+            return False
+        return all(os.path.exists(path) for path in entry.get("outputs", []))
+
+    def update(self, process_id: str, fingerprint: Dict[str, str], output_paths: List[str] | None = None):
+        """
+        Record the inputs a tool was generated from and the files that were written for it.
+
+        Args:
+            process_id (str): The process ID.
+            fingerprint (Dict[str, str]): The hashes of the inputs of the tool.
+            output_paths (List[str], optional): The paths of all files written for the tool.
+        """
+        self.entries[process_id] = {"fingerprint": fingerprint, "outputs": list(output_paths or [])}
+
+    def remove(self, process_id: str):
+        """
+        Forget a tool, so that it is generated again in the next run.
+        """
+        self.entries.pop(process_id, None)
+
+    def save(self):
+        """
+        Write the manifest atomically.
+        """
+        directory = os.path.dirname(self.manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        write_json_atomic(self.manifest_path, {"tools": self.entries})
@@ -0,0 +1,219 @@
+import hashlib
+import os
+import threading
+from typing import Any, Dict
+from urllib.parse import urldefrag, urljoin
+
+import requests
+
+from .file_utils import read_json, write_json_atomic
+
+BUNDLED_SCHEMA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schemas")
+
+
+class SchemaResolver:
+    """
+    Resolve the `$ref` references of the extended schemas, like `http://zoo-project.org/dl/link.json`.
+
+    Referenced documents are looked up in memory, then in the bundled schemas, then in the on-disk
+    cache and only then fetched. A fetched document is stored on disk, so later runs work offline.
+    The bundled directory holds JSON schemas with an `$id`, which are preloaded so that the common
+    references resolve without network access. Every reference is resolved once per resolver and the
+    resolved schema is shared by all schemas that reference it, so a repeated reference costs one
+    dictionary lookup. One resolver is meant to be shared by all tools of a batch.
+
+    References that cannot be fetched, reference cycles and local references (`#/...`) of schemas
+    without a base URL are left in place.
+
+    :param cache_dir: Directory in which fetched schemas are stored, or None to keep them in memory only.
+    :param bundled_dir: Directory of the bundled schemas, or None to preload nothing.
+    :param session: Object providing ``get``, either the requests module or a requests.Session.
+    :param offline: If set, referenced schemas are never fetched.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        bundled_dir: str | None = BUNDLED_SCHEMA_DIR,
+        session=requests,
+        offline: bool = False,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.session = session
+        self.offline = offline
+        self.lock = threading.Lock()
+        # Document URL -> document, None if it could not be retrieved
+        self.documents = {}
+        # Reference URL -> resolved schema
+        self.resolved = {}
+        if bundled_dir is not None:
+            self.preload(bundled_dir)
+
+    def preload(self, directory: str) -> None:
+        """
+        Load every JSON schema with an `$id` in a directory into the memory cache.
+
+        Args:
+            directory (str): The directory of the schemas.
+        """
+        if not os.path.isdir(directory):
+            return
+        for file_name in sorted(os.listdir(directory)):
+            if not file_name.endswith(".json"):
+                continue
+            document = read_json(os.path.join(directory, file_name))
+            if isinstance(document, dict) and isinstance(document.get("$id"), str):
+                self.documents[urldefrag(document["$id"])[0]] = document
+
+    def get_cache_path(self, url: str) -> str:
+        """
+        Return the path of the on-disk cache entry of a document.
+        """
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get_document(self, url: str) -> Dict | None:
+        """
+        Return a referenced document, retrieving it if it is not cached.
+
+        Args:
+            url (str): The URL of the document, without fragment.
+
+        Returns:
+            dict or None: The document, or None if it is not cached and cannot be fetched.
+        """
+        with self.lock:
+            if url in self.documents:
+                return self.documents[url]
+
+        document = read_json(self.get_cache_path(url)) if self.cache_dir is not None else None
+        if document is None and not self.offline:
+            document = self.fetch_document(url)
+            if document is not None and self.cache_dir is not None:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                write_json_atomic(self.get_cache_path(url), document)
+
+        with self.lock:
+            # Failures are remembered too, so that every document is requested at most once
+            return self.documents.setdefault(url, document)
+
+    def fetch_document(self, url: str) -> Dict | None:
+        """
+        Fetch a referenced document.
+
+        Returns:
+            dict or None: The document, or None if the request failed.
+        """
+        try:
+            response = self.session.get(url, timeout=60)
+            response.raise_for_status()
+            return response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Warning: Failed to retrieve referenced schema {url}: {e}")
+            return None
+
+    def resolve(self, schema: Any, base_url: str | None = None, active: frozenset = frozenset()) -> Any:
+        """
+        Return a schema in which every resolvable `$ref` is replaced by the referenced schema.
+
+        Keywords next to a `$ref` are kept and override those of the referenced schema. Only the
+        objects that contain a resolved reference are copied, the other parts of the schema are
+        shared with it. The schema is walked with an explicit stack, so that deep schemas cannot
+        exceed the recursion limit.
+
+        Args:
+            schema: The schema to resolve.
+            base_url (str, optional): The URL relative references are resolved against.
+            active (frozenset): The references being resolved, used to detect cycles.
+
+        Returns:
+            The resolved schema, the schema itself if it has no resolvable reference.
+        """
+        # id(object) -> resolved object, for every dict and list that was walked
+        resolved = {}
+        # Objects are visited twice: first to push their children, then to assemble them
+        stack = [(schema, False)]
+        while stack:
+            value, assemble = stack.pop()
+            if id(value) in resolved:
+                continue
+            if isinstance(value, dict):
+                items = list(value.items())
+            elif isinstance(value, list):
+                items = list(enumerate(value))
+            else:
+                continue
+
+            if not assemble:
+                stack.append((value, True))
+                stack.extend((item, False) for _, item in items if isinstance(item, (dict, list)))
+                continue
+
+            target = None
+            if isinstance(value, dict) and isinstance(value.get("$ref"), str):
+                target = self.resolve_reference(reference=value["$ref"], base_url=base_url, active=active)
+            if target is not None and len(value) == 1:
+                resolved[id(value)] = target
+                continue
+
+            children = {key: resolved.get(id(item), item) if isinstance(item, (dict, list)) else item for key, item in items}
+            if target is None and all(children[key] is item for key, item in items):
+                resolved[id(value)] = value
+            elif isinstance(value, list):
+                resolved[id(value)] = list(children.values())
+            elif target is None:
+                resolved[id(value)] = children
+            else:
+                del children["$ref"]
+                resolved[id(value)] = {**target, **children}
+        return resolved.get(id(schema), schema)
+
+    def resolve_reference(self, reference: str, base_url: str | None, active: frozenset) -> Any:
+        """
+        Return the resolved schema a reference points to.
+
+        Args:
+            reference (str): The value of the `$ref`.
+            base_url (str or None): The URL of the document containing the reference.
+            active (frozenset): The references being resolved, used to detect cycles.
+
+        Returns:
+            The resolved schema, or None if the reference is not resolvable.
+        """
+        if base_url is None and reference.startswith("#"):
+            return None
+        url = urljoin(base_url, reference) if base_url is not None else reference
+        if url in active:
+            return None
+        with self.lock:
+            if url in self.resolved:
+                return self.resolved[url]
+
+        document_url, fragment = urldefrag(url)
+        document = self.get_document(document_url)
+        target = self.get_fragment(document, fragment) if document is not None else None
+        if target is None:
+            return None
+
+        resolved = self.resolve(target, base_url=document_url, active=active | {url})
+        with self.lock:
+            return self.resolved.setdefault(url, resolved)
+
+    def get_fragment(self, document: Any, fragment: str) -> Any:
+        """
+        Return the part of a document a JSON pointer fragment like `/definitions/format` points to.
+
+        Returns:
+            The part of the document, or None if the pointer does not exist.
+        """
+        target = document
+        for part in fragment.split("/"):
+            if not part:
+                continue
+            part = part.replace("~1", "/").replace("~0", "~")
+            if isinstance(target, dict) and part in target:
+                target = target[part]
+            elif isinstance(target, list) and part.isdigit() and int(part) < len(target):
+                target = target[int(part)]
+            else:
+                return None
+        return target
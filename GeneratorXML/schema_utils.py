@@ -0,0 +1,51 @@
+import math
+from typing import Dict, Tuple
+
+from .schema_resolver import SchemaResolver
+
+
+def replace_dot_with_underscore(name: str) -> str:
+    """
+    Replace all dots in a parameter name with underscores, which Galaxy does not allow in names.
+
+    Args:
+        name (str): The name of an input or output.
+
+    Returns:
+        str: The name with dots replaced by underscores.
+    """
+    return name.replace(".", "_")
+
+
+def get_array_items(schema: Dict) -> Tuple:
+    """
+    Get the minimum and maximum number of items allowed in an array based on the `oneOf` constraints of its schema.
+
+    Args:
+        schema (Dict): The schema defining the array and its constraints.
+
+    Returns:
+        tuple: The minimum and maximum number of items, math.inf and -math.inf if there is no constraint.
+    """
+    min_items = math.inf
+    max_items = -math.inf
+    for constraint in schema.get("oneOf", []):
+        max_items = max(max_items, constraint.get("maxItems", -math.inf))
+        min_items = min(min_items, constraint.get("minItems", math.inf))
+    return min_items, max_items
+
+
+def resolve_extended_schema(extended_schema: Dict | None, schema_resolver: SchemaResolver | None) -> Dict | None:
+    """
+    Resolve the `$ref` references of an extended schema.
+
+    Args:
+        extended_schema (Dict or None): The extended schema of an input or output.
+        schema_resolver (SchemaResolver or None): The resolver, or None to leave the references in place.
+
+    Returns:
+        Dict or None: The resolved schema, or the schema itself if there is no resolver.
+    """
+    if extended_schema is None or schema_resolver is None:
+        return extended_schema
+    return schema_resolver.resolve(extended_schema)
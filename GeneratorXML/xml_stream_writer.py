@@ -0,0 +1,124 @@
+import copy
+from typing import BinaryIO
+
+from galaxyxml import GalaxyXML
+from galaxyxml import tool
+from lxml import etree
+
+
+class RootExport(GalaxyXML):
+    """
+    Final step of the galaxyxml export that can hand out the assembled XML root
+    instead of serialising it to a string.
+    """
+
+    def export(self):
+        if getattr(self, "capture_root", False):
+            return self.root
+        return super().export()
+
+
+class StreamingTool(tool.Tool, RootExport):
+    """
+    Galaxy tool whose XML can be written to a file in pieces.
+
+    `Tool.export` assembles the XML on a copy of the tool and ends with
+    `super(Tool, copy).export()`, which resolves to `RootExport.export` for this class.
+    `export_root` uses this to get the assembled root without serialising it.
+    """
+
+    def __deepcopy__(self, memo):
+        if getattr(self, "export_in_place", False):
+            # `Tool.export` copies the whole tool first, which doubles the memory of the parameter tree
+            return self
+        clone = object.__new__(type(self))
+        memo[id(self)] = clone
+        clone.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        return clone
+
+    def export_root(self, in_place: bool = False):
+        """
+        Assemble the tool XML like `export`, but return the root element instead of a string.
+
+        Args:
+            in_place (bool): Assemble the XML on the tool itself instead of on a deep copy. The
+                sections of the tool are then moved below the returned root, so the tool cannot
+                be exported again.
+
+        Returns:
+            lxml.etree._Element: The root element of the assembled tool XML.
+        """
+        self.capture_root = True
+        self.export_in_place = in_place
+        try:
+            return self.export()
+        finally:
+            self.capture_root = False
+            self.export_in_place = False
+
+
+class ToolXMLStreamWriter:
+    """
+    Write the XML of a StreamingTool to a file handle element by element.
+
+    The tool is assembled in place instead of on a deep copy, and the elements are serialised one
+    at a time: every element with child elements, like `<inputs>`, a `<section>` or a `<param>`
+    with thousands of `<option>` elements, is opened with `xmlfile.element` and its children are
+    written one after another. Besides the parameter tree of the tool itself, only the open
+    elements and one serialised leaf are held in memory. The indentation is written between the
+    elements instead of being set on the tree, so the output is identical to `tool.export()`.
+    The tool is consumed by writing it.
+
+    :param pretty_print: Whether to indent the XML like `tool.export()` does.
+    """
+
+    def __init__(self, pretty_print: bool = True) -> None:
+        self.pretty_print = pretty_print
+
+    def write(self, streaming_tool: StreamingTool, file_handle: BinaryIO):
+        """
+        Write the tool XML to a binary file handle.
+
+        Args:
+            streaming_tool (StreamingTool): The tool to write, it cannot be exported again afterwards.
+            file_handle (BinaryIO): The file handle opened in binary mode.
+        """
+        root = streaming_tool.export_root(in_place=True)
+        with etree.xmlfile(file_handle, encoding="utf-8") as xml_file:
+            self.write_element(xml_file, root, level=0)
+        if self.pretty_print:
+            file_handle.write(b"\n")
+
+    def write_element(self, xml_file, element, level: int):
+        """
+        Write an element, descending into it if it has child elements.
+
+        Elements with text next to their children (mixed content) are written as a whole, as the
+        pretty printer of lxml does not indent them either.
+
+        Args:
+            xml_file: The incremental writer of `etree.xmlfile`.
+            element (lxml.etree._Element): The element to write.
+            level (int): The nesting depth of the element, used for the indentation.
+        """
+        if not isinstance(element.tag, str) or len(element) == 0 or (element.text and element.text.strip()):
+            xml_file.write(element, with_tail=False)
+            return
+        with xml_file.element(element.tag, element.attrib, nsmap=element.nsmap):
+            for child in element:
+                if self.pretty_print:
+                    xml_file.write("\n" + "  " * (level + 1))
+                self.write_element(xml_file, child, level + 1)
+            if self.pretty_print:
+                xml_file.write("\n" + "  " * level)
+
+    def write_file(self, streaming_tool: StreamingTool, file_path: str):
+        """
+        Write the tool XML to a file.
+
+        Args:
+            streaming_tool (StreamingTool): The tool to write.
+            file_path (str): The path of the XML file.
+        """
+        with open(file_path, "wb") as file:
+            self.write(streaming_tool, file)
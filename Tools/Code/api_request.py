@@ -1,9 +1,38 @@
 import requests
+import signal
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Mapping
 from typing import Any
 from pprint import pprint
 import time
-import urllib.request
+
+try:
+    # Attempt relative import for testing context
+    from .http_client import HttpClient
+    from .inline_dataset import JsonPayloadStream
+    from .result_cache import ResultCache
+    from .polling_strategy import JobTimeoutError, PollingStrategy
+except ImportError:
+    # Fallback to absolute import for direct execution
+    from http_client import HttpClient
+    from inline_dataset import JsonPayloadStream
+    from result_cache import ResultCache
+    from polling_strategy import JobTimeoutError, PollingStrategy
+
+
+class OutputWriteError(RuntimeError):
+    """
+    Raised when one or more outputs of a job could not be written.
+    """
+
+
+def handle_termination(signum, frame):
+    """
+    Turns the SIGTERM with which Galaxy stops a job into SystemExit, so that the running code can clean up.
+    """
+    raise SystemExit(128 + signum)
 
 
 class APIRequest:
@@ -16,6 +45,12 @@ class APIRequest:
         file_directory,
         transmission_mode,
         prefer,
+        polling_strategy=None,
+        callback_listener=None,
+        http_client=None,
+        result_cache=None,
+        process_version=None,
+        single_flight=None,
     ):
         self.execute = execute
         self.headers = {
@@ -34,6 +69,15 @@ class APIRequest:
         self.jobs = "jobs/"
         self.job_id = ""
         self.results = "/results"
+        self.polling_strategy = polling_strategy or PollingStrategy()
+        self.callback_listener = callback_listener
+        self.http_client = http_client or HttpClient()
+        self.max_output_workers = 4
+        self.pending_status = ("accepted", "running")
+        self.job_status = None
+        self.result_cache = result_cache
+        self.process_version = process_version
+        self.single_flight = single_flight
 
     # Improve for non raw, and more than one data type
     def post_request(self):
@@ -52,21 +96,143 @@ class APIRequest:
             If "raw" is chosen in the Galaxy interface, the method writes `response.content` to the corresponding file.
             Otherwise, it determines whether the transmission mode is "reference" or "value" and writes the appropriate
             data accordingly.
+            If a result cache is set and holds the outputs of an identical execution, they are copied to the output
+            files without contacting the server.
+            Identical executions of concurrent jobs on the same host are only sent once if a single flight is set.
+            The other jobs wait and process the result document of the first one.
         """
+        cache_key = None
+        if self.result_cache is not None or self.single_flight is not None:
+            cache_key = self.get_cache_key()
+        if self.single_flight is None:
+            self.execute_request(cache_key)
+            return
+
+        with self.single_flight.run(cache_key) as flight:
+            if flight.result is not None:
+                print(f"Reusing the results of job {flight.job_id} of an identical execution")
+                self.process_response_data(flight.result)
+                return
+            response_data = self.execute_request(cache_key)
+            if response_data is not None and self.job_status != "failed":
+                flight.record(self.job_id or None, response_data)
+
+    def get_cache_key(self):
+        """
+        Returns the key of the execution in the result cache and the single flight.
+        """
+        return ResultCache.compute_key(
+            self.execute,
+            self.process_version,
+            self.payload,
+            response_input=self.response_input,
+            transmission_mode=self.transmission_mode,
+            output_formats=self.output_format_dictionary,
+        )
 
+    def execute_request(self, cache_key):
+        """
+        Restores the outputs from the result cache, or sends the execute request and processes its results.
+
+        Parameters:
+            - cache_key (str or None): The cache key of the execution, None if no result cache is used.
+
+        Returns:
+            - dict or None: The result document, None if the outputs were restored from the cache or the request failed.
+        """
+        if self.result_cache is not None:
+            if self.result_cache.restore(cache_key, self.get_output_files()) is not None:
+                print("Outputs restored from the result cache")
+                return None
+
+        response = self.check_job_id(response=self.submit())
+        response_data = self.process_results(response)
+        if response_data is None:
+            return None
+        if cache_key is not None and self.job_status != "failed" and self.is_cacheable():
+            self.result_cache.store(cache_key, response_data, self.get_output_files())
+        return response_data
+
+    def submit(self):
+        """
+        Sends the execute request.
+
+        Returns:
+            - The response object of the POST request. If the job is executed asynchronously (status code 201),
+              `self.job_id` and `self.job_status` are set from the status info in the response.
+        """
         url = self.get_url(keyword="execute")
-        response = requests.post(
+        # A synchronous execution only responds once the job finished, so wait as long as for an asynchronous one,
+        # without a read timeout if polling has no deadline.
+        # The body is streamed, so that inline datasets are only encoded while they are sent.
+        response = self.http_client.post(
             url,
             headers=self.headers,
-            json=self.payload,
+            data=JsonPayloadStream(self.payload),
+            timeout=self.http_client.get_timeout(read_timeout=self.polling_strategy.timeout),
         )
-        response = self.check_job_id(response=response)
+        if response.status_code == 201:
+            response_data = response.json()
+            self.job_id = response_data["jobID"]
+            self.job_status = response_data["status"]
+        return response
+
+    def get_job_status(self):
+        """
+        Requests the status of the current job.
+
+        Returns:
+            - str: The status of the job, for example "accepted", "running", "successful" or "failed".
+        """
+        response = self.http_client.get(url=self.get_url(keyword="jobs"), headers=self.accept_header)
+        response.raise_for_status()
+        return response.json()["status"]
+
+    def fetch_results(self):
+        """
+        Requests the results of the finished job and writes them to the output files.
+
+        Returns:
+            - dict or None: The result document, None if the request failed.
+        """
+        response = self.http_client.get(url=self.get_url(keyword="results"), headers=self.accept_header)
+        return self.process_results(response)
+
+    def process_results(self, response):
+        """
+        Writes the outputs of a result response to the output files.
+
+        Parameters:
+            - response: The response object of the execute or results request.
+
+        Returns:
+            - dict or None: The result document, None if the response is an error.
+        """
         if not response.ok:
             self.handle_response_error(response)
-            return
-
+            return None
         response_data = response.json()
         self.process_response_data(response_data)
+        return response_data
+
+    def get_output_files(self):
+        """
+        Returns the path of the Galaxy dataset of each output.
+        """
+        return {
+            key: self.get_output_file_path(key)
+            for key in self.transmission_mode
+            if f"output_data_{key}" in self.file_directory
+        }
+
+    def is_cacheable(self):
+        """
+        Checks whether the outputs are self-contained and can be served from the result cache.
+
+        References point to files on the server that may be deleted later, so only raw outputs
+        and outputs transmitted by value are cached.
+        """
+        return self.response_input == "raw" or all(mode == "value" for mode in self.transmission_mode.values())
 
     def handle_response_error(self, response):
         """
@@ -86,25 +252,45 @@ class APIRequest:
         """
         Processes response data based on the transmission mode.
 
-        Parameters:
-            - response_data (dict): Dictionary containing response data.
-
         This method iterates over the keys of `transmission_mode`, retrieves the corresponding
         transmission item from `response_data`, determines the output file path, and writes the
-        transmission item to the file based on the specified mode.
+        transmission item to the file based on the specified mode. The outputs are written
+        concurrently by at most `self.max_output_workers` threads, so that the downloads of
+        several outputs overlap.
 
         Parameters:
             - response_data (dict): Dictionary containing response data.
 
+        Raises:
+            - OutputWriteError: If one or more outputs could not be written. Every failed output
+              is reported on stderr, the other outputs are still written.
+
         Returns:
             None
         """
+        outputs = {}
         for key, value in self.transmission_mode.items():
             transmission_item = response_data.get(key)
             if transmission_item is None:
                 continue
-            output_file_path = self.get_output_file_path(key)
-            self.write_transmission_item_based_on_mode(output_file_path, transmission_item, value)
+            outputs[key] = (self.get_output_file_path(key), transmission_item, value)
+        if not outputs:
+            return
+
+        errors = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_output_workers, len(outputs))) as executor:
+            futures = {
+                executor.submit(self.write_transmission_item_based_on_mode, *output): key for key, output in outputs.items()
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    errors[key] = e
+                    print(f"Failed to write output {key}: {e}", file=sys.stderr)
+        if errors:
+            raise OutputWriteError(f"Failed to write outputs: {', '.join(sorted(errors))}")
 
     def get_output_file_path(self, key):
         """
@@ -150,14 +336,14 @@ class APIRequest:
             - transmission_item (dict or any): Item to be written to the file.
 
         If transmission_item is a dictionary, retrieves the URL from the 'href' field and
-        downloads the file from that URL to the specified output_file_path using urllib.request.urlretrieve.
+        downloads the file from that URL to the specified output_file_path using the shared HTTP client.
         If transmission_item is not a dictionary, assumes it's a reference and calls write_transmission_item
         with output_file_path, transmission_item, and mode="reference".
         """
         if isinstance(transmission_item, dict):
             url_file = transmission_item.get("href")
             if url_file:
-                urllib.request.urlretrieve(url_file, output_file_path)
+                self.http_client.download(url_file, output_file_path)
         else:
             self.write_transmission_item(
                 output_file_path=output_file_path,
@@ -186,8 +372,10 @@ class APIRequest:
     def check_job_id(self, response):
         """
         Checks if the response status code is 201. If so, it indicates that the job is still running.
-        Continuously checks the job status every 20 seconds. If the job fails, returns an error message;
-        otherwise, returns the result.
+        Polls the job status with the intervals of `self.polling_strategy` until the job is no longer
+        accepted or running. If a callback listener is set, a success or failed callback ends the wait
+        early and the polling only serves as a fallback. If the job fails, an error message is printed;
+        in any case, the result is returned.
 
         Parameters:
             - response: The response object obtained from the POST request.
@@ -195,6 +383,12 @@ class APIRequest:
         Returns:
             - The response object containing the job result, if available.
 
+        Raises:
+            - JobTimeoutError: If the job did not finish within the timeout of the polling strategy.
+              The job is dismissed before the error is raised.
+            - SystemExit: If the tool received SIGTERM, e.g. because the Galaxy job was stopped.
+              The job is dismissed before the error is raised.
+
         Note:
             The method waits for the job to complete or fail before returning the response.
         """
@@ -203,15 +397,35 @@ class APIRequest:
             status = response_data["status"]
             self.job_id = response_data["jobID"]
             url = self.get_url(keyword="jobs")
-            while status == "running":
-                print(status)
-                time.sleep(20)
-                response = requests.get(url=url, headers=self.accept_header)
-                response_data = response.json()
-                status = response_data["status"]
+            self.polling_strategy.start()
+            attempt = 0
+            previous_handler = self.install_termination_handler()
+            try:
+                while status in self.pending_status:
+                    print(status)
+                    if self.polling_strategy.is_expired():
+                        self.cancel_job()
+                        raise JobTimeoutError(
+                            f"Job {self.job_id} did not finish within {self.polling_strategy.timeout} seconds"
+                        )
+                    interval = self.polling_strategy.get_interval(attempt, self.get_retry_after(response))
+                    callback_status = self.wait_for_callback(interval)
+                    attempt += 1
+                    if callback_status is not None:
+                        status = callback_status
+                        break
+                    response = self.http_client.get(url=url, headers=self.accept_header)
+                    response_data = response.json()
+                    status = response_data["status"]
+            except (KeyboardInterrupt, SystemExit):
+                self.cancel_job()
+                raise
+            finally:
+                self.restore_termination_handler(previous_handler)
             print(status)
+            self.job_status = status
             url = self.get_url(keyword="results")
-            response = requests.get(url=url, headers=self.accept_header)
+            response = self.http_client.get(url=url, headers=self.accept_header)
             if status == "failed":
                 print(
                     f"An error occurred. For further details, check OGC Job status through "
@@ -220,6 +434,69 @@ class APIRequest:
                 )
         return response
 
+    def install_termination_handler(self):
+        """
+        Installs handle_termination for SIGTERM while a job is polled, so that a stopped Galaxy job dismisses it.
+
+        Signal handlers can only be installed in the main thread. In other threads, for example those of a
+        batch execution, nothing is installed.
+
+        Returns:
+            - The previous SIGTERM handler, or None if no handler was installed.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return None
+        previous_handler = signal.signal(signal.SIGTERM, handle_termination)
+        # A handler that was not installed from Python is reported as None
+        return previous_handler if previous_handler is not None else signal.SIG_DFL
+
+    def restore_termination_handler(self, previous_handler):
+        """
+        Restores the SIGTERM handler replaced by install_termination_handler.
+        """
+        if previous_handler is not None:
+            signal.signal(signal.SIGTERM, previous_handler)
+
+    def wait_for_callback(self, interval):
+        """
+        Waits before the next status request.
+
+        Parameters:
+            - interval (float): Seconds to wait.
+
+        Returns:
+            - str or None: The final job status if a success or failed callback arrived, otherwise None.
+        """
+        if self.callback_listener is None:
+            time.sleep(interval)
+            return None
+        return self.callback_listener.wait(interval)
+
+    def get_retry_after(self, response):
+        """
+        Returns the `Retry-After` header of a response, or None if the server did not send one.
+
+        Parameters:
+            - response: The response object of the last request.
+        """
+        headers = getattr(response, "headers", None)
+        if not isinstance(headers, Mapping):
+            return None
+        return headers.get("Retry-After")
+
+    def cancel_job(self):
+        """
+        Dismisses the current job with a DELETE request on its status URL.
+
+        Failures are only reported, since the job is abandoned either way.
+        """
+        url = self.get_url(keyword="jobs")
+        try:
+            response = self.http_client.delete(url=url, headers=self.accept_header)
+            print(f"Dismissed job {self.job_id}: {response.status_code}", file=sys.stderr)
+        except requests.exceptions.RequestException as e:
+            print(f"Failed to dismiss job {self.job_id}:", e, file=sys.stderr)
+
     def get_url(self, keyword):
         """
         Generates the URL based on the provided keyword.
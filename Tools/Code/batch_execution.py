@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+try:
+    # Attempt relative import for testing context
+    from .api_request import OutputWriteError
+    from .create_api_json import ApiJson
+    from .http_client import HttpClient
+    from .job_monitor import JobMonitor
+    from .polling_strategy import JobTimeoutError, PollingStrategy
+except ImportError:
+    # Fallback to absolute import for direct execution
+    from api_request import OutputWriteError
+    from create_api_json import ApiJson
+    from http_client import HttpClient
+    from job_monitor import JobMonitor
+    from polling_strategy import JobTimeoutError, PollingStrategy
+
+
+class BatchExecution:
+    """
+    Executes one process of the ZOO-Project server for many parameter sets and awaits the jobs collectively.
+
+    Every parameter set is turned into an execute request like a single run of the generated tool, but all
+    requests are sent asynchronously, by at most `max_workers` threads at a time, through one shared HTTP
+    client. The jobs are then awaited by one JobMonitor, instead of one polling loop per job, so that the
+    status requests of all jobs share one request budget. The results of a finished job are written while
+    the other jobs are still polled.
+
+    Parameters:
+        - process_name (str): The ID of the process, for example "OTB.BandMath".
+        - parameter_sets (list): One dictionary per execution, with the keys and values of the command line of
+          the generated tool (see ApiJson.convert), including the `output_data_*` paths the outputs are written to.
+        - http_client (HttpClient, optional): The client shared by all requests.
+        - polling_strategy (PollingStrategy, optional): The intervals and the timeout of the polling loop.
+        - max_workers (int): The maximum number of requests sent and results written at a time.
+        - max_requests_per_second (float): The maximum rate of status requests of all jobs together.
+    """
+
+    prefer = "respond-async;return=representation"
+
+    def __init__(
+        self,
+        process_name: str,
+        parameter_sets,
+        http_client=None,
+        polling_strategy=None,
+        max_workers: int = 8,
+        max_requests_per_second: float = 5.0,
+    ):
+        self.process_name = process_name
+        self.parameter_sets = parameter_sets
+        self.http_client = http_client or HttpClient(pool_size=max_workers)
+        self.polling_strategy = polling_strategy or PollingStrategy()
+        self.max_workers = max_workers
+        self.max_requests_per_second = max_requests_per_second
+
+    def create_requests(self):
+        """
+        Creates the execute request of every parameter set.
+
+        Returns:
+            - list: One APIRequest per parameter set, in the same order.
+        """
+        return [
+            ApiJson().create_api_request(
+                attributes={**attributes, "name": self.process_name, "prefer": self.prefer},
+                http_client=self.http_client,
+                polling_strategy=self.polling_strategy,
+            )
+            for attributes in self.parameter_sets
+        ]
+
+    def run(self):
+        """
+        Executes all parameter sets and writes their outputs.
+
+        Returns:
+            - list: The final status of every parameter set, in the same order: "successful", "failed",
+              or "dismissed" if the job did not finish within the timeout of the polling strategy.
+        """
+        api_requests = self.create_requests()
+        statuses = [None] * len(api_requests)
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            for index, response in enumerate(executor.map(self.submit, api_requests)):
+                if response is None:
+                    statuses[index] = "failed"
+                elif response.status_code == 201:
+                    pending[index] = api_requests[index]
+                else:
+                    # The server executed the job synchronously, the response already holds the results
+                    results[index] = executor.submit(api_requests[index].process_results, response)
+            self.await_jobs(pending, executor, results, statuses)
+            for index, future in results.items():
+                statuses[index] = self.get_result_status(api_requests[index], future)
+        return statuses
+
+    def submit(self, api_request):
+        """
+        Sends the execute request of one parameter set.
+
+        Returns:
+            - The response object, or None if the request could not be sent.
+        """
+        try:
+            return api_request.submit()
+        except requests.exceptions.RequestException as e:
+            print(f"Failed to submit {api_request.execute}: {e}", file=sys.stderr)
+            return None
+
+    def await_jobs(self, pending, executor, results, statuses):
+        """
+        Awaits the pending jobs with one JobMonitor. The results of a job are fetched as soon as it finished.
+
+        Parameters:
+            - pending (dict): The APIRequest of every pending job, by the index of its parameter set.
+            - executor (ThreadPoolExecutor): The executor the results of finished jobs are fetched on.
+            - results (dict): Receives the future of the result document of every finished job.
+            - statuses (list): Receives "dismissed" for the jobs that did not finish in time.
+        """
+        with JobMonitor(
+            http_client=self.http_client,
+            polling_strategy=self.polling_strategy,
+            max_requests_per_second=self.max_requests_per_second,
+        ) as monitor:
+            futures = {monitor.register(api_request.job_id): index for index, api_request in pending.items()}
+            for future in as_completed(futures):
+                index = futures[future]
+                api_request = pending[index]
+                try:
+                    status = future.result()
+                except JobTimeoutError as e:
+                    print(e, file=sys.stderr)
+                    api_request.cancel_job()
+                    statuses[index] = "dismissed"
+                    continue
+                print(f"Job {api_request.job_id}: {status}")
+                api_request.job_status = status
+                results[index] = executor.submit(api_request.fetch_results)
+
+    def get_result_status(self, api_request, future):
+        """
+        Returns the final status of a parameter set from the future of its result document.
+        """
+        try:
+            response_data = future.result()
+        except (requests.exceptions.RequestException, OutputWriteError, OSError) as e:
+            print(f"Failed to write the outputs of job {api_request.job_id}: {e}", file=sys.stderr)
+            return "failed"
+        if response_data is None or api_request.job_status == "failed":
+            return "failed"
+        return "successful"
+
+
+def parse_arguments(args=None):
+    parser = argparse.ArgumentParser(
+        description="Executes a process of the ZOO-Project server for every parameter set of a JSON file."
+    )
+    parser.add_argument("process", help="The ID of the process, for example OTB.BandMath.")
+    parser.add_argument(
+        "parameter_file",
+        help="JSON file with a list of parameter sets, each an object with the parameters of the generated tool.",
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Maximum number of concurrent requests.")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds to wait for all jobs to finish.")
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    arguments = parse_arguments(args)
+    with open(arguments.parameter_file) as file:
+        parameter_sets = json.load(file)
+    polling_strategy = PollingStrategy(timeout=arguments.timeout) if arguments.timeout else None
+    batch = BatchExecution(
+        process_name=arguments.process,
+        parameter_sets=parameter_sets,
+        polling_strategy=polling_strategy,
+        max_workers=arguments.workers,
+    )
+    statuses = batch.run()
+    for index, status in enumerate(statuses):
+        print(f"Parameter set {index}: {status}")
+    return 0 if all(status == "successful" for status in statuses) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+import json
+import os
+import secrets
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+
+class CallbackListener:
+    """
+    Small HTTP server that receives the subscriber callbacks of an OGC API job.
+
+    The OGC API Processes standard lets a client register a `subscriber` with the execute request.
+    The server then POSTs the job status to the success, failed and in-progress URIs instead of
+    having the client poll the job. Each listener serves its URIs below a random token, so that
+    only the server that received the execute request knows them.
+
+    Parameters:
+        - public_url (str or None): Base URL under which the ZOO-Project server reaches this listener,
+          None to use the address the listener binds to.
+        - host (str): Address the listener binds to.
+        - port (int): Port the listener binds to, 0 to pick a free port.
+    """
+
+    callback_status = {
+        "successful": "successful",
+        "failed": "failed",
+        "in-progress": "running",
+    }
+    final_status = ("successful", "failed")
+
+    def __init__(self, public_url: str | None = None, host: str = "0.0.0.0", port: int = 0):
+        self.public_url = public_url.rstrip("/") if public_url else None
+        self.host = host
+        self.port = port
+        self.token = secrets.token_urlsafe(16)
+        self.status = None
+        self.status_info = None
+        self.finished = threading.Event()
+        self.server = None
+        self.thread = None
+
+    @classmethod
+    def from_environment(cls):
+        """
+        Creates a listener from the OGC_CALLBACK_URL and OGC_CALLBACK_PORT environment variables.
+
+        OGC_CALLBACK_URL is the base URL the ZOO-Project server uses to reach the listener. The listener binds
+        to OGC_CALLBACK_PORT, or to the port of OGC_CALLBACK_URL if no port is given.
+
+        Returns:
+            - CallbackListener or None: The listener, or None if OGC_CALLBACK_URL is not set.
+        """
+        public_url = os.environ.get("OGC_CALLBACK_URL")
+        if not public_url:
+            return None
+        port = os.environ.get("OGC_CALLBACK_PORT") or urlsplit(public_url).port or 0
+        return cls(public_url=public_url, port=int(port))
+
+    def start(self):
+        """
+        Starts serving the callback URIs in a background thread.
+
+        The port may be in use, for example by the listener of another job on the same node. The job
+        then polls instead of receiving callbacks.
+
+        Returns:
+            - dict or None: The `subscriber` object for the execute request, None if the port cannot be bound.
+        """
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), self.create_handler())
+        except OSError as e:
+            print(f"Warning: Callback listener cannot bind port {self.port} ({e}), polling instead", file=sys.stderr)
+            return None
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.get_subscriber()
+
+    def stop(self):
+        """
+        Stops the listener and releases its port.
+        """
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.thread.join()
+            self.server = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def get_callback_url(self, name: str):
+        """
+        Returns the public URL of one of the callbacks.
+
+        Parameters:
+            - name (str): Either "successful", "failed" or "in-progress".
+        """
+        public_url = self.public_url
+        if public_url is None:
+            host, port = self.server.server_address[:2]
+            public_url = f"http://{host}:{port}"
+        return f"{public_url}/{self.token}/{name}"
+
+    def get_subscriber(self):
+        """
+        Returns the `subscriber` object of the execute request, as defined by OGC API Processes.
+        """
+        return {
+            "successUri": self.get_callback_url("successful"),
+            "failedUri": self.get_callback_url("failed"),
+            "inProgressUri": self.get_callback_url("in-progress"),
+        }
+
+    def wait(self, timeout: float):
+        """
+        Waits until a success or failed callback arrives.
+
+        Parameters:
+            - timeout (float): Maximum number of seconds to wait.
+
+        Returns:
+            - str or None: "successful" or "failed", or None if no final callback arrived in time.
+        """
+        if self.finished.wait(timeout):
+            return self.status
+        return None
+
+    def receive(self, name: str, body: bytes):
+        """
+        Records a callback.
+
+        Parameters:
+            - name (str): The callback that was called, either "successful", "failed" or "in-progress".
+            - body (bytes): The request body, usually the status info of the job.
+        """
+        try:
+            self.status_info = json.loads(body) if body else None
+        except ValueError:
+            self.status_info = None
+        status = self.callback_status[name]
+        print(f"Callback received: {status}")
+        if status in self.final_status:
+            self.status = status
+            self.finished.set()
+
+    def create_handler(self):
+        """
+        Creates the request handler class bound to this listener.
+        """
+        listener = self
+
+        class CallbackHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                parts = self.path.strip("/").split("/")
+                if len(parts) != 2 or parts[0] != listener.token or parts[1] not in listener.callback_status:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                listener.receive(parts[1], self.rfile.read(length))
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                print(f"Callback listener: {format % args}", file=sys.stderr)
+
+        return CallbackHandler
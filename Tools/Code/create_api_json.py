@@ -7,9 +7,19 @@ from pprint import pprint
 try:
     # Attempt relative import for testing context
     from .api_request import APIRequest
+    from .callback_listener import CallbackListener
+    from .inline_dataset import InlineDataset
+    from .result_cache import ResultCache
+    from .single_flight import SingleFlight
+    from .polling_strategy import PollingStrategy
 except ImportError:
     # Fallback to absolute import for direct execution
     from api_request import APIRequest
+    from callback_listener import CallbackListener
+    from inline_dataset import InlineDataset
+    from result_cache import ResultCache
+    from single_flight import SingleFlight
+    from polling_strategy import PollingStrategy
 
 from typing import Dict, List
 
@@ -29,25 +39,62 @@ class ApiJson:
         args = sys.argv[1:]  # Exclude the first argument which is the script name
         attributes = self.convert(args=args)
 
-        prefer = attributes["prefer"]
+        # The listener is only used if the Galaxy job environment sets OGC_CALLBACK_URL
+        callback_listener = CallbackListener.from_environment()
+        subscriber = callback_listener.start() if callback_listener is not None else None
+        if subscriber is None:
+            # Without a bound listener, the job is only polled
+            callback_listener = None
+        # With callbacks, polling is only a fallback for lost callbacks and can be infrequent
+        defaults = {"initial_interval": 30.0, "max_interval": 300.0} if subscriber else {}
+        polling_strategy = PollingStrategy.from_environment(**defaults)
+
+        apirequest = self.create_api_request(
+            attributes=attributes,
+            subscriber=subscriber,
+            polling_strategy=polling_strategy,
+            callback_listener=callback_listener,
+            result_cache=ResultCache.from_environment(),
+            single_flight=SingleFlight.from_environment(),
+        )
+        print("Input JSON file for ZOO-Project API")
+        pprint(apirequest.payload)
+        try:
+            apirequest.post_request()
+        finally:
+            if callback_listener is not None:
+                callback_listener.stop()
+
+    def create_api_request(self, attributes: Dict, subscriber: Dict | None = None, **request_options) -> APIRequest:
+        """
+        Create the execute request for one set of attributes, as given on the command line of a generated tool.
+
+        Args:
+            attributes (Dict): The attributes, including the process name, inputs, outputs and the prefer header.
+            subscriber (Dict, optional): The callback URIs of the job, see create_openapi_input_file.
+            request_options: Further keyword arguments of APIRequest, e.g. the HTTP client or the polling strategy.
 
+        Returns:
+            APIRequest: The request, ready to be sent.
+        """
         inputs = self.process_input_values(attributes=attributes)
         outputs = self.process_output_values(attributes=attributes)
         response = self.process_response_values(attributes=attributes)
 
-        input_json = self.create_openapi_input_file(inputs=inputs, outputs=outputs, response="document")
-        print("Input JSON file for ZOO-Project API")
-        pprint(input_json)
-        apirequest = APIRequest(
+        input_json = self.create_openapi_input_file(
+            inputs=inputs, outputs=outputs, response="document", subscriber=subscriber
+        )
+        return APIRequest(
             execute=self.get_process_execution(attributes=attributes),
             payload=input_json,
             response_input=response,
             output_format_dictionary=self.output_format_dictionary,
             file_directory=self.file_directory,
             transmission_mode=self.transmission_mode,
-            prefer=prefer,
+            prefer=attributes["prefer"],
+            process_version=attributes.get("processVersion"),
+            **request_options,
         )
-        apirequest.post_request()
 
     def modify_attributes(self, attributes: Dict):
         """
@@ -129,7 +176,7 @@ class ApiJson:
         # Convert to lowercase
         return cleaned_name.lower()
 
-    def create_openapi_input_file(self, inputs: Dict, outputs: Dict, response: str) -> Dict:
+    def create_openapi_input_file(self, inputs: Dict, outputs: Dict, response: str, subscriber: Dict | None = None) -> Dict:
         """
         Creates a dictionary representing an OpenAPI input file.
 
@@ -140,6 +187,8 @@ class ApiJson:
             inputs (Dict): A dictionary containing input data.
             outputs (Dict): A dictionary containing output data.
             response (str): Containing the response type which is always "document".
+            subscriber (Dict, optional): The successUri, failedUri and inProgressUri the server
+                calls back when the job status changes.
 
         Returns:
             Dict: A dictionary containing the combined inputs, outputs, and response.
@@ -148,6 +197,8 @@ class ApiJson:
         result_dictionary["inputs"] = inputs
         result_dictionary["outputs"] = outputs
         result_dictionary["response"] = response
+        if subscriber:
+            result_dictionary["subscriber"] = subscriber
         return result_dictionary
 
     def process_input_values(self, attributes: Dict):
@@ -189,7 +240,8 @@ class ApiJson:
         Process input files by opening and reading them, and mark arrays for exclusion. A file is an input file
         if it doesn't have the prefix "output_data". If it has "output_data", we mark it for exclusion and
         store its path in the file directory because it contains the file path for the galaxy history.
-        Then generate JSON representations of the files.
+        Then generate JSON representations of the files. An input file is either a text file with one link
+        per line, or a binary dataset (e.g. a GeoTIFF) from the Galaxy history that is sent inline.
 
         Args:
             input_files (Dict[str, str]): Dictionary containing files with their paths.
@@ -203,10 +255,21 @@ class ApiJson:
             if "output_data" not in key:
                 # Adjust key for Cheetah compatibility
                 adjusted_key = key.replace("_", ".")  # change back because of Cheetah
-                file_contents = self.open_and_read_file(file_path)
                 exclusion_key = self.is_array + adjusted_key
                 self.exclusion_list.append(exclusion_key)
 
+                media_type = InlineDataset.sniff_media_type(file_path)
+                if media_type is not None:
+                    input_file_json_list.append(
+                        self.generate_inline_input_json(
+                            input_name=adjusted_key,
+                            dataset=InlineDataset(file_path=file_path, media_type=media_type),
+                            is_array=input_schema.get(exclusion_key) != "False",
+                        )
+                    )
+                    continue
+
+                file_contents = self.open_and_read_file(file_path)
                 # Determine if the input is an array based on the input schema
                 if input_schema.get(exclusion_key) == "False":
                     input_file_json_list.append(self.generate_input_file_json(input_name=adjusted_key, input_list=file_contents))
@@ -336,6 +399,7 @@ class ApiJson:
             "transmissionMode",
             "name",
             "prefer",
+            "processVersion",
         }
         return {
             key: value  # check if correct
@@ -529,6 +593,22 @@ class ApiJson:
         input_format = {input_name: {"href": link} for link in input_list}
         return input_format
 
+    def generate_inline_input_json(self, input_name: str, dataset: InlineDataset, is_array: bool):
+        """
+        Generate JSON representation of a dataset that is sent inline.
+
+        The dataset is encoded only when the request is sent, see JsonPayloadStream.
+
+        Args:
+            input_name (str): Name of the input.
+            dataset (InlineDataset): The local dataset.
+            is_array (bool): Whether the input is an array.
+
+        Returns:
+            dict: JSON representation of the input.
+        """
+        return {input_name: [dataset] if is_array else dataset}
+
     def create_input_json(self, non_data_inputs: Dict, input_files: Dict):
         """
         Create JSON representation of input data.
@@ -0,0 +1,219 @@
+import os
+import sys
+import tempfile
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Marks a read timeout that was not given, since None means waiting forever
+DEFAULT_TIMEOUT = object()
+
+
+class DownloadError(IOError):
+    """
+    Raised when a download ended with a different number of bytes than the server announced.
+    """
+
+
+class HttpClient:
+    """
+    HTTP client shared by all requests of a tool run.
+
+    All requests go through one keep-alive session, so polling the job status and downloading
+    results reuse the TLS connection of the execute request. Idempotent requests (GET, HEAD, PUT,
+    DELETE, OPTIONS) are retried with exponential backoff on connection errors and on the status
+    codes in `retry_status_codes`. POST is never retried, so that a job is not executed twice.
+
+    Parameters:
+        - pool_size (int): The maximum number of connections kept open per host.
+        - retries (int): How often an idempotent request is retried.
+        - backoff_factor (float): The base delay in seconds of the exponential backoff between retries.
+        - connect_timeout (float): Seconds to wait for a connection to be established.
+        - read_timeout (float): Seconds to wait for the server to send data.
+    """
+
+    retry_status_codes = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.retry_status_codes,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get_timeout(self, read_timeout=DEFAULT_TIMEOUT):
+        """
+        Returns the (connect, read) timeout tuple of a request.
+
+        Parameters:
+            - read_timeout (float or None, optional): Overrides the default read timeout, None waits forever.
+        """
+        return (self.connect_timeout, self.read_timeout if read_timeout is DEFAULT_TIMEOUT else read_timeout)
+
+    def request(self, method: str, url: str, **kwargs):
+        """
+        Sends a request through the shared session, with the default timeouts unless others are given.
+
+        Parameters:
+            - method (str): The HTTP method.
+            - url (str): The URL of the request.
+            - kwargs: Further arguments of `requests.Session.request`.
+
+        Returns:
+            - requests.Response: The response of the request.
+        """
+        kwargs.setdefault("timeout", self.get_timeout())
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def download(self, url: str, file_path: str, chunk_size: int = 1024 * 1024, max_resumes: int = 5):
+        """
+        Downloads a file through the shared session with constant memory use.
+
+        The body is streamed to disk in chunks of `chunk_size` bytes. If the connection drops, the download
+        continues from the last received byte with a `Range` request, up to `max_resumes` times. The file is
+        written to a temporary file next to `file_path` and renamed once its length matches the length
+        announced by the server, so that `file_path` never contains a partial download.
+
+        Parameters:
+            - url (str): The URL of the file.
+            - file_path (str): The path the file is written to.
+            - chunk_size (int): The number of bytes read from the connection at a time.
+            - max_resumes (int): How often an interrupted download is continued.
+
+        Raises:
+            - requests.exceptions.HTTPError: If the server responds with an error status code.
+            - requests.exceptions.RequestException: If the download was interrupted more than `max_resumes` times.
+            - DownloadError: If the number of received bytes does not match the announced length.
+        """
+        temp_path, file = self.open_download_file(file_path)
+        try:
+            with file:
+                received, expected = self.write_download(url, file, chunk_size, max_resumes)
+            if expected is not None and received != expected:
+                raise DownloadError(f"Received {received} of {expected} bytes from {url}")
+            if temp_path != file_path:
+                os.replace(temp_path, file_path)
+        except BaseException:
+            if temp_path != file_path:
+                os.unlink(temp_path)
+            raise
+        print(f"Downloaded {received} bytes from {url}")
+
+    def write_download(self, url: str, file, chunk_size: int, max_resumes: int):
+        """
+        Streams a file into an open file object, resuming with `Range` requests after connection failures.
+
+        Parameters:
+            - url (str): The URL of the file.
+            - file: The binary file object the content is written to.
+            - chunk_size (int): The number of bytes read from the connection at a time.
+            - max_resumes (int): How often an interrupted download is continued.
+
+        Returns:
+            - tuple: The number of received bytes and the announced length, or None if the server sent none.
+        """
+        # Ask for the unencoded body, so that byte offsets and Content-Length refer to the file itself
+        headers = {"Accept-Encoding": "identity"}
+        received = 0
+        expected = None
+        resumes = 0
+        while True:
+            if received:
+                headers["Range"] = f"bytes={received}-"
+            try:
+                with self.get(url, headers=headers, stream=True) as response:
+                    response.raise_for_status()
+                    if received and response.status_code != 206:
+                        # The server ignored the range, so the download starts over
+                        file.seek(0)
+                        file.truncate()
+                        received = 0
+                    if expected is None or response.status_code != 206:
+                        expected = self.get_content_length(response, received)
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        file.write(chunk)
+                        received += len(chunk)
+                if expected is None or received >= expected or resumes >= max_resumes:
+                    return received, expected
+                error = f"connection closed after {received} of {expected} bytes"
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout,
+            ) as e:
+                if resumes >= max_resumes:
+                    raise
+                error = e
+            resumes += 1
+            print(f"Download of {url} interrupted ({error}), resuming at byte {received}", file=sys.stderr)
+
+    @staticmethod
+    def get_content_length(response, offset: int):
+        """
+        Returns the total length of a file from the headers of a (partial) response.
+
+        Parameters:
+            - response (requests.Response): The response delivering the file from byte `offset` on.
+            - offset (int): The first byte contained in the response.
+
+        Returns:
+            - int or None: The length of the whole file, or None if the server did not announce it.
+        """
+        content_range = response.headers.get("Content-Range", "")
+        total = content_range.rpartition("/")[2]
+        if total.isdigit():
+            return int(total)
+        content_length = response.headers.get("Content-Length", "")
+        if content_length.isdigit():
+            return offset + int(content_length)
+        return None
+
+    @staticmethod
+    def open_download_file(file_path: str):
+        """
+        Opens a temporary file in the directory of `file_path`, or `file_path` itself if that is not possible.
+
+        Returns:
+            - tuple: The path of the opened file and the binary file object.
+        """
+        directory = os.path.dirname(file_path) or "."
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".download-", suffix=".part")
+        except OSError:
+            return file_path, open(file_path, "wb")
+        # mkstemp creates the file readable by the owner only, the renamed file keeps the mode of the target
+        mode = os.stat(file_path).st_mode & 0o777 if os.path.exists(file_path) else 0o644
+        os.fchmod(fd, mode)
+        return temp_path, os.fdopen(fd, "wb")
+
+    def close(self):
+        """
+        Closes the connections of the session.
+        """
+        self.session.close()
@@ -0,0 +1,163 @@
+import base64
+import hashlib
+import json
+import mmap
+import os
+import re
+import uuid
+
+
+class InlineDataset:
+    """
+    Local Galaxy dataset that is sent inline, base64 encoded, as the value of an execute request.
+
+    The file is not read when the payload is built. Its content is encoded chunk by chunk from a memory map
+    while the request body is sent, see JsonPayloadStream.
+
+    Parameters:
+        - file_path (str): The path of the dataset.
+        - media_type (str): The media type of the dataset, for example "image/tiff".
+    """
+
+    # Multiple of 3, so that the base64 encodings of consecutive chunks can be concatenated without padding
+    chunk_size = 3 * 256 * 1024
+
+    # Leading bytes of the binary formats that are sent inline
+    signatures = (
+        (b"II*\x00", "image/tiff"),
+        (b"MM\x00*", "image/tiff"),
+        (b"\x89PNG\r\n\x1a\n", "image/png"),
+        (b"\xff\xd8\xff", "image/jpeg"),
+        (b"GIF87a", "image/gif"),
+        (b"GIF89a", "image/gif"),
+        (b"%PDF-", "application/pdf"),
+        (b"PK\x03\x04", "application/zip"),
+    )
+
+    def __init__(self, file_path: str, media_type: str):
+        self.file_path = file_path
+        self.media_type = media_type
+
+    @classmethod
+    def sniff_media_type(cls, file_path: str):
+        """
+        Determines the media type of a binary dataset from its first bytes.
+
+        Parameters:
+            - file_path (str): The path of the dataset.
+
+        Returns:
+            - str or None: The media type, or None if the file is not one of the known binary formats or cannot be read.
+        """
+        try:
+            with open(file_path, "rb") as file:
+                header = file.read(16)
+        except OSError:
+            return None
+        for signature, media_type in cls.signatures:
+            if header.startswith(signature):
+                return media_type
+        return None
+
+    def get_size(self):
+        """
+        Returns the size of the dataset in bytes.
+        """
+        return os.path.getsize(self.file_path)
+
+    def get_encoded_size(self):
+        """
+        Returns the length of the base64 encoding of the dataset.
+        """
+        return 4 * ((self.get_size() + 2) // 3)
+
+    def iter_encoded(self):
+        """
+        Yields the base64 encoding of the dataset in chunks, without reading the whole file into memory.
+        """
+        if self.get_size() == 0:
+            return
+        with open(self.file_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start in range(0, len(data), self.chunk_size):
+                yield base64.b64encode(data[start : start + self.chunk_size])
+
+    def get_digest(self):
+        """
+        Returns the SHA-256 hash of the dataset, computed chunk by chunk.
+        """
+        digest = hashlib.sha256()
+        with open(self.file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(self.chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def to_json(self, value):
+        """
+        Returns the qualified input value of OGC API Processes with the given value.
+        """
+        return {"mediaType": self.media_type, "encoding": "base64", "value": value}
+
+    def __repr__(self):
+        return f"<inline {self.media_type} dataset {self.file_path}>"
+
+
+class JsonPayloadStream:
+    """
+    File-like JSON body of an execute request.
+
+    The payload is serialised once with a placeholder for every InlineDataset. While the body is read,
+    the placeholders are replaced by the streamed base64 encodings, so that neither the encoded datasets
+    nor the whole body are held in memory. The length of the body is known in advance, so that it is sent
+    with a Content-Length header instead of chunked transfer encoding.
+
+    Parameters:
+        - payload (dict): The execute request, which may contain InlineDataset objects.
+    """
+
+    def __init__(self, payload):
+        self.datasets = []
+        marker = uuid.uuid4().hex
+        skeleton = json.dumps(payload, default=lambda item: self.replace_dataset(item, marker)).encode("utf-8")
+        self.parts = re.split(rb'"' + marker.encode("ascii") + rb'"', skeleton)
+        self.length = sum(len(part) for part in self.parts) + sum(
+            dataset.get_encoded_size() + 2 for dataset in self.datasets
+        )
+        self.chunks = self.iter_chunks()
+        self.chunk = b""
+        self.position = 0
+
+    def replace_dataset(self, item, marker: str):
+        if not isinstance(item, InlineDataset):
+            raise TypeError(f"Object of type {type(item).__name__} is not JSON serializable")
+        self.datasets.append(item)
+        return item.to_json(marker)
+
+    def iter_chunks(self):
+        for index, part in enumerate(self.parts):
+            yield part
+            if index < len(self.datasets):
+                yield b'"'
+                yield from self.datasets[index].iter_encoded()
+                yield b'"'
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size: int = -1):
+        """
+        Reads up to `size` bytes of the body, or the rest of the body if `size` is negative.
+        """
+        pieces = []
+        while size != 0:
+            if self.position == len(self.chunk):
+                self.chunk = next(self.chunks, None)
+                self.position = 0
+                if self.chunk is None:
+                    self.chunk = b""
+                    break
+            end = len(self.chunk) if size < 0 else min(len(self.chunk), self.position + size)
+            pieces.append(self.chunk[self.position : end])
+            if size > 0:
+                size -= end - self.position
+            self.position = end
+        return b"".join(pieces)
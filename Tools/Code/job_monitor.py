@@ -0,0 +1,301 @@
+import copy
+import sys
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import Future
+
+import requests
+
+try:
+    # Attempt relative import for testing context
+    from .http_client import HttpClient
+    from .polling_strategy import JobTimeoutError, PollingStrategy
+except ImportError:
+    # Fallback to absolute import for direct execution
+    from http_client import HttpClient
+    from polling_strategy import JobTimeoutError, PollingStrategy
+
+
+class MonitoredJob:
+    """
+    A job registered with a JobMonitor.
+
+    Parameters:
+        - job_id (str): The ID of the job.
+        - polling_strategy (PollingStrategy): The started polling strategy of this job.
+    """
+
+    def __init__(self, job_id: str, polling_strategy: PollingStrategy):
+        self.job_id = job_id
+        self.polling_strategy = polling_strategy
+        self.future = Future()
+        self.attempt = 0
+        self.next_poll = time.monotonic() + polling_strategy.get_interval(0)
+
+    def schedule(self, retry_after=None):
+        """
+        Schedules the next status request after the interval of the polling strategy.
+        """
+        self.attempt += 1
+        self.next_poll = time.monotonic() + self.polling_strategy.get_interval(self.attempt, retry_after)
+
+
+class JobMonitor:
+    """
+    Tracks many OGC API jobs with one polling loop.
+
+    Jobs are registered by their ID and polled by a single background thread through a shared HTTP
+    client, each with the intervals of its own copy of `polling_strategy`. All status requests share
+    one budget of `max_requests_per_second`, so that the number of tracked jobs does not multiply
+    the load on the server. If more than one job is tracked, the statuses are requested with one
+    request to the `/jobs` list endpoint; jobs missing from the list are polled individually.
+    If the server does not support the list endpoint, every job is polled individually.
+
+    The final status of a job is delivered through the future returned by `register`, or through
+    a callback. If a job does not finish within the timeout of its polling strategy, its future
+    raises JobTimeoutError; dismissing the job is left to the caller.
+
+    Parameters:
+        - http_client (HttpClient, optional): The client the status requests are sent through.
+        - base_url (str): The base URL of the OGC API.
+        - polling_strategy (PollingStrategy, optional): The template of the polling strategy of each job.
+        - max_requests_per_second (float): The maximum rate of status requests of all jobs together.
+        - use_job_list (bool): Whether to try the `/jobs` list endpoint.
+    """
+
+    pending_status = ("accepted", "running")
+    # Responses of the `/jobs` list endpoint that mean the server does not support it
+    unsupported_list_status = (404, 405)
+    # Jobs that become due within this many seconds are polled together, so that they share a list request
+    batch_window = 0.25
+
+    def __init__(
+        self,
+        http_client=None,
+        base_url: str = "https://ospd.geolabs.fr:8300/ogc-api/",
+        polling_strategy=None,
+        max_requests_per_second: float = 5.0,
+        use_job_list: bool = True,
+    ):
+        self.http_client = http_client or HttpClient()
+        self.base_url = base_url
+        self.polling_strategy = polling_strategy or PollingStrategy()
+        self.request_interval = 1.0 / max_requests_per_second
+        self.use_job_list = use_job_list
+        self.accept_header = {"accept": "application/json"}
+        self.jobs = {}
+        self.condition = threading.Condition()
+        self.thread = None
+        self.closed = False
+        self.next_request = 0.0
+
+    def register(self, job_id: str, callback=None):
+        """
+        Starts tracking a job.
+
+        Parameters:
+            - job_id (str): The ID of the job.
+            - callback (callable, optional): Called with the future of the job once it finished.
+
+        Returns:
+            - concurrent.futures.Future: Resolves to the final status of the job, "successful" or "failed".
+        """
+        polling_strategy = copy.copy(self.polling_strategy)
+        polling_strategy.start()
+        job = MonitoredJob(job_id, polling_strategy)
+        if callback is not None:
+            job.future.add_done_callback(callback)
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("The job monitor is closed")
+            self.jobs[job_id] = job
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+            self.condition.notify()
+        return job.future
+
+    def close(self):
+        """
+        Stops the polling loop. The futures of jobs that are still tracked are cancelled.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join()
+        for job in list(self.jobs.values()):
+            job.future.cancel()
+        self.jobs.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def run(self):
+        """
+        The polling loop. Waits until a job is due, then polls all due jobs.
+        """
+        while True:
+            with self.condition:
+                due_jobs = self.get_due_jobs()
+                while not due_jobs and not self.closed:
+                    self.condition.wait(timeout=self.get_wait_time())
+                    due_jobs = self.get_due_jobs()
+                if self.closed:
+                    return
+            try:
+                self.poll(due_jobs)
+            except Exception as e:
+                # The loop must keep running for the other jobs
+                print(f"Job monitor: polling failed: {e}", file=sys.stderr)
+                for job in due_jobs:
+                    if not job.future.done():
+                        job.schedule()
+
+    def get_due_jobs(self):
+        """
+        Returns the jobs whose next status request is due, the longest overdue first.
+        """
+        now = time.monotonic() + self.batch_window
+        return sorted((job for job in self.jobs.values() if job.next_poll <= now), key=lambda job: job.next_poll)
+
+    def get_wait_time(self):
+        """
+        Returns the seconds until the next job is due, or None if no job is tracked.
+        """
+        if not self.jobs:
+            return None
+        return max(min(job.next_poll for job in self.jobs.values()) - self.batch_window - time.monotonic(), 0.0)
+
+    def poll(self, due_jobs):
+        """
+        Requests the status of the due jobs and resolves the futures of the finished ones.
+
+        Parameters:
+            - due_jobs (list): The jobs whose next status request is due.
+        """
+        for job in [job for job in due_jobs if job.polling_strategy.is_expired()]:
+            timeout = job.polling_strategy.timeout
+            self.finish(job, exception=JobTimeoutError(f"Job {job.job_id} did not finish within {timeout} seconds"))
+            due_jobs.remove(job)
+
+        with self.condition:
+            tracked_jobs = len(self.jobs)
+        if tracked_jobs > 1 and self.use_job_list:
+            statuses, retry_after = self.request_job_list()
+            if statuses is not None:
+                with self.condition:
+                    jobs = list(self.jobs.values())
+                # A finished job is resolved even if it was not due yet
+                for job in jobs:
+                    status = statuses.get(job.job_id)
+                    if status is not None and status not in self.pending_status:
+                        self.finish(job, result=status)
+                for job in due_jobs:
+                    if job.job_id in statuses and not job.future.done():
+                        job.schedule(retry_after)
+                due_jobs = [job for job in due_jobs if job.job_id not in statuses]
+
+        for job in due_jobs:
+            try:
+                status, retry_after = self.request_job_status(job.job_id)
+            except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+                # The job is polled again after the next interval
+                print(f"Failed to get the status of job {job.job_id}: {e}", file=sys.stderr)
+                job.schedule()
+                continue
+            if status in self.pending_status:
+                job.schedule(retry_after)
+            else:
+                self.finish(job, result=status)
+
+    def finish(self, job, result=None, exception=None):
+        """
+        Stops tracking a job and resolves its future.
+        """
+        with self.condition:
+            self.jobs.pop(job.job_id, None)
+        if exception is not None:
+            job.future.set_exception(exception)
+        else:
+            job.future.set_result(result)
+
+    def throttle(self):
+        """
+        Waits until the request budget allows the next status request.
+        """
+        now = time.monotonic()
+        if self.next_request > now:
+            time.sleep(self.next_request - now)
+            now = self.next_request
+        self.next_request = now + self.request_interval
+
+    def request_job_status(self, job_id: str):
+        """
+        Requests the status of one job.
+
+        Returns:
+            - tuple: The status of the job and the `Retry-After` header of the response, if any.
+        """
+        self.throttle()
+        response = self.http_client.get(url=f"{self.base_url}jobs/{job_id}", headers=self.accept_header)
+        response.raise_for_status()
+        return response.json()["status"], self.get_retry_after(response)
+
+    def request_job_list(self):
+        """
+        Requests the statuses of many jobs from the `/jobs` list endpoint.
+
+        Turns off the use of the list endpoint if the server does not support it, or if the list
+        contains none of the tracked jobs, for example because the server pages or filters it.
+        Other failures, such as a server error or too many requests, only skip the list for this
+        round, and it is requested again in the next one.
+
+        Returns:
+            - tuple: The status of each listed job by its ID, or None if the list is not available,
+              and the `Retry-After` header of the response, if any.
+        """
+        self.throttle()
+        try:
+            response = self.http_client.get(url=f"{self.base_url}jobs", headers=self.accept_header)
+        except requests.exceptions.RequestException as e:
+            print(f"Failed to get the job list: {e}", file=sys.stderr)
+            return None, None
+        if response.status_code in self.unsupported_list_status:
+            return self.disable_job_list()
+        try:
+            response.raise_for_status()
+            statuses = {job["jobID"]: job["status"] for job in response.json()["jobs"]}
+        except (requests.exceptions.RequestException, ValueError, KeyError, TypeError) as e:
+            print(f"Failed to get the job list: {e}", file=sys.stderr)
+            return None, None
+        with self.condition:
+            tracked = any(job_id in statuses for job_id in self.jobs)
+        if not tracked:
+            return self.disable_job_list()
+        return statuses, self.get_retry_after(response)
+
+    def disable_job_list(self):
+        """
+        Turns off the use of the `/jobs` list endpoint for the remaining jobs.
+
+        Returns:
+            - tuple: None for the statuses and the `Retry-After` header.
+        """
+        print("The job list is not available, polling every job individually", file=sys.stderr)
+        self.use_job_list = False
+        return None, None
+
+    @staticmethod
+    def get_retry_after(response):
+        """
+        Returns the `Retry-After` header of a response, or None if the server did not send one.
+        """
+        headers = getattr(response, "headers", None)
+        if not isinstance(headers, Mapping):
+            return None
+        return headers.get("Retry-After")
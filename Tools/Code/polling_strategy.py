@@ -0,0 +1,123 @@
+import os
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+class JobTimeoutError(RuntimeError):
+    """
+    Raised when a job did not finish within the overall timeout of the polling strategy.
+    """
+
+
+class PollingStrategy:
+    """
+    Decides how long to wait between two status requests of an OGC API job.
+
+    The first poll happens after `initial_interval` seconds. Every following interval is
+    `multiplier` times the previous one, up to `max_interval`. Short jobs are therefore noticed
+    shortly after they finish, while long jobs are not polled more often than necessary.
+    A `Retry-After` header sent by the server takes precedence over the computed interval.
+
+    Parameters:
+        - initial_interval (float): Seconds to wait before the first status request.
+        - max_interval (float): Upper bound of the computed interval in seconds.
+        - multiplier (float): Factor by which the interval grows after each poll.
+        - timeout (float or None): Seconds after which polling gives up, None to poll forever.
+    """
+
+    def __init__(
+        self,
+        initial_interval: float = 1.0,
+        max_interval: float = 20.0,
+        multiplier: float = 1.5,
+        timeout: float | None = 12 * 60 * 60,
+    ):
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.multiplier = multiplier
+        self.timeout = timeout
+        self.deadline = None
+
+    @classmethod
+    def from_environment(cls, **defaults):
+        """
+        Creates a strategy whose settings can be overridden by environment variables of the Galaxy job.
+
+        OGC_POLL_INITIAL_INTERVAL, OGC_POLL_MAX_INTERVAL and OGC_POLL_MULTIPLIER set the intervals,
+        OGC_POLL_TIMEOUT the overall timeout in seconds, where 0 polls forever.
+
+        Parameters:
+            - defaults: The settings used for the variables that are not set.
+
+        Returns:
+            - PollingStrategy: The strategy.
+        """
+        settings = dict(defaults)
+        variables = {
+            "initial_interval": "OGC_POLL_INITIAL_INTERVAL",
+            "max_interval": "OGC_POLL_MAX_INTERVAL",
+            "multiplier": "OGC_POLL_MULTIPLIER",
+            "timeout": "OGC_POLL_TIMEOUT",
+        }
+        for name, variable in variables.items():
+            value = os.environ.get(variable)
+            if value:
+                settings[name] = float(value)
+        if settings.get("timeout") == 0:
+            settings["timeout"] = None
+        return cls(**settings)
+
+    def start(self):
+        """
+        Starts the overall timeout. Called once before the first poll.
+        """
+        self.deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+
+    def get_interval(self, attempt: int, retry_after=None):
+        """
+        Returns the number of seconds to wait before the next status request.
+
+        Parameters:
+            - attempt (int): The number of status requests sent so far.
+            - retry_after: The value of the `Retry-After` header of the last response, if any.
+
+        Returns:
+            - float: The interval in seconds, never longer than the remaining time.
+        """
+        interval = self.parse_retry_after(retry_after)
+        if interval is None:
+            interval = min(self.initial_interval * self.multiplier**attempt, self.max_interval)
+        if self.deadline is not None:
+            interval = min(interval, max(self.deadline - time.monotonic(), 0.0))
+        return interval
+
+    def is_expired(self):
+        """
+        Returns True if the overall timeout has passed.
+        """
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    @staticmethod
+    def parse_retry_after(value):
+        """
+        Converts a `Retry-After` header value into seconds.
+
+        Parameters:
+            - value: Either a number of seconds or an HTTP date, as defined in RFC 9110.
+
+        Returns:
+            - float or None: The number of seconds to wait, or None if the value is missing or invalid.
+        """
+        if not isinstance(value, str):
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_date.tzinfo is None:
+            retry_date = retry_date.replace(tzinfo=timezone.utc)
+        return max((retry_date - datetime.now(timezone.utc)).total_seconds(), 0.0)
@@ -0,0 +1,195 @@
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+try:
+    # Attempt relative import for testing context
+    from .inline_dataset import InlineDataset
+except ImportError:
+    # Fallback to absolute import for direct execution
+    from inline_dataset import InlineDataset
+
+
+class ResultCache:
+    """
+    Content-addressed cache of the outputs of OGC API executions, shared by all Galaxy jobs on a host.
+
+    An entry is keyed by the hash of the execute endpoint, the process version, the canonical execute
+    request and the choices of the Galaxy job that decide what is written to the output files. It
+    contains the result document and a copy of every output file, so that a repeated execution is
+    answered without contacting the server. Entries are written to a temporary
+    directory and renamed into place, and a lock file serialises writers and eviction, so that
+    concurrent jobs never see partial entries. When the cache grows beyond `max_size` bytes, the
+    least recently used entries are removed.
+
+    Parameters:
+        - cache_dir (str): The directory of the cache.
+        - max_size (int): The maximum total size of the cached output files in bytes.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int = 10 * 1024**3):
+        self.cache_dir = cache_dir
+        self.entries_dir = os.path.join(cache_dir, "entries")
+        self.lock_path = os.path.join(cache_dir, ".lock")
+        self.max_size = max_size
+        os.makedirs(self.entries_dir, exist_ok=True)
+
+    @classmethod
+    def from_environment(cls):
+        """
+        Creates a cache from the OGC_RESULT_CACHE_DIR and OGC_RESULT_CACHE_SIZE environment variables.
+
+        Returns:
+            - ResultCache or None: The cache, or None if OGC_RESULT_CACHE_DIR is not set.
+        """
+        cache_dir = os.environ.get("OGC_RESULT_CACHE_DIR")
+        if not cache_dir:
+            return None
+        max_size = os.environ.get("OGC_RESULT_CACHE_SIZE")
+        return cls(cache_dir=cache_dir, max_size=int(max_size)) if max_size else cls(cache_dir=cache_dir)
+
+    @staticmethod
+    def compute_key(
+        execute: str, process_version, payload, response_input=None, transmission_mode=None, output_formats=None
+    ):
+        """
+        Returns the cache key of an execution.
+
+        The subscriber is left out, because its callback URIs differ between otherwise identical
+        executions. Inline datasets are represented by the hash of their content. The execute request
+        always asks for a document, so the response chosen in Galaxy is part of the key: a "raw" job
+        writes the downloaded outputs, a "document" job writes the result document.
+
+        Parameters:
+            - execute (str): The execute endpoint, which contains the process ID.
+            - process_version (str or None): The version of the process.
+            - payload (dict): The execute request.
+            - response_input (str or None): The response chosen in Galaxy, "raw" or "document".
+            - transmission_mode (dict or None): The transmission mode chosen for each output.
+            - output_formats (dict or None): The media type chosen for each output.
+
+        Returns:
+            - str: The SHA-256 hash of the canonical JSON representation of the execution.
+        """
+        request = {key: value for key, value in payload.items() if key != "subscriber"}
+        canonical = json.dumps(
+            {
+                "execute": execute,
+                "version": process_version,
+                "request": request,
+                "response": response_input,
+                "transmissionMode": transmission_mode,
+                "formats": output_formats,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=ResultCache.describe_dataset,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def describe_dataset(item):
+        if not isinstance(item, InlineDataset):
+            raise TypeError(f"Object of type {type(item).__name__} is not JSON serializable")
+        return {"mediaType": item.media_type, "sha256": item.get_digest()}
+
+    @contextmanager
+    def lock(self, exclusive: bool):
+        """
+        Holds the lock of the cache directory, shared for readers and exclusive for writers.
+        """
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get_entry_dir(self, key: str):
+        return os.path.join(self.entries_dir, key)
+
+    def restore(self, key: str, output_files):
+        """
+        Copies the cached outputs of an execution to the output files of the Galaxy job.
+
+        Parameters:
+            - key (str): The cache key of the execution.
+            - output_files (dict): The path of the Galaxy dataset of each output.
+
+        Returns:
+            - dict or None: The cached result document, or None if the cache has no complete entry for the outputs.
+        """
+        entry_dir = self.get_entry_dir(key)
+        with self.lock(exclusive=False):
+            try:
+                with open(os.path.join(entry_dir, "result.json")) as file:
+                    result = json.load(file)
+            except (OSError, ValueError):
+                return None
+            cached_files = {name: os.path.join(entry_dir, "outputs", name) for name in output_files}
+            if not all(os.path.isfile(path) for path in cached_files.values()):
+                return None
+            for name, output_file_path in output_files.items():
+                shutil.copyfile(cached_files[name], output_file_path)
+            # The modification time of an entry records its last use for the eviction
+            os.utime(entry_dir)
+        return result
+
+    def store(self, key: str, result, output_files):
+        """
+        Stores the result document and the output files of an execution, then evicts old entries.
+
+        Parameters:
+            - key (str): The cache key of the execution.
+            - result (dict): The result document of the execution.
+            - output_files (dict): The path of the Galaxy dataset of each output.
+        """
+        temp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=".entry-")
+        try:
+            os.makedirs(os.path.join(temp_dir, "outputs"))
+            for name, output_file_path in output_files.items():
+                shutil.copyfile(output_file_path, os.path.join(temp_dir, "outputs", name))
+            with open(os.path.join(temp_dir, "result.json"), "w") as file:
+                json.dump(result, file)
+            with self.lock(exclusive=True):
+                entry_dir = self.get_entry_dir(key)
+                if os.path.exists(entry_dir):
+                    # Another job stored the same execution in the meantime
+                    shutil.rmtree(entry_dir)
+                os.rename(temp_dir, entry_dir)
+                self.evict()
+        except BaseException:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache is no larger than `max_size`.
+        Must be called while holding the exclusive lock.
+        """
+        entries = []
+        for key in os.listdir(self.entries_dir):
+            entry_dir = self.get_entry_dir(key)
+            entries.append((os.stat(entry_dir).st_mtime, self.get_size(entry_dir), entry_dir))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_dir in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
+
+    @staticmethod
+    def get_size(directory: str):
+        """
+        Returns the total size of the files below a directory in bytes.
+        """
+        return sum(
+            os.path.getsize(os.path.join(root, file_name))
+            for root, _, file_names in os.walk(directory)
+            for file_name in file_names
+        )
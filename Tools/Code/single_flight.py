@@ -0,0 +1,137 @@
+import fcntl
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+
+class Flight:
+    """
+    One execution guarded by SingleFlight.
+
+    Parameters:
+        - result_path (str): The file the result of the execution is recorded in.
+        - job_id (str or None): The job ID of an identical execution that finished while waiting.
+        - result (dict or None): The result document of that execution, None if this job has to execute.
+    """
+
+    def __init__(self, result_path: str, job_id=None, result=None):
+        self.result_path = result_path
+        self.job_id = job_id
+        self.result = result
+
+    def record(self, job_id, result):
+        """
+        Records the job ID and the result document for the jobs waiting for this execution.
+        """
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.result_path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump({"jobID": job_id, "result": result}, file)
+            os.replace(temp_path, self.result_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+class SingleFlight:
+    """
+    Lets only one of several identical executions on a host run at a time.
+
+    The first job takes an exclusive lock on a file named after the cache key of the execution and
+    executes it. Identical jobs started meanwhile wait for the lock and then reuse the job ID and the
+    result document the first job recorded, instead of sending the same heavy job to the server again.
+    If the first job failed or was killed, the lock is released without a result and the next job
+    executes itself.
+
+    Parameters:
+        - lock_dir (str): The directory of the lock and result files.
+        - max_age (float): Seconds after which recorded results are deleted.
+    """
+
+    def __init__(self, lock_dir: str, max_age: float = 24 * 60 * 60):
+        self.lock_dir = lock_dir
+        self.max_age = max_age
+
+    @classmethod
+    def from_environment(cls):
+        """
+        Creates the single flight from the OGC_SINGLE_FLIGHT_DIR environment variable.
+
+        There is no default directory: the recorded result documents are trusted, so the directory must
+        only be writable by the Galaxy job user, and a shared temporary directory is not.
+
+        Returns:
+            - SingleFlight or None: The single flight, or None if OGC_SINGLE_FLIGHT_DIR is not set.
+        """
+        lock_dir = os.environ.get("OGC_SINGLE_FLIGHT_DIR")
+        if not lock_dir:
+            return None
+        return cls(lock_dir=lock_dir)
+
+    @contextmanager
+    def run(self, key: str):
+        """
+        Holds the lock of an execution for the duration of the `with` block.
+
+        Parameters:
+            - key (str): The cache key of the execution.
+
+        Yields:
+            - Flight: With the result of an identical execution that finished while waiting, or without
+              a result if the caller has to execute.
+        """
+        os.makedirs(self.lock_dir, exist_ok=True)
+        result_path = os.path.join(self.lock_dir, f"{key}.result.json")
+        wait_start = time.time()
+        with open(os.path.join(self.lock_dir, f"{key}.lock"), "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                waited = False
+            except BlockingIOError:
+                print("An identical execution is running in another job, waiting for its results")
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                waited = True
+            try:
+                flight = self.load_flight(result_path, wait_start) if waited else Flight(result_path)
+                if flight.result is None:
+                    self.prune()
+                yield flight
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load_flight(self, result_path: str, wait_start: float):
+        """
+        Loads the result recorded by the job that held the lock.
+
+        Only results recorded after `wait_start` are used, older ones belong to earlier executions.
+        No result is recorded if that job failed.
+        """
+        if not os.path.exists(result_path):
+            return Flight(result_path)
+        try:
+            # One second of tolerance for file systems with coarse modification times
+            if os.stat(result_path).st_mtime >= wait_start - 1:
+                with open(result_path) as file:
+                    recorded = json.load(file)
+                return Flight(result_path, job_id=recorded["jobID"], result=recorded["result"])
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Failed to read the results of the identical execution: {e}", file=sys.stderr)
+        return Flight(result_path)
+
+    def prune(self):
+        """
+        Deletes recorded results older than `max_age`. Lock files are kept, since other jobs may hold them.
+        """
+        now = time.time()
+        for file_name in os.listdir(self.lock_dir):
+            if not file_name.endswith(".result.json"):
+                continue
+            path = os.path.join(self.lock_dir, file_name)
+            try:
+                if now - os.stat(path).st_mtime > self.max_age:
+                    os.unlink(path)
+            except OSError:
+                pass
@@ -0,0 +1,281 @@
+"""
+Measure the throughput and peak memory of the generator on synthetic process corpora of growing size.
+
+Every benchmark is run on every corpus size. The timings (minimum and median of the repeats)
+and the peak memory traced by tracemalloc are written to a JSON file, so that the results of
+two commits can be compared.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_generator [--output FILE] [--compare BASELINE] [--sizes small medium]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from GeneratorXML.galaxyxml_creator import GalaxyXmlTool
+from main import GalaxyToolConverter
+
+from .corpus import create_corpus
+
+RESULTS_DIR = "benchmarks/results"
+
+# Number of processes, inputs and outputs per process, media types or enum values per parameter,
+# nesting depth of the extended schemas and number of examples per process
+SIZES = {
+    "small": {"process_count": 5, "input_count": 6, "output_count": 2, "cardinality": 3, "depth": 2, "example_count": 1},
+    "medium": {
+        "process_count": 20,
+        "input_count": 24,
+        "output_count": 4,
+        "cardinality": 10,
+        "depth": 4,
+        "example_count": 3,
+    },
+    "large": {
+        "process_count": 20,
+        "input_count": 64,
+        "output_count": 8,
+        "cardinality": 20,
+        "depth": 6,
+        "example_count": 5,
+    },
+}
+
+
+def create_tool(process: Dict) -> GalaxyXmlTool:
+    return GalaxyXmlTool(
+        name=process["id"], id=process["id"].lower(), version=process["version"], description=process["title"]
+    )
+
+
+def create_params(tool: GalaxyXmlTool, process: Dict):
+    return tool.create_params(
+        input_schema=process["inputs"],
+        output_schema=process["outputs"],
+        transmission_schema=process["outputTransmission"],
+    )
+
+
+def bench_create_params(processes: List[Dict], api_data: Dict):
+    def run(tools):
+        for tool, process in zip(tools, processes):
+            create_params(tool, process)
+
+    return lambda: [create_tool(process) for process in processes], run
+
+
+def bench_extract_enum(processes: List[Dict], api_data: Dict):
+    schemas = [
+        info["extended-schema"]
+        for process in processes
+        for info in list(process["inputs"].values()) + list(process["outputs"].values())
+        if "extended-schema" in info
+    ]
+
+    def run(tool):
+        for schema in schemas:
+            tool.extract_enum(schema, [])
+
+    # A new tool per repeat, so that the cache of enum values starts empty
+    return lambda: create_tool(processes[0]), run
+
+
+def bench_define_output_options(processes: List[Dict], api_data: Dict):
+    def setup():
+        tools = [create_tool(process) for process in processes]
+        for tool, process in zip(tools, processes):
+            create_params(tool, process)
+        return tools
+
+    def run(tools):
+        for tool in tools:
+            tool.define_output_options()
+
+    return setup, run
+
+
+def bench_define_tests(processes: List[Dict], api_data: Dict):
+    def setup():
+        tools = [create_tool(process) for process in processes]
+        for tool, process in zip(tools, processes):
+            create_params(tool, process)
+        return tools
+
+    def run(tools):
+        for tool, process in zip(tools, processes):
+            tool.define_tests(api_dict=api_data["paths"], process=process["id"])
+
+    return setup, run
+
+
+def bench_json_to_galaxyxml(processes: List[Dict], api_data: Dict):
+    def run(converter):
+        for process in processes:
+            converter.json_to_galaxyxml(process_data=process, api_data=api_data)
+
+    # A new converter per repeat, so that the cache of compiled parameters starts empty
+    return lambda: GalaxyToolConverter(), run
+
+
+BENCHMARKS = {
+    "create_params": bench_create_params,
+    "extract_enum": bench_extract_enum,
+    "define_output_options": bench_define_output_options,
+    "define_tests": bench_define_tests,
+    "json_to_galaxyxml": bench_json_to_galaxyxml,
+}
+
+
+def measure(setup: Callable, run: Callable, repeats: int) -> Dict:
+    """
+    Time `run` on a fresh `setup()` state per repeat, then trace its peak memory in one more run.
+
+    The memory run is separate because tracemalloc slows down every allocation.
+    """
+    timings = []
+    for _ in range(repeats):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        timings.append(time.perf_counter() - start)
+
+    state = setup()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        run(state)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "repeats": repeats,
+        "min_seconds": min(timings),
+        "median_seconds": statistics.median(timings),
+        "peak_memory_bytes": peak - baseline,
+    }
+
+
+def get_commit():
+    """
+    Return the current git commit, or None outside of a git checkout.
+    """
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run_benchmarks(sizes: List[str], benchmarks: List[str], repeats: int) -> Dict:
+    """
+    Run the benchmarks on the corpora of the given sizes.
+
+    json_to_galaxyxml writes the tools below the working directory, so all benchmarks run in a
+    temporary directory.
+
+    Returns:
+        dict: The results together with the commit and the Python version they were measured with.
+    """
+    results = []
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.makedirs(os.path.join(directory, "Tools", "Macros"))
+        os.makedirs(os.path.join(directory, "Tools", "test-data"))
+        os.chdir(directory)
+        try:
+            for size in sizes:
+                processes, api_data = create_corpus(**SIZES[size])
+                for name in benchmarks:
+                    setup, run = BENCHMARKS[name](processes, api_data)
+                    result = {"benchmark": name, "size": size, "parameters": SIZES[size]}
+                    result.update(measure(setup=setup, run=run, repeats=repeats))
+                    results.append(result)
+                    print(
+                        f"{name:<22} {size:<7} min {result['min_seconds']:8.4f}s "
+                        f"median {result['median_seconds']:8.4f}s peak {result['peak_memory_bytes'] / 2**20:8.2f} MiB"
+                    )
+        finally:
+            os.chdir(cwd)
+
+    return {
+        "commit": get_commit(),
+        "python": platform.python_version(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "results": results,
+    }
+
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """
+    Compare the minimum timings with those of a baseline. The minimum is less affected by other
+    processes on the machine than the median.
+
+    Args:
+        results (dict): The results of this run.
+        baseline (dict): The results of an earlier run.
+        threshold (float): The ratio of the minimums above which a benchmark counts as a regression.
+
+    Returns:
+        list: The "benchmark/size" keys of the regressions.
+    """
+    baseline_timings = {(result["benchmark"], result["size"]): result["min_seconds"] for result in baseline["results"]}
+    regressions = []
+    print(f"\nCompared with {baseline.get('commit')}:")
+    for result in results["results"]:
+        key = (result["benchmark"], result["size"])
+        if key not in baseline_timings:
+            continue
+        ratio = result["min_seconds"] / baseline_timings[key]
+        marker = ""
+        if ratio > threshold:
+            marker = "  REGRESSION"
+            regressions.append("/".join(key))
+        print(f"{key[0]:<22} {key[1]:<7} {ratio:6.2f}x{marker}")
+    return regressions
+
+
+def parse_arguments(args: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the generator on synthetic process corpora.")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES), help="The corpus sizes to run")
+    parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--repeats", type=int, default=5, help="The number of timed runs per benchmark")
+    parser.add_argument("--output", help=f"The JSON file for the results, by default {RESULTS_DIR}/<commit>.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="A JSON file of earlier results to compare with")
+    parser.add_argument(
+        "--threshold", type=float, default=1.25, help="The ratio of the minimum timings that counts as a regression"
+    )
+    return parser.parse_args(args)
+
+
+def main(args: List[str]) -> int:
+    arguments = parse_arguments(args)
+    results = run_benchmarks(sizes=arguments.sizes, benchmarks=arguments.benchmarks, repeats=arguments.repeats)
+
+    output = arguments.output or os.path.join(RESULTS_DIR, f"{(results['commit'] or 'unknown')[:12]}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"\nResults written to {output}")
+
+    if arguments.compare is not None:
+        with open(arguments.compare) as file:
+            baseline = json.load(file)
+        if compare(results=results, baseline=baseline, threshold=arguments.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
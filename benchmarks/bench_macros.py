@@ -0,0 +1,59 @@
+"""
+Compare writing the test macros of a tool one by one with MacrosXMLGenerator.create_macro_file
+against collecting them in memory and writing them once with MacrosXMLGenerator.commit.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_macros
+"""
+
+import os
+import tempfile
+import time
+
+from GeneratorXML.macros_xml_generator import MacrosXMLGenerator
+
+EXAMPLE_COUNT = 50
+OUTPUT_COUNT = 10
+
+
+def run_per_macro(filename: str):
+    generator = MacrosXMLGenerator()
+    generator.add_token("@TOOL_VERSION@", "1.0.0")
+    generator.add_token("@VERSION_SUFFIX@", "0")
+    generator.generate_xml(filename)
+    for index in range(EXAMPLE_COUNT):
+        for output in range(OUTPUT_COUNT):
+            generator.create_macro_file(filename, f"output_data_out{output}", "txt", f"file_inputs_out{output}{index}")
+
+
+def run_single_pass(filename: str):
+    generator = MacrosXMLGenerator()
+    generator.add_token("@TOOL_VERSION@", "1.0.0")
+    generator.add_token("@VERSION_SUFFIX@", "0")
+    for index in range(EXAMPLE_COUNT):
+        for output in range(OUTPUT_COUNT):
+            generator.add_macro(f"output_data_out{output}", "txt", f"file_inputs_out{output}{index}")
+    generator.commit(filename)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "macros.xml")
+
+        start = time.perf_counter()
+        run_per_macro(filename)
+        per_macro_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        run_single_pass(filename)
+        single_pass_seconds = time.perf_counter() - start
+
+    print(f"{EXAMPLE_COUNT} examples x {OUTPUT_COUNT} outputs")
+    print(f"parse and write per macro: {per_macro_seconds:.3f}s")
+    print(f"single pass:               {single_pass_seconds:.3f}s")
+    print(f"speedup:                   {per_macro_seconds / single_pass_seconds:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Compare generating a synthetic family of OTB tools with json_to_galaxyxml with and without the
+ParamCache of rendered parameters.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_param_cache
+"""
+
+import os
+import tempfile
+import time
+
+from GeneratorXML.param_cache import ParamCache
+from main import GalaxyToolConverter
+
+PROCESS_COUNT = 100
+RASTER_TYPES = ["image/tiff", "image/jpeg", "image/png"]
+
+
+def create_raster_schema(is_array: bool):
+    """
+    Create the extended schema of a raster input, as the ZOO-Project describes the OTB images.
+    """
+    item = {
+        "oneOf": [
+            {
+                "allOf": [
+                    {"$ref": "http://zoo-project.org/dl/link.json"},
+                    {"properties": {"type": {"enum": RASTER_TYPES}}, "type": "object"},
+                ]
+            },
+            {
+                "properties": {
+                    "value": {
+                        "oneOf": [
+                            {"contentEncoding": "base64", "contentMediaType": media_type, "type": "string"}
+                            for media_type in RASTER_TYPES
+                        ]
+                    }
+                },
+                "required": ["value"],
+                "type": "object",
+            },
+        ]
+    }
+    if is_array:
+        return {"items": item, "maxItems": 1024, "minItems": 1, "type": "array"}
+    return item
+
+
+def create_process(index: int):
+    """
+    Create a process description with the inputs every OTB application shares and a few of its own.
+    """
+    raster = {"contentEncoding": "base64", "contentMediaType": "image/tiff", "type": "string"}
+    inputs = {
+        "in": {
+            "title": "Input image",
+            "description": "Input image",
+            "schema": raster,
+            "extended-schema": create_raster_schema(is_array=index % 4 == 0),
+        },
+        "ram": {
+            "title": "Available RAM (MB)",
+            "description": "Available memory for processing (in MB)",
+            "schema": {"type": "integer", "default": 256, "nullable": True},
+        },
+        "interpolator": {
+            "title": "Interpolation",
+            "description": "The interpolation method",
+            "schema": {"type": "string", "enum": ["nearest", "linear", "bco"], "default": "bco"},
+        },
+        "out.type": {
+            "title": "Pixel type",
+            "description": "The pixel type of the output image",
+            "schema": {
+                "type": "string",
+                "enum": ["uint8", "int16", "uint16", "int32", "uint32", "float", "double"],
+                "default": "float",
+            },
+        },
+    }
+    for parameter in range(3):
+        inputs[f"param{index}_{parameter}"] = {
+            "title": f"Parameter {parameter} of application {index}",
+            "description": f"Parameter {parameter} of application {index}",
+            "schema": {"type": "number", "default": parameter},
+        }
+    return {
+        "id": f"OTB.Application{index}",
+        "version": "1.0.0",
+        "title": f"Application {index}",
+        "description": f"Application {index}",
+        "inputs": inputs,
+        "outputs": {
+            "out": {
+                "title": "Output image",
+                "description": "Output image",
+                "schema": raster,
+                "extended-schema": create_raster_schema(is_array=False),
+            }
+        },
+        "outputTransmission": ["value", "reference"],
+    }
+
+
+def generate_tools(processes, param_cache: ParamCache | None):
+    """
+    Generate every tool with json_to_galaxyxml, as the generator does, and return the tool XML documents.
+
+    The tools are written below the working directory, which must contain Tools/Macros.
+    """
+    converter = GalaxyToolConverter()
+    converter.param_cache = param_cache
+    documents = []
+    for process in processes:
+        converter.json_to_galaxyxml(process_data=process, api_data={"paths": {}})
+        with open(f"Tools/{process['id']}.xml", "rb") as file:
+            documents.append(file.read())
+    return documents
+
+
+def main():
+    processes = [create_process(index) for index in range(PROCESS_COUNT)]
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.makedirs(os.path.join(directory, "Tools", "Macros"))
+        os.chdir(directory)
+        try:
+            start = time.perf_counter()
+            uncached_documents = generate_tools(processes, param_cache=None)
+            uncached_seconds = time.perf_counter() - start
+
+            param_cache = ParamCache()
+            start = time.perf_counter()
+            cached_documents = generate_tools(processes, param_cache=param_cache)
+            cached_seconds = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+
+    assert cached_documents == uncached_documents, "The cached parameters changed the tool XML"
+
+    print(f"{PROCESS_COUNT} processes")
+    print(f"without cache: {uncached_seconds:.3f}s")
+    print(f"with cache:    {cached_seconds:.3f}s ({len(param_cache)} entries, hit rate {param_cache.hit_rate:.0%})")
+    print(f"speedup:       {uncached_seconds / cached_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compare the linear path scan of GalaxyXmlTool.get_test_dictionary with the ApiPathIndex
+on a synthetic API document.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_path_index
+"""
+
+import time
+
+from GeneratorXML.api_path_index import ApiPathIndex
+from GeneratorXML.galaxyxml_creator import GalaxyXmlTool
+
+PATH_COUNT = 5000
+
+
+def create_api_paths(path_count: int):
+    """
+    Create an OpenAPI "paths" object with one execution path with an example per process.
+    """
+    paths = {}
+    for index in range(path_count):
+        example = {"value": {"inputs": {"ram": 256}, "outputs": {}, "response": "document"}}
+        paths[f"/processes/Process{index}/execution"] = {
+            "post": {"requestBody": {"content": {"application/json": {"examples": {"example": example}}}}}
+        }
+    return paths
+
+
+def run_scan(tool: GalaxyXmlTool, paths, processes):
+    for process in processes:
+        tool.get_test_examples(data=tool.get_test_dictionary(api_dict=paths, process=process))
+
+
+def run_index(paths, processes):
+    path_index = ApiPathIndex(paths=paths)
+    for process in processes:
+        path_index.get_examples(process=process)
+
+
+def main():
+    paths = create_api_paths(PATH_COUNT)
+    processes = [f"Process{index}" for index in range(PATH_COUNT)]
+    tool = GalaxyXmlTool(name="bench", id="bench", version="1.0.0", description="bench")
+
+    start = time.perf_counter()
+    run_scan(tool, paths, processes)
+    scan_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    run_index(paths, processes)
+    index_seconds = time.perf_counter() - start
+
+    print(f"{PATH_COUNT} paths, {len(processes)} lookups")
+    print(f"linear scan: {scan_seconds:.3f}s")
+    print(f"path index:  {index_seconds:.3f}s (including building the index)")
+    print(f"speedup:     {scan_seconds / index_seconds:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compare the memory needed to write a tool with large select parameters, like the EPSG code lists,
+with `tool.export()` and with the ToolXMLStreamWriter.
+
+Every mode runs in its own interpreter, so that the growth of the maximum resident set size
+includes the memory of libxml2, which tracemalloc does not see.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_xml_writer
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import galaxyxml.tool.parameters as gtpx
+
+from GeneratorXML.xml_stream_writer import StreamingTool, ToolXMLStreamWriter
+
+PARAM_COUNT = 4
+OPTION_COUNT = 20000
+MODES = ["export", "stream"]
+
+
+def create_tool() -> StreamingTool:
+    """
+    Create a tool with several select parameters of OPTION_COUNT options each.
+    """
+    tool = StreamingTool(
+        name="epsg", id="epsg", version="1.0", description="EPSG", executable="", macros=["Macros/epsg_macros_.xml"]
+    )
+    tool.inputs = gtpx.Inputs()
+    options = {f"EPSG:{code}": f"EPSG:{code} - projected coordinate reference system" for code in range(OPTION_COUNT)}
+    for index in range(PARAM_COUNT):
+        tool.inputs.append(gtpx.SelectParam(f"crs_{index}", label="CRS", options=options))
+    tool.outputs = gtpx.Outputs()
+    tool.help = "EPSG"
+    return tool
+
+
+def run_mode(mode: str, file_path: str):
+    """
+    Write the tool with one mode and print the time, the traced peak and the growth of the maximum RSS.
+    """
+    tool = create_tool()
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    start = time.perf_counter()
+    if mode == "export":
+        with open(file_path, "w") as file:
+            file.write(tool.export())
+    else:
+        ToolXMLStreamWriter().write_file(tool, file_path)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # ru_maxrss is in KiB on Linux
+    rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss
+    print(f"{mode:<7} {seconds:8.3f}s traced peak {peak / 2**20:8.2f} MiB max RSS growth {rss_growth / 1024:8.2f} MiB")
+
+
+def main():
+    print(f"{PARAM_COUNT} select parameters with {OPTION_COUNT} options each")
+    with tempfile.TemporaryDirectory() as directory:
+        outputs = []
+        for mode in MODES:
+            file_path = os.path.join(directory, f"{mode}.xml")
+            subprocess.run([sys.executable, "-m", "benchmarks.bench_xml_writer", mode, file_path], check=True)
+            with open(file_path, "rb") as file:
+                outputs.append(file.read())
+        print(f"Identical output: {outputs[0] == outputs[1]}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        run_mode(mode=sys.argv[1], file_path=sys.argv[2])
+    else:
+        main()
@@ -0,0 +1,146 @@
+"""
+Synthetic ZOO-Project process descriptions and API documents for the benchmarks.
+
+The size of a corpus is set by the number of inputs and outputs per process, the number of
+media types or enum values per parameter, the nesting depth of the `oneOf`/`allOf` schemas
+and the number of execution examples per process.
+"""
+
+from typing import Dict, List
+
+
+def create_media_types(cardinality: int) -> List[str]:
+    """
+    Create `cardinality` distinct media types.
+    """
+    return [f"application/x-format{index}" for index in range(cardinality)]
+
+
+def create_nested_schema(depth: int, cardinality: int) -> Dict:
+    """
+    Create an extended schema whose media types are nested `depth` levels deep.
+
+    Even levels wrap the level below in an `allOf` with a link, odd levels in a `oneOf` with a
+    value alternative, as the ZOO-Project describes complex inputs.
+    """
+    schema = {"properties": {"type": {"enum": create_media_types(cardinality)}}, "type": "object"}
+    for level in range(depth):
+        if level % 2 == 0:
+            schema = {"allOf": [{"$ref": "http://zoo-project.org/dl/link.json"}, schema]}
+        else:
+            value = {"properties": {"value": {"oneOf": [schema]}}, "required": ["value"], "type": "object"}
+            schema = {"oneOf": [schema, value]}
+    return schema
+
+
+def create_inputs(input_count: int, cardinality: int, depth: int) -> Dict:
+    """
+    Create `input_count` inputs cycling through the input types the generator supports.
+    """
+    inputs = {}
+    for index in range(input_count):
+        kind = index % 6
+        info = {"title": f"Input {index}", "description": f"Description of input {index}"}
+        if kind == 0:
+            info["schema"] = {"oneOf": [{"type": "string", "contentMediaType": "application/x-format0"}]}
+            extended_schema = create_nested_schema(depth=depth, cardinality=cardinality)
+            info["extended-schema"] = {"type": "array", "items": extended_schema} if index % 12 == 0 else extended_schema
+        elif kind == 1:
+            values = [f"value {value}" for value in range(cardinality)]
+            info["schema"] = {"type": "string", "enum": values, "default": values[0]}
+        elif kind == 2:
+            info["schema"] = {"type": "integer", "default": index, "nullable": True}
+        elif kind == 3:
+            info["schema"] = {"type": "number", "default": index / 2}
+        elif kind == 4:
+            info["schema"] = {"type": "boolean", "default": True}
+        else:
+            info["schema"] = {"type": "string", "default": f"text {index}"}
+        inputs[f"in.{index}"] = info
+    return inputs
+
+
+def create_outputs(output_count: int, cardinality: int, depth: int) -> Dict:
+    """
+    Create `output_count` outputs, alternating between media type outputs and enum outputs.
+    """
+    outputs = {}
+    for index in range(output_count):
+        info = {"title": f"Output {index}", "description": f"Description of output {index}"}
+        if index % 2 == 0:
+            info["schema"] = {"oneOf": [{"type": "string", "contentMediaType": "application/x-format0"}]}
+            info["extended-schema"] = create_nested_schema(depth=depth, cardinality=cardinality)
+        else:
+            values = create_media_types(cardinality)
+            info["schema"] = {"type": "string", "enum": values, "default": values[0]}
+        outputs[f"out{index}"] = info
+    return outputs
+
+
+def create_process(
+    index: int,
+    input_count: int,
+    output_count: int,
+    cardinality: int,
+    depth: int,
+) -> Dict:
+    """
+    Create the description of the process `Process{index}`.
+    """
+    return {
+        "id": f"Process{index}",
+        "version": "1.0.0",
+        "title": f"Synthetic process {index}",
+        "description": f"Synthetic process {index} for the benchmarks",
+        "inputs": create_inputs(input_count=input_count, cardinality=cardinality, depth=depth),
+        "outputs": create_outputs(output_count=output_count, cardinality=cardinality, depth=depth),
+        "outputTransmission": ["value", "reference"],
+    }
+
+
+def create_example(process: Dict, index: int) -> Dict:
+    """
+    Create an execution example with a value for every scalar input and every output of a process.
+    """
+    inputs = {}
+    for name, info in process["inputs"].items():
+        default = info["schema"].get("default")
+        if default is not None:
+            inputs[name] = default
+    outputs = {name: {"format": {"mediaType": "application/x-format0"}} for name in process["outputs"]}
+    return {"inputs": inputs, "outputs": outputs, "response": "raw" if index % 2 else "document"}
+
+
+def create_api_paths(processes: List[Dict], example_count: int) -> Dict:
+    """
+    Create the OpenAPI "paths" object of the processes, with `example_count` examples per execution path.
+    """
+    paths = {}
+    for process in processes:
+        examples = {
+            f"example{index}": {"value": create_example(process=process, index=index)} for index in range(example_count)
+        }
+        content = {"application/json": {"examples": examples}} if examples else {"application/json": {}}
+        paths[f"/processes/{process['id']}/execution"] = {"post": {"requestBody": {"content": content}}}
+    return paths
+
+
+def create_corpus(
+    process_count: int,
+    input_count: int,
+    output_count: int,
+    cardinality: int,
+    depth: int,
+    example_count: int,
+):
+    """
+    Create a corpus of process descriptions and the API document that describes their examples.
+
+    Returns:
+        tuple: The process descriptions and the API document.
+    """
+    processes = [
+        create_process(index=index, input_count=input_count, output_count=output_count, cardinality=cardinality, depth=depth)
+        for index in range(process_count)
+    ]
+    return processes, {"paths": create_api_paths(processes=processes, example_count=example_count)}
@@ -1,12 +1,72 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pprint import pprint
+import argparse
+import glob
+import multiprocessing
+import os
 import sys
 import re
+import time
+from typing import Dict, Iterator, List, Tuple
 import requests
+from requests.adapters import HTTPAdapter
 
+from GeneratorXML.api_cache import ApiDocumentCache
+from GeneratorXML.api_path_index import ApiPathIndex
 from GeneratorXML.galaxyxml_creator import GalaxyXmlTool
+from GeneratorXML.param_cache import ParamCache
+from GeneratorXML.process_crawler import ProcessCrawler
+from GeneratorXML.process_ir import CommandLineEmitter, GalaxyXmlEmitter, ProcessIRBuilder, TestEmitter
+from GeneratorXML.process_snapshot import ProcessSnapshot
+from GeneratorXML.regeneration_manifest import RegenerationManifest
+from GeneratorXML.schema_resolver import SchemaResolver
+from GeneratorXML.xml_stream_writer import ToolXMLStreamWriter
+
+API_CACHE_DIR = ".cache"
+FETCH_WORKERS = 8
+MANIFEST_PATH = "Tools/.generator_manifest.json"
+
+# State of a generation worker process, set once per worker by init_generation_worker
+generation_worker_state = {}
 
 
 class GalaxyToolConverter:
+    def __init__(
+        self,
+        cache_dir: str = API_CACHE_DIR,
+        pool_size: int = FETCH_WORKERS,
+        snapshot_dir: str | None = None,
+        param_cache: bool = False,
+    ) -> None:
+        self.api_cache = ApiDocumentCache(cache_dir=cache_dir)
+        self.session = self.create_session(pool_size=pool_size)
+        self.snapshot = ProcessSnapshot(snapshot_dir=snapshot_dir) if snapshot_dir is not None else None
+        # Processes share many identical inputs, whose parameters can be compiled once per converter. The
+        # cache is off by default, as rendering a parameter is about as fast as cloning the cached one.
+        self.param_cache = ParamCache() if param_cache else None
+        # Referenced schemas are shared by all tools, and snapshots are converted without network access
+        self.schema_resolver = SchemaResolver(
+            cache_dir=os.path.join(cache_dir, "schemas"), session=self.session, offline=snapshot_dir is not None
+        )
+
+    def create_session(self, pool_size: int) -> requests.Session:
+        """
+        Create the HTTP session shared by all requests of a converter.
+
+        The session keeps connections alive, so that the TLS handshake with the server is
+        done once per pooled connection instead of once per request.
+
+        Args:
+            pool_size (int): The number of connections kept open per host.
+
+        Returns:
+            requests.Session: The session with a connection pool of the given size.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
 
     def retrieve_json(self, url):
         """
@@ -25,7 +85,7 @@ class GalaxyToolConverter:
 
         try:
             # Make a GET request to retrieve information about available collections
-            response = requests.get(url, timeout=60)
+            response = self.session.get(url, timeout=60)
             response.raise_for_status()  # Raise an exception for 4xx or 5xx status codes
 
             # Extract the JSON data from the response
@@ -36,13 +96,49 @@ class GalaxyToolConverter:
             print("Failed to retrieve collections:", e)
             return None
 
-    def json_to_galaxyxml(self, process_data, api_data):
+    def retrieve_process_json(self, base_url, process_name):
+        """
+        Retrieve the description of a process, from the snapshot if one is used.
+
+        Args:
+            base_url (str): The base URL.
+            process_name (str): The process ID.
+
+        Returns:
+            dict or None: The process description, or None if it could not be retrieved.
+        """
+        if self.snapshot is not None:
+            return self.snapshot.load_process(process_id=process_name)
+        return self.retrieve_json(url=f"{base_url}processes/{process_name}")
+
+    def retrieve_api_json(self, url):
+        """
+        Retrieve the OpenAPI document, which is identical for every process.
+
+        The document is cached on disk and revalidated with a conditional GET, so it is
+        only downloaded again when the server reports a new ETag or Last-Modified date.
+        If a snapshot is used, the document is read from the snapshot instead.
+
+        Args:
+            url (str): The URL of the API document.
+
+        Returns:
+            dict or None: The API document, or None if it is neither retrievable nor cached.
+        """
+        if self.snapshot is not None:
+            return self.snapshot.load_api()
+        return self.api_cache.retrieve(url=url, session=self.session)
+
+    def json_to_galaxyxml(self, process_data, api_data, path_index=None):
         """
         Generate a Galaxy XML file based on the received JSON data and store it as an XML file.
 
         Args:
             json_data (dict): The JSON data representing the tool information.
+            path_index (ApiPathIndex, optional): Index of the API paths, built once per batch.
 
+        Returns:
+            List[str]: The paths of all written files: the tool XML, its macros file and its test inputs.
         """
         name_id = self.rename_tool(tool_name=process_data["id"])
         name = process_data["id"]
@@ -52,30 +148,33 @@ class GalaxyToolConverter:
             id=name_id,
             version=process_data["version"],
             description=process_data["title"],
+            schema_resolver=self.schema_resolver,
         )
 
+        # Compile the process description once, then render the XML, the command line and the tests from it
+        # The builder shares the enum cache of the tool, like GalaxyXmlTool.create_params
+        builder = ProcessIRBuilder(schema_resolver=self.schema_resolver, enum_extractor=gxt.enum_extractor)
+        process_ir = builder.build(process_data)
+        xml_emitter = GalaxyXmlEmitter(gxt=gxt, param_cache=self.param_cache)
+
         # Generate XML content
         tool = gxt.get_tool()
         tool.requirements = gxt.define_requirements()
         tool.help = process_data["description"]
-        tool.inputs = gxt.create_params(
-            input_schema=process_data["inputs"],
-            output_schema=process_data["outputs"],
-            transmission_schema=process_data["outputTransmission"],
-        )
-
-        tool.outputs = gxt.define_output_options()
-
-        tool.executable = gxt.define_command(process_data["id"])
+        tool.inputs = xml_emitter.emit_inputs(process_ir)
+        tool.outputs = xml_emitter.emit_outputs(process_ir)
+        tool.executable = CommandLineEmitter(gxt=gxt).emit(process_ir)
         gxt.define_macro()
-        tool.tests = gxt.define_tests(api_dict=api_data["paths"], process=process_data["id"])
+        examples = gxt.find_test_examples(api_dict=api_data["paths"], process=process_ir.id, path_index=path_index)
+        tool.tests = TestEmitter(gxt=gxt).emit(process_ir, examples=examples)
+        gxt.commit_macros()
 
         # If necessary, change the citations text
         tool.citations = gxt.create_citations(citations_text=".")
 
-        file_path = f"Tools/{name}.xml"
-        with open(file_path, "w") as file:
-            file.write(tool.export())
+        # Stream the XML to the file instead of building the whole document as one string
+        ToolXMLStreamWriter().write_file(tool, f"Tools/{name}.xml")
+        return [f"Tools/{name}.xml"] + gxt.written_files
 
     def rename_tool(self, tool_name):
         """
@@ -94,33 +193,441 @@ class GalaxyToolConverter:
         return cleaned_name
 
 
-def main(base_url: str, process_name: str):
+def main(base_url: str, process_name: str, cache_dir: str = API_CACHE_DIR, snapshot_dir: str | None = None):
     """
     Main function to process collections data from a base URL and convert it to GalaxyXML.
 
     Args:
         base_url (str): The base URL.
         process (str): The process to be appended to the base URL.
+        cache_dir (str): Directory of the API document cache.
+        snapshot_dir (str, optional): Snapshot directory used instead of the server.
     """
     url = f"{base_url}processes/{process_name}"
     pprint(url)
     url_api = f"{base_url}api"
     # Get collections information
-    workflow = GalaxyToolConverter()
+    workflow = GalaxyToolConverter(cache_dir=cache_dir, snapshot_dir=snapshot_dir)
 
     # Get collections information
-    collections_data = workflow.retrieve_json(url=url)
-    api_data = workflow.retrieve_json(url=url_api)
+    collections_data = workflow.retrieve_process_json(base_url=base_url, process_name=process_name)
+    api_data = workflow.retrieve_api_json(url=url_api)
 
     # Convert JSON to GalaxyXML
     workflow.json_to_galaxyxml(process_data=collections_data, api_data=api_data)
 
 
+def read_process_ids(file_path: str) -> List[str]:
+    """
+    Read the process IDs from a process file, one ID per line.
+
+    Args:
+        file_path (str): Path to the file containing the process IDs.
+
+    Returns:
+        List[str]: The process IDs in file order, without blank lines.
+    """
+    with open(file_path, "r") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def main_batch(
+    base_url: str,
+    process_file: str | None,
+    cache_dir: str = API_CACHE_DIR,
+    workers: int = FETCH_WORKERS,
+    pool_size: int | None = None,
+    snapshot_dir: str | None = None,
+    manifest_path: str | None = MANIFEST_PATH,
+    force: bool = False,
+    jobs: int = 1,
+    param_cache: bool = False,
+) -> List[Tuple[str, float, str]]:
+    """
+    Convert every process listed in a process file to GalaxyXML within one interpreter.
+
+    The API document is retrieved and indexed once and shared by all processes. The process
+    descriptions are downloaded in parallel and converted as soon as they arrive. Tools whose
+    process description, API path entry and generator code did not change since the last run
+    are skipped, as recorded in the manifest. With more than one job, the tools are generated
+    on a pool of worker processes that write their files themselves.
+
+    Args:
+        base_url (str): The base URL.
+        process_file (str or None): Path to the file containing the process IDs, None for
+            all processes of the snapshot.
+        cache_dir (str): Directory of the API document cache.
+        workers (int): The number of process descriptions downloaded at the same time.
+        pool_size (int, optional): The size of the HTTP connection pool, defaults to workers.
+        snapshot_dir (str, optional): Snapshot directory used instead of the server.
+        manifest_path (str, optional): Path of the regeneration manifest, None to always regenerate.
+        force (bool): Regenerate every tool, even if its inputs did not change.
+        jobs (int): The number of worker processes generating tools, 1 to generate in this process.
+        param_cache (bool): Reuse the rendered parameters of identical inputs across the tools of the batch.
+
+    Returns:
+        List[Tuple[str, float, str]]: One (process ID, seconds, status) entry per process.
+    """
+    workflow = GalaxyToolConverter(
+        cache_dir=cache_dir, pool_size=pool_size or workers, snapshot_dir=snapshot_dir, param_cache=param_cache
+    )
+    if process_file is not None:
+        process_ids = read_process_ids(file_path=process_file)
+    else:
+        process_ids = workflow.snapshot.get_process_ids()
+    batch_start = time.perf_counter()
+    api_data = workflow.retrieve_api_json(url=f"{base_url}api")
+    path_index = ApiPathIndex(paths=api_data.get("paths", {})) if api_data is not None else None
+    manifest = create_manifest(manifest_path=manifest_path) if manifest_path is not None else None
+
+    timings = []
+
+    def record(process_name, fingerprint, seconds, status, output_paths=None):
+        if manifest is not None and status != "unchanged":
+            if status == "ok" and fingerprint is not None:
+                manifest.update(process_name, fingerprint, output_paths)
+            else:
+                manifest.remove(process_name)
+        timings.append((process_name, seconds, status))
+
+    executor = None
+    if jobs > 1:
+        # The workers are spawned instead of forked, as the fetch threads and the pooled session are
+        # already active here and a forked child could inherit one of their locks in a held state
+        executor = ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_generation_worker,
+            initargs=(api_data, cache_dir, snapshot_dir, param_cache),
+        )
+    pending = {}
+    errors = []
+    try:
+        descriptions = fetch_process_descriptions(
+            workflow=workflow, base_url=base_url, process_ids=process_ids, workers=workers
+        )
+        for process_name, process_data, fetch_seconds in descriptions:
+            tool_start = time.perf_counter()
+            fingerprint = None
+            if manifest is not None and process_data is not None:
+                path_entry = path_index.get_path_entry(process=process_name) if path_index is not None else None
+                fingerprint = manifest.get_fingerprint(process_data=process_data, path_entry=path_entry)
+            if fingerprint is not None and not force and manifest.is_up_to_date(process_name, fingerprint):
+                record(process_name, fingerprint, fetch_seconds + time.perf_counter() - tool_start, "unchanged")
+            elif executor is not None and process_data is not None:
+                future = executor.submit(generate_tool, process_name, process_data)
+                pending[future] = (process_name, fingerprint, fetch_seconds)
+            else:
+                status, output_paths = convert_process(
+                    workflow=workflow,
+                    process_name=process_name,
+                    process_data=process_data,
+                    api_data=api_data,
+                    path_index=path_index,
+                )
+                record(process_name, fingerprint, fetch_seconds + time.perf_counter() - tool_start, status, output_paths)
+
+        for future in as_completed(pending):
+            process_name, fingerprint, fetch_seconds = pending[future]
+            try:
+                status, seconds, error, output_paths = future.result()
+            except Exception as e:
+                # The worker process died, e.g. because it ran out of memory
+                status, seconds, error, output_paths = "failed", 0.0, repr(e), None
+            if error is not None:
+                errors.append((process_name, error))
+            record(process_name, fingerprint, fetch_seconds + seconds, status, output_paths)
+    finally:
+        if executor is not None:
+            # Pending tools are cancelled if the batch is aborted
+            executor.shutdown(cancel_futures=True)
+
+    if manifest is not None:
+        manifest.save()
+    for process_name, error in errors:
+        print(f"Failed to convert {process_name}:", error, file=sys.stderr)
+    print_timing_report(timings=timings, total=time.perf_counter() - batch_start)
+    return timings
+
+
+def create_manifest(manifest_path: str) -> RegenerationManifest:
+    """
+    Load the regeneration manifest for the current generator code.
+
+    The generator version is a hash over main.py and the GeneratorXML sources, so that
+    every tool is regenerated after a change of the generator.
+
+    Args:
+        manifest_path (str): Path of the manifest file.
+
+    Returns:
+        RegenerationManifest: The manifest, empty if the file does not exist yet.
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    source_paths = [os.path.abspath(__file__)] + glob.glob(os.path.join(root, "GeneratorXML", "*.py"))
+    # The bundled schemas change the resolved extended schemas, and so the tools
+    source_paths += glob.glob(os.path.join(root, "GeneratorXML", "schemas", "*.json"))
+    generator_version = RegenerationManifest.compute_generator_version(source_paths=source_paths)
+    return RegenerationManifest(manifest_path=manifest_path, generator_version=generator_version)
+
+
+def init_generation_worker(
+    api_data: dict | None, cache_dir: str = API_CACHE_DIR, snapshot_dir: str | None = None, param_cache: bool = False
+):
+    """
+    Prepare a generation worker process.
+
+    The API document is passed once per worker instead of once per tool, and every worker
+    builds its own path index. The workers share the on-disk cache of referenced schemas.
+
+    Args:
+        api_data (dict or None): The API document shared by all processes.
+        cache_dir (str): Directory of the API document cache.
+        snapshot_dir (str, optional): Directory of the snapshot the tools are generated from.
+        param_cache (bool): Reuse the rendered parameters of identical inputs within the worker.
+    """
+    generation_worker_state["workflow"] = GalaxyToolConverter(
+        cache_dir=cache_dir, snapshot_dir=snapshot_dir, param_cache=param_cache
+    )
+    generation_worker_state["api_data"] = api_data
+    generation_worker_state["path_index"] = ApiPathIndex(paths=api_data.get("paths", {})) if api_data is not None else None
+
+
+def generate_tool(process_name: str, process_data: dict) -> Tuple[str, float, str | None, List[str] | None]:
+    """
+    Generate the files of one tool in a generation worker process.
+
+    Args:
+        process_name (str): The process ID.
+        process_data (dict): The process description.
+
+    Returns:
+        Tuple[str, float, str | None, List[str] | None]: The status, the generation time in seconds,
+        the error message if the generation failed and the paths of the written files.
+    """
+    start = time.perf_counter()
+    try:
+        output_paths = generation_worker_state["workflow"].json_to_galaxyxml(
+            process_data=process_data,
+            api_data=generation_worker_state["api_data"],
+            path_index=generation_worker_state["path_index"],
+        )
+    except Exception as e:
+        return "failed", time.perf_counter() - start, repr(e), None
+    return "ok", time.perf_counter() - start, None, output_paths
+
+
+def fetch_process_descriptions(
+    workflow: GalaxyToolConverter, base_url: str, process_ids: List[str], workers: int
+) -> Iterator[Tuple[str, dict | None, float]]:
+    """
+    Download the descriptions of several processes in parallel.
+
+    The downloads run on a bounded thread pool and share the session of the converter.
+    If the converter uses a snapshot, the descriptions are read from disk instead.
+    Descriptions are yielded in the order in which they arrive, not in the order of the IDs.
+
+    Args:
+        workflow (GalaxyToolConverter): The converter used for retrieval.
+        base_url (str): The base URL.
+        process_ids (List[str]): The IDs of the processes to download.
+        workers (int): The maximum number of downloads running at the same time.
+
+    Yields:
+        Tuple[str, dict | None, float]: The process ID, its description (None on failure)
+        and the download time in seconds.
+    """
+
+    def fetch(process_name: str):
+        start = time.perf_counter()
+        process_data = workflow.retrieve_process_json(base_url=base_url, process_name=process_name)
+        return process_name, process_data, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(fetch, process_name) for process_name in process_ids]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def convert_process(
+    workflow: GalaxyToolConverter,
+    process_name: str,
+    process_data: dict | None,
+    api_data: dict,
+    path_index: ApiPathIndex | None = None,
+) -> Tuple[str, List[str] | None]:
+    """
+    Convert one retrieved process description to GalaxyXML.
+
+    Errors are reported and returned as status instead of raised, so that a single
+    broken process does not abort a batch.
+
+    Args:
+        workflow (GalaxyToolConverter): The converter used for the conversion.
+        process_name (str): The process ID.
+        process_data (dict or None): The process description, None if it could not be retrieved.
+        api_data (dict): The API document shared by all processes.
+        path_index (ApiPathIndex, optional): Index of the API paths shared by all processes.
+
+    Returns:
+        Tuple[str, List[str] | None]: "ok" and the paths of the written files if the tool was
+        written, otherwise "failed" and None.
+    """
+    if process_data is None:
+        return "failed", None
+    try:
+        output_paths = workflow.json_to_galaxyxml(process_data=process_data, api_data=api_data, path_index=path_index)
+    except Exception as e:
+        print(f"Failed to convert {process_name}:", e, file=sys.stderr)
+        return "failed", None
+    return "ok", output_paths
+
+
+def print_timing_report(timings: List[Tuple[str, float, str]], total: float):
+    """
+    Print the per-tool timings of a batch followed by the total time.
+
+    Args:
+        timings (List[Tuple[str, float, str]]): One (process ID, seconds, status) entry per process.
+        total (float): The wall time of the whole batch in seconds.
+    """
+    for process_name, seconds, status in timings:
+        print(f"{process_name:<50} {seconds:8.3f}s  {status}")
+    failed = sum(1 for _, _, status in timings if status == "failed")
+    unchanged = sum(1 for _, _, status in timings if status == "unchanged")
+    generated = len(timings) - failed - unchanged
+    print(f"Generated {generated} of {len(timings)} tools ({unchanged} unchanged, {failed} failed) in {total:.3f}s")
+
+
+def write_snapshot(
+    base_url: str,
+    snapshot_dir: str,
+    process_ids: List[str] | None = None,
+    workers: int = FETCH_WORKERS,
+    requests_per_second: float | None = None,
+) -> Dict[str, bool] | None:
+    """
+    Download the API document and the process descriptions into a snapshot directory,
+    which can later be converted without network access with --snapshot.
+
+    Args:
+        base_url (str): The base URL.
+        snapshot_dir (str): The directory the snapshot is written to.
+        process_ids (List[str], optional): The processes to download, all processes if None.
+        workers (int): The maximum number of requests running at the same time.
+        requests_per_second (float, optional): The maximum request rate per host, None for no limit.
+
+    Returns:
+        Dict[str, bool] or None: For each process ID whether its description was written,
+        or None if the process list could not be retrieved.
+    """
+    crawler = ProcessCrawler(
+        base_url=base_url, snapshot_dir=snapshot_dir, concurrency=workers, requests_per_second=requests_per_second
+    )
+    try:
+        results = crawler.run(process_ids=process_ids)
+    except RuntimeError as e:
+        print(f"Failed to write the snapshot: {e}", file=sys.stderr)
+        return None
+    failed = sorted(process_id for process_id, written in results.items() if not written)
+    print(f"Wrote {len(results) - len(failed)} of {len(results)} process descriptions to {snapshot_dir}")
+    for process_id in failed:
+        print(f"Failed to download {process_id}", file=sys.stderr)
+    return results
+
+
+def parse_arguments(args: List[str]) -> argparse.Namespace:
+    """
+    Parse the command-line arguments of main.py.
+
+    Args:
+        args (List[str]): The command-line arguments without the script name.
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Convert ZOO-Project processes to Galaxy XML tools.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--process", help="ID of a single process to convert.")
+    group.add_argument("--process-file", help="File with one process ID per line, converted in one run.")
+    parser.add_argument("--cache-dir", default=API_CACHE_DIR, help="Directory of the API document cache.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=FETCH_WORKERS,
+        help="Number of process descriptions downloaded in parallel with --process-file.",
+    )
+    parser.add_argument("--pool-size", type=int, help="Size of the HTTP connection pool, defaults to --workers.")
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        help="Maximum number of requests per second to each host with --write-snapshot, no limit by default.",
+    )
+    parser.add_argument(
+        "--manifest",
+        default=MANIFEST_PATH,
+        help="Manifest recording the inputs of each generated tool, used to skip unchanged tools.",
+    )
+    parser.add_argument("--force", action="store_true", help="Regenerate every tool, even if its inputs did not change.")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes generating tools in parallel with --process-file or --snapshot.",
+    )
+    parser.add_argument(
+        "--param-cache",
+        action="store_true",
+        help="Render the parameters of identical inputs once per batch and clone them for other tools.",
+    )
+    snapshot_group = parser.add_mutually_exclusive_group()
+    snapshot_group.add_argument(
+        "--snapshot",
+        metavar="DIR",
+        help="Read the API document and process descriptions from a snapshot directory instead of the server. "
+        "Without --process or --process-file, all processes of the snapshot are converted.",
+    )
+    snapshot_group.add_argument(
+        "--write-snapshot",
+        metavar="DIR",
+        help="Download the API document and process descriptions into a snapshot directory and exit.",
+    )
+    arguments = parser.parse_args(args)
+    if not any([arguments.process, arguments.process_file, arguments.snapshot, arguments.write_snapshot]):
+        parser.error("one of the arguments --process --process-file --snapshot --write-snapshot is required")
+    return arguments
+
+
 if __name__ == "__main__":
-    # Check if the process is provided as a command-line argument
-    if len(sys.argv) < 3 or sys.argv[1] != "--process":
-        print("Error: Process not provided. Use python3 main.py --process {process}")
-        sys.exit(1)
-    process_id = sys.argv[2]
+    arguments = parse_arguments(sys.argv[1:])
     BASE_URL = "https://ospd.geolabs.fr:8300/ogc-api/"
-    main(BASE_URL, process_id)
+    if arguments.write_snapshot is not None:
+        if arguments.process is not None:
+            snapshot_process_ids = [arguments.process]
+        elif arguments.process_file is not None:
+            snapshot_process_ids = read_process_ids(file_path=arguments.process_file)
+        else:
+            snapshot_process_ids = None
+        snapshot_results = write_snapshot(
+            BASE_URL,
+            arguments.write_snapshot,
+            process_ids=snapshot_process_ids,
+            workers=arguments.workers,
+            requests_per_second=arguments.requests_per_second,
+        )
+        sys.exit(0 if snapshot_results is not None and all(snapshot_results.values()) else 1)
+    if arguments.process is None:
+        results = main_batch(
+            BASE_URL,
+            arguments.process_file,
+            cache_dir=arguments.cache_dir,
+            workers=arguments.workers,
+            pool_size=arguments.pool_size,
+            snapshot_dir=arguments.snapshot,
+            manifest_path=arguments.manifest,
+            force=arguments.force,
+            jobs=arguments.jobs,
+            param_cache=arguments.param_cache,
+        )
+        sys.exit(1 if any(status == "failed" for _, _, status in results) else 0)
+    main(BASE_URL, arguments.process, cache_dir=arguments.cache_dir, snapshot_dir=arguments.snapshot)
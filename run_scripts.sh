@@ -48,8 +48,5 @@ else
     echo "Virtual environment is already activated."
 fi
 
-# Loop through each line in the file and pass it to main.py using --process option
-while IFS= read -r line; do
-    # Run the Python script with --process option and passing the current line as argument
-    python3 main.py --process "$line"
-done < "$file_path"
+# Generate all processes of the file in a single Python run
+python3 main.py --process-file "$file_path"
@@ -0,0 +1,89 @@
+import json
+
+import requests_mock
+
+from GeneratorXML.api_cache import ApiDocumentCache
+
+API_URL = "https://ospd.geolabs.fr:8300/ogc-api/api"
+
+
+def test_retrieve_stores_document_and_validators(tmp_path):
+    cache = ApiDocumentCache(cache_dir=str(tmp_path))
+    with requests_mock.Mocker() as m:
+        m.get(API_URL, json={"paths": {}}, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jul 2024 00:00:00 GMT"})
+
+        assert cache.retrieve(API_URL) == {"paths": {}}
+
+        # The first request is unconditional
+        assert "If-None-Match" not in m.last_request.headers
+
+    assert json.loads((tmp_path / "api.json").read_text()) == {"paths": {}}
+    headers = json.loads((tmp_path / "api.headers.json").read_text())
+    assert headers["etag"] == '"v1"'
+    assert headers["last_modified"] == "Mon, 01 Jul 2024 00:00:00 GMT"
+
+
+def test_retrieve_revalidates_with_conditional_get(tmp_path):
+    cache = ApiDocumentCache(cache_dir=str(tmp_path))
+    with requests_mock.Mocker() as m:
+        m.get(API_URL, json={"paths": {"a": {}}}, headers={"ETag": '"v1"'})
+        cache.retrieve(API_URL)
+
+        m.get(API_URL, status_code=304)
+        result = cache.retrieve(API_URL)
+
+        assert m.last_request.headers["If-None-Match"] == '"v1"'
+    assert result == {"paths": {"a": {}}}
+
+
+def test_retrieve_replaces_changed_document(tmp_path):
+    cache = ApiDocumentCache(cache_dir=str(tmp_path))
+    with requests_mock.Mocker() as m:
+        m.get(API_URL, json={"paths": {"a": {}}}, headers={"ETag": '"v1"'})
+        cache.retrieve(API_URL)
+
+        m.get(API_URL, json={"paths": {"b": {}}}, headers={"ETag": '"v2"'})
+        assert cache.retrieve(API_URL) == {"paths": {"b": {}}}
+
+    assert json.loads((tmp_path / "api.headers.json").read_text())["etag"] == '"v2"'
+
+
+def test_retrieve_without_validators_is_not_cached(tmp_path):
+    cache = ApiDocumentCache(cache_dir=str(tmp_path))
+    with requests_mock.Mocker() as m:
+        m.get(API_URL, json={"paths": {}})
+
+        assert cache.retrieve(API_URL) == {"paths": {}}
+
+    assert not (tmp_path / "api.json").exists()
+
+
+def test_retrieve_falls_back_to_cache_on_error(tmp_path):
+    cache = ApiDocumentCache(cache_dir=str(tmp_path))
+    with requests_mock.Mocker() as m:
+        m.get(API_URL, json={"paths": {}}, headers={"ETag": '"v1"'})
+        cache.retrieve(API_URL)
+
+        m.get(API_URL, status_code=500)
+        assert cache.retrieve(API_URL) == {"paths": {}}
+
+
+def test_retrieve_failure_without_cache(tmp_path):
+    cache = ApiDocumentCache(cache_dir=str(tmp_path / "missing"))
+    with requests_mock.Mocker() as m:
+        m.get(API_URL, status_code=500)
+
+        assert cache.retrieve(API_URL) is None
+
+
+def test_retrieve_ignores_entry_of_another_url(tmp_path):
+    cache = ApiDocumentCache(cache_dir=str(tmp_path))
+    other_url = "https://other.example.org/ogc-api/api"
+    with requests_mock.Mocker() as m:
+        m.get(API_URL, json={"paths": {"a": {}}}, headers={"ETag": '"v1"'})
+        cache.retrieve(API_URL)
+
+        m.get(other_url, status_code=500)
+        assert cache.retrieve(other_url) is None
+        # The validators of the first server are not sent to the second one
+        assert "If-None-Match" not in m.last_request.headers
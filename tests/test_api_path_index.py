@@ -0,0 +1,37 @@
+from GeneratorXML.api_path_index import ApiPathIndex
+
+
+def get_path_entry(*values):
+    examples = {f"example{index}": {"value": value} for index, value in enumerate(values)}
+    return {"post": {"requestBody": {"content": {"application/json": {"examples": examples}}}}}
+
+
+def test_index_maps_processes_to_path_entries():
+    execution = get_path_entry({"response": "raw"})
+    paths = {
+        "/processes": {"get": {}},
+        "/processes/OTB.BandMath": {"get": {}},
+        "/processes/OTB.BandMath/execution": execution,
+        "/processes/hellor/execution": get_path_entry(),
+    }
+
+    path_index = ApiPathIndex(paths=paths)
+
+    # The first path of a process wins, as with the linear scan
+    assert path_index.get_path_entry("OTB.BandMath") == {"get": {}}
+    assert path_index.get_examples("OTB.BandMath") == []
+    assert path_index.get_examples("hellor") == []
+    assert path_index.get_examples("missing") is None
+    assert path_index.get_path_entry("missing") is None
+
+
+def test_index_extracts_examples():
+    paths = {"/processes/OTB.BandMath/execution": get_path_entry({"response": "raw"}, {"response": "document"})}
+
+    path_index = ApiPathIndex(paths=paths)
+
+    assert path_index.get_examples("OTB.BandMath") == [{"response": "raw"}, {"response": "document"}]
+
+
+def test_extract_examples_without_request_body():
+    assert ApiPathIndex.extract_examples({"get": {}}) == []
@@ -4,11 +4,19 @@ from unittest.mock import Mock, patch, MagicMock, mock_open
 from pprint import pformat
 import sys
 import os
+import signal
+import threading
+
+import requests
 
 # Add the parent directory to the system path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Tools", "Code")))
 
-from Tools.Code.api_request import APIRequest
+from Tools.Code.api_request import APIRequest, OutputWriteError
+from Tools.Code.callback_listener import CallbackListener
+from Tools.Code.polling_strategy import JobTimeoutError, PollingStrategy
+from Tools.Code.result_cache import ResultCache
+from Tools.Code.single_flight import SingleFlight
 
 
 @pytest.fixture
@@ -164,8 +172,8 @@ def test_get_url(setup_request_syn):
         request.get_url("invalid")
 
 
-# Mocks for requests.get and time.sleep
-@patch("requests.get")
+# Mocks for HttpClient.get and time.sleep
+@patch("Tools.Code.http_client.HttpClient.get")
 @patch("time.sleep", return_value=None)
 def test_check_job_id(mock_sleep, mock_get, setup_request_asyn):
     request = setup_request_asyn
@@ -195,7 +203,7 @@ def test_check_job_id(mock_sleep, mock_get, setup_request_asyn):
     # Ensure the sleep was called
     assert mock_sleep.call_count == 2
 
-    # Check the calls to requests.get
+    # Check the calls to HttpClient.get
     assert mock_get.call_count == 3
     mock_get.assert_any_call(url="https://ospd.geolabs.fr:8300/ogc-api/jobs/12345", headers={"accept": "application/json"})
     mock_get.assert_any_call(
@@ -203,6 +211,150 @@ def test_check_job_id(mock_sleep, mock_get, setup_request_asyn):
     )
 
 
+@patch("Tools.Code.http_client.HttpClient.get")
+@patch("time.sleep", return_value=None)
+def test_check_job_id_backoff_and_retry_after(mock_sleep, mock_get, setup_request_asyn):
+    request = setup_request_asyn
+    request.polling_strategy = PollingStrategy(initial_interval=1.0, max_interval=20.0, multiplier=2.0, timeout=None)
+
+    initial_response = MagicMock()
+    initial_response.status_code = 201
+    initial_response.headers = {}
+    initial_response.json.return_value = {"status": "accepted", "jobID": "12345"}
+
+    running_response = MagicMock()
+    running_response.headers = {}
+    running_response.json.return_value = {"status": "running"}
+
+    throttled_response = MagicMock()
+    throttled_response.headers = {"Retry-After": "7"}
+    throttled_response.json.return_value = {"status": "running"}
+
+    successful_response = MagicMock()
+    successful_response.json.return_value = {"status": "successful"}
+
+    mock_get.side_effect = [running_response, throttled_response, successful_response, successful_response]
+
+    request.check_job_id(initial_response)
+
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [1.0, 2.0, 7.0]
+
+
+@patch("Tools.Code.http_client.HttpClient.delete")
+@patch("Tools.Code.http_client.HttpClient.get")
+@patch("time.sleep", return_value=None)
+def test_check_job_id_timeout(mock_sleep, mock_get, mock_delete, setup_request_asyn):
+    request = setup_request_asyn
+    request.polling_strategy = PollingStrategy(timeout=0.0)
+
+    initial_response = MagicMock()
+    initial_response.status_code = 201
+    initial_response.json.return_value = {"status": "running", "jobID": "12345"}
+
+    with pytest.raises(JobTimeoutError):
+        request.check_job_id(initial_response)
+
+    mock_get.assert_not_called()
+    mock_delete.assert_called_once_with(
+        url="https://ospd.geolabs.fr:8300/ogc-api/jobs/12345", headers={"accept": "application/json"}
+    )
+
+
+@patch("Tools.Code.http_client.HttpClient.delete")
+@patch("Tools.Code.http_client.HttpClient.get")
+@patch("time.sleep", side_effect=KeyboardInterrupt)
+def test_check_job_id_interrupted(mock_sleep, mock_get, mock_delete, setup_request_asyn):
+    request = setup_request_asyn
+
+    initial_response = MagicMock()
+    initial_response.status_code = 201
+    initial_response.json.return_value = {"status": "running", "jobID": "12345"}
+
+    with pytest.raises(KeyboardInterrupt):
+        request.check_job_id(initial_response)
+
+    mock_delete.assert_called_once()
+
+
+@patch("Tools.Code.http_client.HttpClient.delete")
+@patch("Tools.Code.http_client.HttpClient.get")
+@patch("time.sleep", side_effect=lambda interval: os.kill(os.getpid(), signal.SIGTERM))
+def test_check_job_id_terminated(mock_sleep, mock_get, mock_delete, setup_request_asyn):
+    request = setup_request_asyn
+    previous_handler = signal.getsignal(signal.SIGTERM)
+
+    initial_response = MagicMock()
+    initial_response.status_code = 201
+    initial_response.json.return_value = {"status": "running", "jobID": "12345"}
+
+    # Galaxy stops a job with SIGTERM
+    with pytest.raises(SystemExit) as exc_info:
+        request.check_job_id(initial_response)
+
+    assert exc_info.value.code == 128 + signal.SIGTERM
+    mock_get.assert_not_called()
+    mock_delete.assert_called_once_with(
+        url="https://ospd.geolabs.fr:8300/ogc-api/jobs/12345", headers={"accept": "application/json"}
+    )
+    assert signal.getsignal(signal.SIGTERM) is previous_handler
+
+
+@patch("Tools.Code.http_client.HttpClient.get")
+@patch("time.sleep", return_value=None)
+def test_check_job_id_with_callback(mock_sleep, mock_get, setup_request_asyn):
+    request = setup_request_asyn
+    request.callback_listener = CallbackListener(host="127.0.0.1")
+
+    initial_response = MagicMock()
+    initial_response.status_code = 201
+    initial_response.json.return_value = {"status": "running", "jobID": "12345"}
+
+    results_response = MagicMock()
+    mock_get.return_value = results_response
+
+    with request.callback_listener as listener:
+        # Stands in for the ZOO-Project server that calls back once the job finished
+        requests.post(listener.get_subscriber()["successUri"], json={"jobID": "12345", "status": "successful"})
+        final_response = request.check_job_id(initial_response)
+
+    assert final_response is results_response
+    # Only the results are requested, the status is never polled
+    mock_get.assert_called_once_with(
+        url="https://ospd.geolabs.fr:8300/ogc-api/jobs/12345/results", headers={"accept": "application/json"}
+    )
+    mock_sleep.assert_not_called()
+
+
+@patch("Tools.Code.http_client.HttpClient.get")
+def test_check_job_id_callback_fallback_to_polling(mock_get, setup_request_asyn):
+    request = setup_request_asyn
+    request.callback_listener = MagicMock()
+    request.callback_listener.wait.return_value = None
+
+    initial_response = MagicMock()
+    initial_response.status_code = 201
+    initial_response.json.return_value = {"status": "running", "jobID": "12345"}
+
+    successful_response = MagicMock()
+    successful_response.json.return_value = {"status": "successful"}
+    mock_get.return_value = successful_response
+
+    request.check_job_id(initial_response)
+
+    request.callback_listener.wait.assert_called_once()
+    assert mock_get.call_count == 2
+
+
+@patch("Tools.Code.http_client.HttpClient.delete", side_effect=requests.exceptions.ConnectionError("unreachable"))
+def test_cancel_job_failure(mock_delete, capsys, setup_request_asyn):
+    request = setup_request_asyn
+    request.job_id = "12345"
+
+    request.cancel_job()
+
+    assert "Failed to dismiss job 12345" in capsys.readouterr().err
+
+
 def test_process_response_data(setup_request_syn):
     # Setup
     request = setup_request_syn
@@ -228,6 +380,162 @@ def test_process_response_data(setup_request_syn):
     request.write_transmission_item_based_on_mode.assert_called_once_with("output_data_out", transmission_item, "reference")
 
 
+@pytest.fixture
+def setup_request_multi_output(setup_request_syn):
+    request = setup_request_syn
+    request.transmission_mode = {"out": "reference", "mask": "reference", "stats": "value"}
+    request.file_directory = {f"output_data_{key}": f"/tmp/{key}.dat" for key in request.transmission_mode}
+    response_data = {key: {"href": f"https://ospd.geolabs.fr:8300/temp/{key}.tiff"} for key in request.transmission_mode}
+    return request, response_data
+
+
+def test_process_response_data_concurrent(setup_request_multi_output):
+    request, response_data = setup_request_multi_output
+    barrier = threading.Barrier(len(response_data), timeout=5)
+    written = []
+
+    def write(output_file_path, transmission_item, mode):
+        # Only passes if all outputs are written at the same time
+        barrier.wait()
+        written.append(output_file_path)
+
+    request.write_transmission_item_based_on_mode = MagicMock(side_effect=write)
+
+    request.process_response_data(response_data=response_data)
+
+    assert sorted(written) == ["/tmp/mask.dat", "/tmp/out.dat", "/tmp/stats.dat"]
+
+
+def test_process_response_data_reports_each_failed_output(capsys, setup_request_multi_output):
+    request, response_data = setup_request_multi_output
+    written = []
+
+    def write(output_file_path, transmission_item, mode):
+        if output_file_path != "/tmp/out.dat":
+            raise OSError(f"No space left for {output_file_path}")
+        written.append(output_file_path)
+
+    request.write_transmission_item_based_on_mode = MagicMock(side_effect=write)
+
+    with pytest.raises(OutputWriteError, match="mask, stats"):
+        request.process_response_data(response_data=response_data)
+
+    assert written == ["/tmp/out.dat"]
+    errors = capsys.readouterr().err
+    assert "Failed to write output mask: No space left for /tmp/mask.dat" in errors
+    assert "Failed to write output stats: No space left for /tmp/stats.dat" in errors
+
+
+@pytest.fixture
+def setup_request_cached(setup_request_syn, tmp_path):
+    request = setup_request_syn
+    request.transmission_mode = {"out": "value"}
+    request.file_directory = {"output_data_out": str(tmp_path / "out.dat")}
+    request.result_cache = ResultCache(cache_dir=str(tmp_path / "cache"))
+    request.process_version = "1.0.0"
+    return request
+
+
+@patch("Tools.Code.http_client.HttpClient.post")
+def test_submit_without_polling_deadline_waits_forever(mock_post, monkeypatch, setup_request_syn):
+    request = setup_request_syn
+    monkeypatch.setenv("OGC_POLL_TIMEOUT", "0")
+    request.polling_strategy = PollingStrategy.from_environment()
+    mock_post.return_value = MagicMock(status_code=200)
+
+    request.submit()
+
+    assert mock_post.call_args.kwargs["timeout"] == (request.http_client.connect_timeout, None)
+
+
+@patch("Tools.Code.http_client.HttpClient.post")
+def test_post_request_stores_result_in_cache(mock_post, setup_request_cached):
+    request = setup_request_cached
+    mock_post.return_value = MagicMock(status_code=200, ok=True)
+    mock_post.return_value.json.return_value = {"out": {"value": "42"}}
+
+    request.post_request()
+
+    key = request.get_cache_key()
+    assert os.path.isfile(os.path.join(request.result_cache.get_entry_dir(key), "outputs", "out"))
+
+
+@patch("Tools.Code.http_client.HttpClient.post")
+def test_post_request_cache_hit(mock_post, setup_request_cached, tmp_path):
+    request = setup_request_cached
+    cached_output = tmp_path / "cached.dat"
+    cached_output.write_text("42\n")
+    key = request.get_cache_key()
+    request.result_cache.store(key, {"out": {"value": "42"}}, {"out": str(cached_output)})
+
+    request.post_request()
+
+    mock_post.assert_not_called()
+    assert (tmp_path / "out.dat").read_text() == "42\n"
+
+
+@patch("Tools.Code.http_client.HttpClient.post")
+def test_post_request_raw_and_document_runs_do_not_share_cache_entries(mock_post, setup_request_cached, tmp_path):
+    request = setup_request_cached
+    mock_post.return_value = MagicMock(status_code=200, ok=True)
+    mock_post.return_value.json.return_value = {"out": {"value": "42"}}
+    request.post_request()
+    document_output = (tmp_path / "out.dat").read_text()
+
+    request.response_input = "raw"
+    request.file_directory = {"output_data_out": str(tmp_path / "raw.dat")}
+    request.write_raw_transmission_item = MagicMock(side_effect=lambda path, item: open(path, "w").write(item["value"]))
+    request.post_request()
+
+    # The raw run is sent to the server instead of restoring the document of the first run
+    assert mock_post.call_count == 2
+    assert (tmp_path / "raw.dat").read_text() == "42"
+    assert document_output != "42"
+    assert len(os.listdir(request.result_cache.entries_dir)) == 2
+
+
+@patch("Tools.Code.http_client.HttpClient.post")
+def test_post_request_does_not_cache_references(mock_post, setup_request_cached):
+    request = setup_request_cached
+    request.transmission_mode = {"out": "reference"}
+    mock_post.return_value = MagicMock(status_code=200, ok=True)
+    mock_post.return_value.json.return_value = {"out": {"href": "https://ospd.geolabs.fr:8300/temp/out.tiff"}}
+
+    request.post_request()
+
+    assert os.listdir(request.result_cache.entries_dir) == []
+
+
+@patch("Tools.Code.http_client.HttpClient.post")
+def test_post_request_reuses_identical_execution(mock_post, setup_request_syn):
+    request = setup_request_syn
+    flight = MagicMock(job_id="12345", result={"out": {"href": "https://ospd.geolabs.fr:8300/temp/out.tiff"}})
+    request.single_flight = MagicMock()
+    request.single_flight.run.return_value.__enter__.return_value = flight
+    request.process_response_data = MagicMock()
+
+    request.post_request()
+
+    mock_post.assert_not_called()
+    request.single_flight.run.assert_called_once_with(request.get_cache_key())
+    request.process_response_data.assert_called_once_with(flight.result)
+
+
+@patch("Tools.Code.http_client.HttpClient.post")
+def test_post_request_records_result_for_waiting_jobs(mock_post, setup_request_syn, tmp_path):
+    request = setup_request_syn
+    request.single_flight = SingleFlight(str(tmp_path))
+    request.process_response_data = MagicMock()
+    mock_post.return_value = MagicMock(status_code=200, ok=True)
+    mock_post.return_value.json.return_value = {"out": {"href": "https://ospd.geolabs.fr:8300/temp/out.tiff"}}
+
+    request.post_request()
+
+    mock_post.assert_called_once()
+    key = request.get_cache_key()
+    assert os.path.isfile(tmp_path / f"{key}.result.json")
+
+
 def test_get_output_file_path(setup_request_syn):
     # Setup
     request = setup_request_syn
@@ -293,8 +601,8 @@ def test_write_transmission_item_based_on_mode_document(setup_request_syn):
     request.write_raw_transmission_item.assert_not_called()
 
 
-@patch("urllib.request.urlretrieve")
-def test_write_raw_transmission_item_dict(mock_urlretrieve, setup_request_raw):
+@patch("Tools.Code.http_client.HttpClient.download")
+def test_write_raw_transmission_item_dict(mock_download, setup_request_raw):
     request = setup_request_raw
     output_file_path = (
         "/tmp/tmpyqrzc8n1/job_working_directory/000/3/outputs/dataset_f7a688b9-1bfc-4d55-a95c-82683dad7af9.dat"
@@ -306,7 +614,7 @@ def test_write_raw_transmission_item_dict(mock_urlretrieve, setup_request_raw):
 
     request.write_raw_transmission_item(output_file_path, transmission_item)
 
-    mock_urlretrieve.assert_called_once_with(
+    mock_download.assert_called_once_with(
         "https://ospd.geolabs.fr:8300/temp///BandMath_0_7abe2bba-360a-11ef-a61e-0242ac10ee0a.tiff", output_file_path
     )
 
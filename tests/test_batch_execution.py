@@ -0,0 +1,143 @@
+import json
+import os
+import sys
+import threading
+from unittest.mock import Mock, patch
+
+import requests
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Tools", "Code")))
+
+from Tools.Code.batch_execution import BatchExecution, main
+from Tools.Code.polling_strategy import PollingStrategy
+
+
+class FakeHttpClient:
+    """
+    Stand-in for the OGC API of the ZOO-Project server. Every job reports "running" once, then the
+    status given by the `exp` input of its parameter set, or "successful" if that is not a status.
+    """
+
+    def __init__(self, unreachable=()):
+        self.unreachable = unreachable
+        self.lock = threading.Lock()
+        self.jobs = {}
+        self.posts = []
+        self.list_requests = 0
+        self.deleted = []
+
+    def get_timeout(self, read_timeout=None):
+        return (10.0, read_timeout)
+
+    def post(self, url, headers, data, timeout):
+        payload = json.loads(data.read())
+        if payload["inputs"]["exp"] in self.unreachable:
+            raise requests.exceptions.ConnectionError("unreachable")
+        with self.lock:
+            job_id = f"job-{len(self.jobs)}"
+            final_status = payload["inputs"]["exp"] if payload["inputs"]["exp"] == "failed" else "successful"
+            self.jobs[job_id] = ["running", final_status]
+            self.posts.append(headers)
+        return self.create_response(201, {"jobID": job_id, "status": "accepted"})
+
+    def get(self, url, headers):
+        if url.endswith("/jobs"):
+            with self.lock:
+                self.list_requests += 1
+                jobs = [{"jobID": job_id, "status": self.next_status(job_id)} for job_id in self.jobs]
+            return self.create_response(200, {"jobs": jobs})
+        job_id = url.split("/jobs/")[1]
+        if job_id.endswith("/results"):
+            return self.create_response(200, {"out": {"value": f"result of {job_id[: -len('/results')]}"}})
+        with self.lock:
+            return self.create_response(200, {"jobID": job_id, "status": self.next_status(job_id)})
+
+    def next_status(self, job_id):
+        statuses = self.jobs[job_id]
+        return statuses.pop(0) if len(statuses) > 1 else statuses[0]
+
+    def delete(self, url, headers):
+        self.deleted.append(url.split("/jobs/")[1])
+        return self.create_response(200, {})
+
+    @staticmethod
+    def create_response(status_code, data):
+        response = Mock(status_code=status_code, ok=status_code < 400)
+        response.json.return_value = data
+        return response
+
+
+def create_parameter_sets(tmp_path, expressions):
+    return [
+        {
+            "exp": expression,
+            "outputType_out": "text/plain",
+            "output_data_out": str(tmp_path / f"out{index}.dat"),
+            "transmissionMode_out": "value",
+            "response": "document",
+        }
+        for index, expression in enumerate(expressions)
+    ]
+
+
+def create_polling_strategy(timeout=60.0):
+    return PollingStrategy(initial_interval=0.01, max_interval=0.01, timeout=timeout)
+
+
+def test_run_awaits_all_jobs_in_one_loop(tmp_path):
+    http_client = FakeHttpClient()
+    batch = BatchExecution(
+        process_name="OTB.BandMath",
+        parameter_sets=create_parameter_sets(tmp_path, ["im1b1", "im1b2", "im1b3"]),
+        http_client=http_client,
+        polling_strategy=create_polling_strategy(),
+        max_workers=2,
+        max_requests_per_second=100.0,
+    )
+
+    assert batch.run() == ["successful", "successful", "successful"]
+    assert all(headers["Prefer"] == "respond-async;return=representation" for headers in http_client.posts)
+    # The jobs are polled together with the job list, not in one polling loop per job
+    assert http_client.list_requests >= 1
+    for index in range(3):
+        assert "result of job-" in (tmp_path / f"out{index}.dat").read_text()
+
+
+def test_run_reports_failed_and_unsubmitted_jobs(tmp_path, capsys):
+    http_client = FakeHttpClient(unreachable=("down",))
+    batch = BatchExecution(
+        process_name="OTB.BandMath",
+        parameter_sets=create_parameter_sets(tmp_path, ["im1b1", "failed", "down"]),
+        http_client=http_client,
+        polling_strategy=create_polling_strategy(),
+        max_requests_per_second=100.0,
+    )
+
+    assert batch.run() == ["successful", "failed", "failed"]
+    assert "Failed to submit processes/OTB.BandMath/execution: unreachable" in capsys.readouterr().err
+
+
+def test_run_dismisses_jobs_after_timeout(tmp_path):
+    http_client = FakeHttpClient()
+    batch = BatchExecution(
+        process_name="OTB.BandMath",
+        parameter_sets=create_parameter_sets(tmp_path, ["im1b1", "im1b2"]),
+        http_client=http_client,
+        polling_strategy=create_polling_strategy(timeout=0),
+    )
+
+    assert batch.run() == ["dismissed", "dismissed"]
+    assert sorted(http_client.deleted) == ["job-0", "job-1"]
+
+
+@patch("Tools.Code.batch_execution.BatchExecution.run")
+def test_main(mock_run, tmp_path):
+    parameter_file = tmp_path / "sweep.json"
+    parameter_file.write_text(json.dumps(create_parameter_sets(tmp_path, ["im1b1", "im1b2"])))
+
+    mock_run.return_value = ["successful", "successful"]
+    assert main(["OTB.BandMath", str(parameter_file), "--workers", "2"]) == 0
+
+    mock_run.return_value = ["successful", "failed"]
+    assert main(["OTB.BandMath", str(parameter_file)]) == 1
@@ -0,0 +1,100 @@
+import pytest
+import requests
+
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Tools", "Code")))
+
+from Tools.Code.callback_listener import CallbackListener
+
+
+@pytest.fixture
+def listener():
+    with CallbackListener(host="127.0.0.1") as listener:
+        yield listener
+
+
+def test_get_subscriber(listener):
+    subscriber = listener.get_subscriber()
+
+    port = listener.server.server_address[1]
+    assert subscriber == {
+        "successUri": f"http://127.0.0.1:{port}/{listener.token}/successful",
+        "failedUri": f"http://127.0.0.1:{port}/{listener.token}/failed",
+        "inProgressUri": f"http://127.0.0.1:{port}/{listener.token}/in-progress",
+    }
+
+
+def test_get_subscriber_public_url():
+    listener = CallbackListener(public_url="https://galaxy.example.org:8765/")
+
+    assert listener.get_subscriber()["successUri"] == f"https://galaxy.example.org:8765/{listener.token}/successful"
+
+
+def test_success_callback(listener):
+    response = requests.post(listener.get_subscriber()["successUri"], json={"jobID": "12345", "status": "successful"})
+
+    assert response.status_code == 200
+    assert listener.wait(timeout=5) == "successful"
+    assert listener.status_info == {"jobID": "12345", "status": "successful"}
+
+
+def test_failed_callback(listener):
+    requests.post(listener.get_subscriber()["failedUri"], json={"jobID": "12345", "status": "failed"})
+
+    assert listener.wait(timeout=5) == "failed"
+
+
+def test_in_progress_callback_does_not_finish(listener):
+    response = requests.post(listener.get_subscriber()["inProgressUri"], json={"status": "running", "progress": 50})
+
+    assert response.status_code == 200
+    assert listener.wait(timeout=0.1) is None
+    assert listener.status_info == {"status": "running", "progress": 50}
+
+
+def test_unknown_token_is_rejected(listener):
+    port = listener.server.server_address[1]
+
+    response = requests.post(f"http://127.0.0.1:{port}/guessed/successful", json={})
+
+    assert response.status_code == 404
+    assert listener.wait(timeout=0.1) is None
+
+
+def test_second_listener_on_the_same_port_falls_back_to_polling(listener, capsys):
+    port = listener.server.server_address[1]
+    second = CallbackListener(host="127.0.0.1", port=port)
+
+    assert second.start() is None
+    second.stop()
+    assert "cannot bind port" in capsys.readouterr().err
+
+    # The first listener keeps receiving its callbacks
+    requests.post(listener.get_callback_url("successful"), json={})
+    assert listener.wait(timeout=5) == "successful"
+
+
+def test_from_environment(monkeypatch):
+    monkeypatch.setenv("OGC_CALLBACK_URL", "http://galaxy.example.org:8765")
+    monkeypatch.delenv("OGC_CALLBACK_PORT", raising=False)
+
+    listener = CallbackListener.from_environment()
+
+    assert listener.public_url == "http://galaxy.example.org:8765"
+    assert listener.port == 8765
+
+
+def test_from_environment_port_override(monkeypatch):
+    monkeypatch.setenv("OGC_CALLBACK_URL", "https://galaxy.example.org/callbacks")
+    monkeypatch.setenv("OGC_CALLBACK_PORT", "9000")
+
+    assert CallbackListener.from_environment().port == 9000
+
+
+def test_from_environment_not_configured(monkeypatch):
+    monkeypatch.delenv("OGC_CALLBACK_URL", raising=False)
+
+    assert CallbackListener.from_environment() is None
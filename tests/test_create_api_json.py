@@ -9,6 +9,7 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Tools", "Code")))
 
 from Tools.Code.create_api_json import ApiJson
+from Tools.Code.inline_dataset import InlineDataset
 
 
 @pytest.fixture
@@ -451,3 +452,80 @@ def test_modify_attributes(setup_JSON):
     input_only_name = {"name": "OnlyName"}
     expected_only_name = {"name": "OnlyName"}
     assert extractor.modify_attributes(input_only_name) == expected_only_name
+
+
+def test_create_openapi_input_file(setup_JSON):
+    converter = setup_JSON
+    inputs = {"exp": "im1b1+im1b2"}
+    outputs = {"out": {"format": {"mediaType": "image/tiff"}, "transmissionMode": "reference"}}
+
+    assert converter.create_openapi_input_file(inputs=inputs, outputs=outputs, response="document") == {
+        "inputs": inputs,
+        "outputs": outputs,
+        "response": "document",
+    }
+
+
+def test_create_openapi_input_file_with_subscriber(setup_JSON):
+    converter = setup_JSON
+    subscriber = {
+        "successUri": "http://galaxy.example.org:8765/token/successful",
+        "failedUri": "http://galaxy.example.org:8765/token/failed",
+        "inProgressUri": "http://galaxy.example.org:8765/token/in-progress",
+    }
+
+    input_json = converter.create_openapi_input_file(inputs={}, outputs={}, response="document", subscriber=subscriber)
+
+    assert input_json["subscriber"] == subscriber
+
+
+def test_process_and_generate_input_files_inline(setup_JSON, tmp_path):
+    processor = setup_JSON
+    raster_path = tmp_path / "dataset_1.dat"
+    raster_path.write_bytes(b"II*\x00" + b"\x00" * 100)
+    links_path = tmp_path / "dataset_2.dat"
+    links_path.write_text("http://geolabs.fr/dl/Landsat8Extract1.tif\n")
+
+    input_files = {"il": str(raster_path), "in": str(links_path)}
+    input_schema = {"isArrayil": "True", "isArrayin": "False"}
+
+    result = processor.process_and_generate_input_files(input_files, input_schema)
+
+    dataset = result[0]["il"][0]
+    assert isinstance(dataset, InlineDataset)
+    assert dataset.file_path == str(raster_path)
+    assert dataset.media_type == "image/tiff"
+    assert result[1] == {"in": {"href": "http://geolabs.fr/dl/Landsat8Extract1.tif"}}
+    assert processor.exclusion_list == ["isArrayil", "isArrayin"]
+
+
+def test_generate_inline_input_json(setup_JSON):
+    converter = setup_JSON
+    dataset = InlineDataset(file_path="/tmp/dataset_1.dat", media_type="image/tiff")
+
+    assert converter.generate_inline_input_json(input_name="in", dataset=dataset, is_array=False) == {"in": dataset}
+    assert converter.generate_inline_input_json(input_name="il", dataset=dataset, is_array=True) == {"il": [dataset]}
+
+
+def test_extract_input_values_excludes_process_version(setup_JSON):
+    converter = setup_JSON
+
+    assert converter.extract_input_values({"processVersion": "1.0.0", "exp": "im1b1"}) == {"exp": "im1b1"}
+
+
+def test_get_json_inputs_polls_if_callback_port_is_in_use(setup_JSON, monkeypatch):
+    converter = setup_JSON
+    monkeypatch.setenv("OGC_CALLBACK_URL", "http://127.0.0.1:8765")
+    monkeypatch.delenv("OGC_RESULT_CACHE_DIR", raising=False)
+    monkeypatch.delenv("OGC_SINGLE_FLIGHT_DIR", raising=False)
+    monkeypatch.setattr(sys, "argv", ["create_api_json.py"])
+    monkeypatch.setattr(converter, "convert", Mock(return_value={}))
+    monkeypatch.setattr(converter, "create_api_request", Mock())
+
+    with patch("Tools.Code.create_api_json.CallbackListener.start", return_value=None):
+        converter.get_json_inputs()
+
+    options = converter.create_api_request.call_args.kwargs
+    assert options["subscriber"] is None
+    assert options["callback_listener"] is None
+    converter.create_api_request.return_value.post_request.assert_called_once()
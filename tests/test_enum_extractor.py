@@ -0,0 +1,72 @@
+from GeneratorXML.enum_extractor import EnumExtractor
+from GeneratorXML.galaxyxml_creator import GalaxyXmlTool
+
+
+def test_extract_collects_enums_in_order_without_duplicates():
+    schema = {
+        "oneOf": [
+            {
+                "allOf": [
+                    {"$ref": "http://zoo-project.org/dl/link.json"},
+                    {"properties": {"type": {"enum": ["image/tiff", "image/png"]}}, "type": "object"},
+                ]
+            },
+            {"properties": {"value": {"oneOf": [{"enum": ["image/png", "image/jpeg"]}]}}},
+        ]
+    }
+
+    assert EnumExtractor().extract(schema) == ["image/tiff", "image/png", "image/jpeg"]
+
+
+def test_extract_follows_any_of_items_and_local_references():
+    schema = {
+        "definitions": {"format": {"enum": ["text/plain"]}},
+        "anyOf": [
+            {"type": "array", "items": {"enum": ["application/json"]}},
+            {"$ref": "#/definitions/format"},
+            {"$ref": "#/definitions/missing"},
+        ],
+    }
+
+    assert EnumExtractor().extract(schema) == ["application/json", "text/plain"]
+
+
+def test_extract_terminates_on_reference_cycles():
+    schema = {"definitions": {"node": {"oneOf": [{"$ref": "#/definitions/node"}, {"enum": ["a"]}]}}}
+    schema["oneOf"] = [{"$ref": "#/definitions/node"}]
+
+    assert EnumExtractor().extract(schema) == ["a"]
+
+
+def test_extract_handles_schemas_deeper_than_the_recursion_limit():
+    schema = {"enum": ["leaf"]}
+    for _ in range(5000):
+        schema = {"oneOf": [schema]}
+
+    assert EnumExtractor().extract(schema) == ["leaf"]
+
+
+def test_extract_keeps_values_of_different_types_apart():
+    assert EnumExtractor().extract({"enum": [1, True, 1, "1", [1], [1]]}) == [1, True, "1", [1]]
+
+
+def test_extract_caches_results_by_schema_identity():
+    extractor = EnumExtractor()
+    schema = {"oneOf": [{"enum": ["a", "b"]}]}
+
+    first = extractor.extract(schema)
+    first.append("c")
+    schema["oneOf"].append({"enum": ["d"]})
+
+    # The cached result is returned as a new list and the schema is not walked again
+    assert extractor.extract(schema) == ["a", "b"]
+    assert extractor.extract({"oneOf": [{"enum": ["a", "b"]}, {"enum": ["d"]}]}) == ["a", "b", "d"]
+
+
+def test_galaxy_xml_tool_extract_enum_extends_the_list():
+    tool = GalaxyXmlTool(name="tool", id="tool", version="1.0.0", description="tool")
+    enum_values = []
+
+    tool.extract_enum({"allOf": [{"enum": ["x", "y"]}, {"enum": ["y"]}]}, enum_values)
+
+    assert enum_values == ["x", "y"]
@@ -1,10 +1,11 @@
-import math
 import pytest
 
 # from pprint import pprint
 from unittest.mock import MagicMock, patch
 
+from GeneratorXML.api_path_index import ApiPathIndex
 from GeneratorXML.galaxyxml_creator import GalaxyXmlTool
+from GeneratorXML.process_ir import DataParamNode, OutputNode, ProcessIR
 
 
 @pytest.fixture
@@ -18,7 +19,6 @@ def setup_tool():
     tool.gxtp = MagicMock()
 
     tool.executable = "test_executable"
-    tool.executable_dict = {}
 
     tool.gxtp.Inputs = MagicMock()
     tool.gxtp.Inputs.return_value.params = []
@@ -419,25 +419,20 @@ def test_create_data_param_is_array(setup_tool):
         "title": "Image-list of operands to the mathematical expression.",
     }
     description = param_dict.get("description")
-    title = param_dict.get("title")
     param_extended_schema = param_dict.get("extended-schema")
     tool = setup_tool
     is_nullable = param_extended_schema.get("nullable", False)
     is_array = param_extended_schema.get("type") == "array"
 
-    param = tool.create_data_param(
-        param_name=param_name,
-        param_extended_schema=param_extended_schema,
-        is_nullable=is_nullable,
-        is_array=is_array,
-        title=title,
-        description=description,
-    )
+    inputs = tool.create_params(input_schema={param_name: param_dict}, output_schema={}, transmission_schema=[])
+    param = inputs.params[0]
+    assert tool.process_ir.inputs[0].is_array is is_array
     tool.gxtp.DataParam.assert_called_with(
         name=param_name,
-        label=title,
-        help=f"{description} The following data types are allowed in the txt file: tiff, jpeg, png",
-        format="txt",
+        label=param_name,
+        help=f"{description} The following data types are allowed in the txt file: tiff, jpeg, png. "
+        "Datasets of type tiff, jpg, png are sent directly.",
+        format="txt,tiff,jpg,png",
         optional=is_nullable,
     )
     assert param == tool.gxtp.DataParam.return_value
@@ -496,20 +491,15 @@ def test_create_data_param_nullable(setup_tool):
     is_nullable = param_extended_schema.get("nullable", False)
     is_array = param_extended_schema.get("type") == "array"
 
-    param = tool.create_data_param(
-        param_name=param_name,
-        param_extended_schema=param_extended_schema,
-        is_nullable=is_nullable,
-        is_array=is_array,
-        title=title,
-        description=description,
-    )
+    inputs = tool.create_params(input_schema={param_name: param_dict}, output_schema={}, transmission_schema=[])
+    param = inputs.params[0]
+    assert tool.process_ir.inputs[0].is_array is is_array
     tool.gxtp.DataParam.assert_called_with(
         name="b",
-        label="Complex Input",
-        help=f"{description} The following data types are allowed in the txt file: xml, json",
+        label="b",
+        help=f"{title} {description} The following data types are allowed in the txt file: xml, json",
         format="txt",
-        optional=True,
+        optional=is_nullable,
     )
     assert param == tool.gxtp.DataParam.return_value
 
@@ -566,20 +556,15 @@ def test_create_data_param(setup_tool):
     is_nullable = param_extended_schema.get("nullable", False)
     is_array = param_extended_schema.get("type") == "array"
 
-    param = tool.create_data_param(
-        param_name=param_name,
-        param_extended_schema=param_extended_schema,
-        is_nullable=is_nullable,
-        is_array=is_array,
-        title=title,
-        description=description,
-    )
+    inputs = tool.create_params(input_schema={param_name: param_dict}, output_schema={}, transmission_schema=[])
+    param = inputs.params[0]
+    assert tool.process_ir.inputs[0].is_array is is_array
     tool.gxtp.DataParam.assert_called_with(
         name="b",
-        label="Complex Input",
-        help=f"{description} The following data types are allowed in the txt file: xml, json",
+        label="b",
+        help=f"{title} {description} The following data types are allowed in the txt file: xml, json",
         format="txt",
-        optional=False,
+        optional=is_nullable,
     )
     assert param == tool.gxtp.DataParam.return_value
 
@@ -623,19 +608,14 @@ def test_create_object_param(setup_tool):
     tool.create_array_param = MagicMock()
     section_mock = MagicMock()
     tool.create_section = MagicMock(return_value=section_mock)
-    tool.get_array_items = MagicMock(return_value=(4, 6))
-    tool.remove_duplicate = MagicMock(side_effect=lambda x: list(dict.fromkeys(x)))
+    tool.choose_prefer = MagicMock()
+    tool.create_select_raw_param = MagicMock()
 
-    result = tool.create_object_param(
-        param_name=param_name,
-        param_schema=param_schema,
-        is_nullable=is_nullable,
-        title=title,
-        description=description,
-    )
+    inputs = tool.create_params(input_schema={param_name: param_dict}, output_schema={}, transmission_schema=[])
+    result = inputs.params[0]
 
     # Assert create_section is called with the correct arguments
-    tool.create_section.assert_called_once_with(name=param_name, title=title, description=description)
+    tool.create_section.assert_called_once_with(name=param_name, title=param_name, description=f"{title} {description}")
 
     # Assert SelectParam is called correctly for the string field
     tool.gxtp.SelectParam.assert_called_once_with(
@@ -668,37 +648,6 @@ def test_create_object_param(setup_tool):
     assert result == section_mock
 
 
-def test_get_array_items(setup_tool):
-    tool = setup_tool
-    # Test case 1: Empty constraints
-    schema = {"oneOf": []}
-    assert tool.get_array_items(schema) == (math.inf, -math.inf)
-
-    # Test case 2: Single constraint with minItems and maxItems
-    schema = {"oneOf": [{"minItems": 2, "maxItems": 5}]}
-    assert tool.get_array_items(schema) == (2, 5)
-
-    # Test case 3: Multiple constraints
-    schema = {"oneOf": [{"minItems": 1, "maxItems": 4}, {"minItems": 3, "maxItems": 6}]}
-    assert tool.get_array_items(schema) == (1, 6)
-
-    # Test case 4: Constraints with only minItems
-    schema = {"oneOf": [{"minItems": 2}, {"minItems": 4}]}
-    assert tool.get_array_items(schema) == (2, -math.inf)
-
-    # Test case 5: Constraints with only maxItems
-    schema = {"oneOf": [{"maxItems": 5}, {"maxItems": 7}]}
-    assert tool.get_array_items(schema) == (math.inf, 7)
-
-    # Test case 6: Constraints with minItems and one maxItems
-    schema = {"oneOf": [{"minItems": 2}, {"minItems": 1, "maxItems": 3}, {"minItems": 4}]}
-    assert tool.get_array_items(schema) == (1, 3)
-
-    # Test case 7: Constraints with maxItems and no minItems
-    schema = {"oneOf": [{"maxItems": 4}, {"maxItems": 2}, {"maxItems": 5}]}
-    assert tool.get_array_items(schema) == (math.inf, 5)
-
-
 def test_create_array_param_number(setup_tool):
     tool = setup_tool
     tool.create_float_param = MagicMock(return_value="float_param")
@@ -921,11 +870,11 @@ def test_create_output_param(setup_tool):
 
     tool = setup_tool
 
-    tool.replace_dot_with_underscore = MagicMock(side_effect=lambda x: x.replace(".", "_"))
-    mock_enum_values = ["image/tiff", "image/jpeg", "image/png"]
-    tool.process_output_param = MagicMock(return_value=(MagicMock(), mock_enum_values))
+    tool.create_select_param_from_types = MagicMock()
     tool.create_section = MagicMock(return_value=MagicMock())
     tool.choose_transmission_mode = MagicMock()
+    tool.choose_prefer = MagicMock()
+    tool.create_select_raw_param = MagicMock()
 
     output_schema = {
         "out": {
@@ -1001,74 +950,12 @@ def test_create_output_param(setup_tool):
     }
     transmission_schema = ["value", "reference"]
 
-    inputs = []
-    tool.create_output_param(output_schema, inputs, transmission_schema)
-
-    # Verify that replace_dot_with_underscore was called
-    tool.replace_dot_with_underscore.assert_called_once_with("out")
+    inputs = tool.create_params(input_schema={}, output_schema=output_schema, transmission_schema=transmission_schema)
 
-    # Verify that process_output_param was called with the correct arguments
-    tool.process_output_param.assert_called_once_with(
-        output_param_name="outputType_out",
-        param_extended_schema={
-            "oneOf": [
-                {
-                    "allOf": [
-                        {"$ref": "http://zoo-project.org/dl/link.json"},
-                        {
-                            "properties": {"type": {"enum": ["image/tiff", "image/jpeg", "image/png"]}},
-                            "type": "object",
-                        },
-                    ]
-                },
-                {
-                    "properties": {
-                        "value": {
-                            "oneOf": [
-                                {
-                                    "contentEncoding": "base64",
-                                    "contentMediaType": "image/tiff",
-                                    "type": "string",
-                                },
-                                {
-                                    "contentEncoding": "base64",
-                                    "contentMediaType": "image/jpeg",
-                                    "type": "string",
-                                },
-                                {
-                                    "contentEncoding": "base64",
-                                    "contentMediaType": "image/png",
-                                    "type": "string",
-                                },
-                            ]
-                        }
-                    },
-                    "required": ["value"],
-                    "type": "object",
-                },
-            ]
-        },
-        param_schema={
-            "oneOf": [
-                {
-                    "contentEncoding": "base64",
-                    "contentMediaType": "image/tiff",
-                    "type": "string",
-                },
-                {
-                    "contentEncoding": "base64",
-                    "contentMediaType": "image/jpeg",
-                    "type": "string",
-                },
-                {
-                    "contentEncoding": "base64",
-                    "contentMediaType": "image/png",
-                    "type": "string",
-                },
-            ]
-        },
-        param_type=None,
-        enum_values=[],
+    # Verify that the format parameter offers the media types of the extended schema
+    tool.create_select_param_from_types.assert_called_once_with(
+        param_name="outputType_out",
+        media_types=["image/tiff", "image/jpeg", "image/png"],
         title="out",
         description="Output image which is the result of the mathematical expressions on input image-list operands.",
     )
@@ -1087,212 +974,50 @@ def test_create_output_param(setup_tool):
     )
 
     # Verify that the section was appended to inputs
-    assert tool.create_section.return_value in inputs
-    assert len(inputs) == 1
+    assert inputs.params == [tool.create_section.return_value]
+    tool.create_section.return_value.append.assert_called_once_with(tool.create_select_param_from_types.return_value)
 
-    # Verify the updates to output_type_dictionary and output_name_list
-    assert tool.output_type_dictionary == {"outputType_out": ["image/tiff", "image/jpeg", "image/png"]}
-    assert tool.output_name_list == ["out"]
+    # Verify the output kept for define_output_options, define_command and define_tests
+    assert [(node.name, node.media_types) for node in tool.process_ir.outputs] == [
+        ("out", ("image/tiff", "image/jpeg", "image/png"))
+    ]
 
 
-def test_create_process_output_param(setup_tool):
+def test_create_output_param_with_enum(setup_tool):
     tool = setup_tool
-
-    mock = MagicMock()
-    tool.create_select_param_output = MagicMock(return_value=mock)
-
+    tool.create_select_param = MagicMock()
+    tool.choose_prefer = MagicMock()
+    tool.create_select_raw_param = MagicMock()
     output_schema = {
-        "out": {
-            "description": "Output image which is the result of the mathematical "
-            "expressions on input image-list operands.",
-            "extended-schema": {
-                "oneOf": [
-                    {
-                        "allOf": [
-                            {"$ref": "http://zoo-project.org/dl/link.json"},
-                            {
-                                "properties": {
-                                    "type": {
-                                        "enum": [
-                                            "image/tiff",
-                                            "image/jpeg",
-                                            "image/png",
-                                        ]
-                                    }
-                                },
-                                "type": "object",
-                            },
-                        ]
-                    },
-                    {
-                        "properties": {
-                            "value": {
-                                "oneOf": [
-                                    {
-                                        "contentEncoding": "base64",
-                                        "contentMediaType": "image/tiff",
-                                        "type": "string",
-                                    },
-                                    {
-                                        "contentEncoding": "base64",
-                                        "contentMediaType": "image/jpeg",
-                                        "type": "string",
-                                    },
-                                    {
-                                        "contentEncoding": "base64",
-                                        "contentMediaType": "image/png",
-                                        "type": "string",
-                                    },
-                                ]
-                            }
-                        },
-                        "required": ["value"],
-                        "type": "object",
-                    },
-                ]
-            },
-            "schema": {
-                "oneOf": [
-                    {
-                        "contentEncoding": "base64",
-                        "contentMediaType": "image/tiff",
-                        "type": "string",
-                    },
-                    {
-                        "contentEncoding": "base64",
-                        "contentMediaType": "image/jpeg",
-                        "type": "string",
-                    },
-                    {
-                        "contentEncoding": "base64",
-                        "contentMediaType": "image/png",
-                        "type": "string",
-                    },
-                ]
-            },
-            "title": "Output image which is the result of the mathematical " "expressions on input image-list operands.",
+        "format": {
+            "description": "The format of the result",
+            "schema": {"type": "string", "enum": ["text/plain", "application/json"], "default": "text/plain"},
+            "title": "Format",
         }
     }
 
-    param, enum_values = tool.process_output_param(
-        output_param_name="outputType_out",
-        param_extended_schema=output_schema["out"]["extended-schema"],
-        param_schema=output_schema["out"]["schema"],
-        param_type=None,
-        enum_values=[],
-        title="out",
-        description=output_schema["out"]["description"],
-    )
+    tool.create_params(input_schema={}, output_schema=output_schema, transmission_schema=["value"])
 
-    tool.create_select_param_output.assert_called_once_with(
-        param_name="outputType_out",
-        param_extended_schema={
-            "oneOf": [
-                {
-                    "allOf": [
-                        {"$ref": "http://zoo-project.org/dl/link.json"},
-                        {
-                            "properties": {"type": {"enum": ["image/tiff", "image/jpeg", "image/png"]}},
-                            "type": "object",
-                        },
-                    ]
-                },
-                {
-                    "properties": {
-                        "value": {
-                            "oneOf": [
-                                {
-                                    "contentEncoding": "base64",
-                                    "contentMediaType": "image/tiff",
-                                    "type": "string",
-                                },
-                                {
-                                    "contentEncoding": "base64",
-                                    "contentMediaType": "image/jpeg",
-                                    "type": "string",
-                                },
-                                {
-                                    "contentEncoding": "base64",
-                                    "contentMediaType": "image/png",
-                                    "type": "string",
-                                },
-                            ]
-                        }
-                    },
-                    "required": ["value"],
-                    "type": "object",
-                },
-            ]
-        },
-        title="out",
-        description=("Output image which is the result of the mathematical " "expressions on input image-list operands."),
+    tool.create_select_param.assert_called_once_with(
+        param_name="outputType_format",
+        param_schema={"enum": ["text/plain", "application/json"], "default": "text/plain"},
+        is_nullable=False,
+        param_type_bool=False,
+        title="format",
+        description="Format The format of the result",
     )
-    assert enum_values == ["image/tiff", "image/jpeg", "image/png"]
-    assert param == tool.create_select_param_output.return_value
-
+    assert tool.process_ir.outputs[0].media_types == ("text/plain", "application/json")
 
-def test_create_select_param_output(setup_tool):
 
-    param_name = "outputType_out"
-    param_extended_schema = (
-        {
-            "oneOf": [
-                {
-                    "allOf": [
-                        {"$ref": "http://zoo-project.org/dl/link.json"},
-                        {
-                            "properties": {"type": {"enum": ["image/tiff", "image/jpeg", "image/png"]}},
-                            "type": "object",
-                        },
-                    ]
-                },
-                {
-                    "properties": {
-                        "value": {
-                            "oneOf": [
-                                {
-                                    "contentEncoding": "base64",
-                                    "contentMediaType": "image/tiff",
-                                    "type": "string",
-                                },
-                                {
-                                    "contentEncoding": "base64",
-                                    "contentMediaType": "image/jpeg",
-                                    "type": "string",
-                                },
-                                {
-                                    "contentEncoding": "base64",
-                                    "contentMediaType": "image/png",
-                                    "type": "string",
-                                },
-                            ]
-                        }
-                    },
-                    "required": ["value"],
-                    "type": "object",
-                },
-            ]
-        },
-    )
+def test_create_select_param_from_types(setup_tool):
     title = "out"
     description = "Output image which is the result of the mathematical " "expressions on input image-list operands."
 
     tool = setup_tool
 
-    # Mock the extract_enum method to return the enum values
-    tool.extract_enum = MagicMock()
-
-    # Define the behavior of the MagicMock object
-    def extract_enum_mock(schema_item=param_extended_schema, enum_values=[]):
-        enum_values.extend(["image/tiff", "image/jpeg", "image/png"])
-
-    # Assign the MagicMock object's side_effect to the defined behavior
-    tool.extract_enum.side_effect = extract_enum_mock
-    # enum_values = []
-
-    result = tool.create_select_param_output(
-        param_name=param_name,
-        param_extended_schema=param_extended_schema,
+    result = tool.create_select_param_from_types(
+        param_name="outputType_out",
+        media_types=["image/tiff", "image/jpeg", "image/png"],
         title=title,
         description=description,
     )
@@ -1311,10 +1036,10 @@ def test_create_params(setup_tool):
     tool.create_select_param = MagicMock()
     tool.create_text_param = MagicMock()
     tool.create_integer_param = MagicMock()
-    tool.create_data_param = MagicMock()
+    tool.create_data_param_from_types = MagicMock()
     tool.choose_prefer = MagicMock()
     tool.create_select_raw_param = MagicMock()
-    tool.create_output_param = MagicMock()
+    tool.create_select_param_from_types = MagicMock()
     input_schema = {
         "exp": {
             "description": "The muParser mathematical expression to apply on " "input images.",
@@ -1491,14 +1216,14 @@ def test_create_params(setup_tool):
 
     tool.create_text_param.assert_called_once_with(
         param_name="exp",
-        param_schema={"type": "string"},
+        param_schema={"default": None},
         is_nullable=False,
         title="exp",
         description="The muParser mathematical expression to apply on input images.",
     )
     tool.create_integer_param.assert_called_once_with(
         param_name="ram",
-        param_schema={"default": 256, "nullable": True, "type": "integer"},
+        param_schema={"default": 256},
         is_nullable=True,
         title="ram",
         description="Available memory for processing (in MB).",
@@ -1509,7 +1234,6 @@ def test_create_params(setup_tool):
         param_schema={
             "default": "float",
             "enum": ["uint8", "uint16", "int16", "int32", "float", "double"],
-            "type": "string",
         },
         is_nullable=False,
         param_type_bool=False,
@@ -1517,74 +1241,28 @@ def test_create_params(setup_tool):
         description="Output image which is the result of the mathematical expressions on input image list operands.",
     )
 
-    tool.create_data_param.assert_called_once_with(
+    tool.create_data_param_from_types.assert_called_once_with(
         param_name="il",
-        param_extended_schema={
-            "type": "array",
-            "minItems": 1,
-            "maxItems": 1024,
-            "items": {
-                "oneOf": [
-                    {
-                        "allOf": [
-                            {"$ref": "http://zoo-project.org/dl/link.json"},
-                            {
-                                "type": "object",
-                                "properties": {
-                                    "type": {
-                                        "enum": [
-                                            "image/tiff",
-                                            "image/jpeg",
-                                            "image/png",
-                                        ]
-                                    }
-                                },
-                            },
-                        ]
-                    },
-                    {
-                        "type": "object",
-                        "required": ["value"],
-                        "properties": {
-                            "value": {
-                                "oneOf": [
-                                    {
-                                        "type": "string",
-                                        "contentEncoding": "base64",
-                                        "contentMediaType": "image/tiff",
-                                    },
-                                    {
-                                        "type": "string",
-                                        "contentEncoding": "base64",
-                                        "contentMediaType": "image/jpeg",
-                                    },
-                                    {
-                                        "type": "string",
-                                        "contentEncoding": "base64",
-                                        "contentMediaType": "image/png",
-                                    },
-                                ]
-                            }
-                        },
-                    },
-                ]
-            },
-        },
+        media_types=["image/tiff", "image/jpeg", "image/png"],
         is_nullable=False,
-        is_array=True,
         title="il",
         description="Image list of operands to the mathematical expression.",
     )
+    assert tool.process_ir.inputs[1].is_array is True
     tool.choose_prefer.assert_called_once_with(inputs=results)
 
     tool.create_select_raw_param.assert_called_once_with(inputs=results)
 
-    # Verify that create_output_param was called with the correct arguments
-    tool.create_output_param.assert_called_once_with(
-        output_schema=output_schema,
-        inputs=results,
-        transmission_schema=transmission_schema,
+    # The output gets a section with its format and transmission mode after the inputs
+    tool.create_select_param_from_types.assert_called_once_with(
+        param_name="outputType_out",
+        media_types=["image/tiff", "image/jpeg", "image/png"],
+        title="out",
+        description="Output image which is the result of the mathematical expressions on input image list operands.",
     )
+    assert len(results.params) == 5
+    assert [node.name for node in tool.process_ir.outputs] == ["out"]
+    assert tool.process_ir.transmission_modes == ("value", "reference")
 
 
 def test_create_params_2(setup_tool):
@@ -1593,11 +1271,10 @@ def test_create_params_2(setup_tool):
     tool.create_select_param = MagicMock()
     tool.create_text_param = MagicMock()
     tool.create_float_param = MagicMock()
-    tool.create_data_param = MagicMock()
-    tool.create_object_param = MagicMock()
+    tool.create_data_param_from_types = MagicMock()
+    tool.create_array_param = MagicMock()
     tool.choose_prefer = MagicMock()
     tool.create_select_raw_param = MagicMock()
-    tool.create_output_param = MagicMock()
 
     input_schema = {
         "a": {
@@ -1778,87 +1455,46 @@ def test_create_params_2(setup_tool):
 
     tool.create_text_param.assert_called_once_with(
         param_name="a",
-        param_schema={"nullable": True, "type": "string"},
+        param_schema={"default": None},
         is_nullable=True,
         title="a",
         description="Literal Input (string) An input string",
     )
 
-    tool.create_data_param.assert_called_once_with(
+    tool.create_data_param_from_types.assert_called_once_with(
         param_name="b",
-        param_extended_schema={
-            "nullable": True,
-            "oneOf": [
-                {
-                    "allOf": [
-                        {"$ref": "http://zoo-project.org/dl/link.json"},
-                        {
-                            "properties": {"type": {"enum": ["text/xml", "application/json"]}},
-                            "type": "object",
-                        },
-                    ]
-                },
-                {
-                    "properties": {
-                        "value": {
-                            "oneOf": [
-                                {
-                                    "contentEncoding": "utf-8",
-                                    "contentMediaType": "text/xml",
-                                    "type": "string",
-                                },
-                                {"type": "object"},
-                            ]
-                        }
-                    },
-                    "required": ["value"],
-                    "type": "object",
-                },
-            ],
-        },
+        media_types=["text/xml", "application/json"],
         is_nullable=True,
-        is_array=False,
         title="b",
         description="Complex Input A complex input ",
     )
-    tool.create_object_param.assert_called_once_with(
-        param_name="c",
+    assert tool.process_ir.inputs[1].is_array is False
+
+    # The object input becomes a section with one parameter per required field
+    tool.gxtp.Section.assert_any_call(name="c", title="c", help="BoundingBox Input  A boundingbox input ", expanded=True)
+    tool.create_select_param.assert_any_call(
+        param_name="crs",
         param_schema={
-            "nullable": True,
-            "properties": {
-                "bbox": {
-                    "items": {"format": "double", "type": "number"},
-                    "oneOf": [
-                        {"maxItems": 4, "minItems": 4},
-                        {"maxItems": 6, "minItems": 6},
-                    ],
-                    "type": "array",
-                },
-                "crs": {
-                    "default": "urn:ogc:def:crs:EPSG:6.6:4326",
-                    "enum": [
-                        "urn:ogc:def:crs:EPSG:6.6:4326",
-                        "urn:ogc:def:crs:EPSG:6.6:3785",
-                    ],
-                    "format": "uri",
-                    "type": "string",
-                },
-            },
-            "required": ["bbox", "crs"],
-            "type": "object",
+            "default": "urn:ogc:def:crs:EPSG:6.6:4326",
+            "enum": ["urn:ogc:def:crs:EPSG:6.6:4326", "urn:ogc:def:crs:EPSG:6.6:3785"],
         },
         is_nullable=True,
-        title="c",
-        description="BoundingBox Input  A boundingbox input ",
+        param_type_bool=False,
+        title="crs",
+        description="",
+    )
+    tool.create_array_param.assert_called_once_with(
+        name="bbox",
+        item_type="number",
+        min_items=4,
+        max_items=6,
+        item_name="numberData",
+        title=None,
+        description=None,
     )
     tool.create_float_param.assert_called_once_with(
         param_name="pause",
-        param_schema={
-            "default": 10.0,
-            "format": "double",
-            "nullable": True,
-            "type": "number",
-        },
+        param_schema={"default": 10.0},
         is_nullable=True,
         title="pause",
         description=(
@@ -1867,9 +1503,9 @@ def test_create_params_2(setup_tool):
         ),
     )
 
-    tool.create_select_param.assert_called_once_with(
+    tool.create_select_param.assert_any_call(
         param_name="MATCH",
-        param_schema={"type": "boolean", "default": False, "enum": ["true", "false"], "nullable": True},
+        param_schema={"default": False, "enum": ["true", "false"]},
         is_nullable=True,
         param_type_bool=True,
         title="MATCH",
@@ -1880,23 +1516,17 @@ def test_create_params_2(setup_tool):
 
     tool.create_select_raw_param.assert_called_once_with(inputs=results)
 
-    # Verify that create_output_param was called with the correct arguments
-    tool.create_output_param.assert_called_once_with(
-        output_schema=output_schema,
-        inputs=results,
-        transmission_schema=transmission_schema,
+    # Only the output with media types gets a format parameter
+    assert [(node.name, node.format_choice) for node in tool.process_ir.outputs] == [
+        ("a", None),
+        ("b", "media_type"),
+        ("c", None),
+    ]
+    tool.gxtp.Section.assert_any_call(
+        name="OutputSection_a", title="Select the appropriate transmission mode for a", help=None, expanded=True
     )
 
 
-def test_replace_dot_with_underscore(setup_tool):
-    tool = setup_tool
-    assert tool.replace_dot_with_underscore("example.test") == "example_test"
-    assert tool.replace_dot_with_underscore("another.test.case") == "another_test_case"
-    assert tool.replace_dot_with_underscore("no_dots_here") == "no_dots_here"
-    assert tool.replace_dot_with_underscore("") == ""
-    assert tool.replace_dot_with_underscore("only.one.dot.") == "only_one_dot_"
-
-
 def test_find_index(setup_tool):
     tool = setup_tool
     # Test case 1: Pattern found in string
@@ -1940,13 +1570,16 @@ def test_define_command_with_title(setup_tool):
     tool = setup_tool
     # Test case 1: Basic command definition with title
     title = "test_command"
-    expected_command = "test_executable name test_command"
+    expected_command = "test_executable name test_command  processVersion @TOOL_VERSION@"
     assert tool.define_command(title) == expected_command
 
-    # Test case 2: Command definition with additional parameters
-    tool.executable_dict["param1"] = "value1"
-    tool.executable_dict["param2"] = "value2"
-    expected_command = "test_executable name test_command  param1 value1  param2 value2"
+    # Test case 2: The array flags of the data inputs and the output datasets come first
+    tool.process_ir = ProcessIR(
+        inputs=(DataParamNode(name="il", is_array=True),), outputs=(OutputNode(name="out"),), transmission_modes=()
+    )
+    expected_command = (
+        "test_executable isArrayil True  output_data_out $output_data_out  name test_command  processVersion @TOOL_VERSION@"
+    )
     assert tool.define_command(title) == expected_command
 
 
@@ -1955,18 +1588,27 @@ def test_define_macro(setup_tool):
 
     # Create a mock generator
     mock_generator = MagicMock()
-    # Use patch to replace MacrosXMLGenerator with our mock
-    with patch("GeneratorXML.galaxyxml_creator.MacrosXMLGenerator", return_value=mock_generator):
-        # Call the method to test
-        tool.define_macro()
+    tool.macros_generator = mock_generator
+    # Call the method to test
+    tool.define_macro()
 
     # Check if add_token was called with correct arguments
     mock_generator.add_token.assert_any_call("@TOOL_VERSION@", "1.0.0")
     mock_generator.add_token.assert_any_call("@VERSION_SUFFIX@", "0")
 
-    # Check if generate_xml was called with the correct filename
+    # The macros file is only written by commit_macros
+    mock_generator.commit.assert_not_called()
+    mock_generator.generate_xml.assert_not_called()
+
+
+def test_commit_macros(setup_tool):
+    tool = setup_tool
+    tool.macros_generator = MagicMock()
+
+    tool.commit_macros()
+
     expected_file_path = f"Tools/{tool.macros_file_name}"
-    mock_generator.generate_xml.assert_called_once_with(filename=expected_file_path)
+    tool.macros_generator.commit.assert_called_once_with(filename=expected_file_path)
 
 
 def test_define_tests_without_valid_examples(setup_tool):
@@ -1992,7 +1634,7 @@ def test_define_tests_without_valid_examples(setup_tool):
     tool.gxtp.TestParam = MagicMock()
     tool.gxtp.TestOutput = MagicMock()
 
-    tool.output_name_list = ["test"]
+    tool.process_ir = ProcessIR(inputs=(), outputs=(OutputNode(name="test"),), transmission_modes=())
 
     # Call the method under test
     result = tool.define_tests(api_dict, process)
@@ -2087,6 +1729,11 @@ def test_process_test_output_params(setup_tool):
         param = call_args[0][0]  # Extract the first argument passed to append
         assert isinstance(param, MagicMock)  # Ensure it's a TestOutput mock object
 
+    # The macros are collected in memory instead of being written one by one
+    macros = tool.macros_generator.root.findall("xml")
+    assert [macro.get("name") for macro in macros] == ["file_inputs_output12", "file_inputs_output22"]
+    assert [macro.find("output").get("ftype") for macro in macros] == ["json", "png"]
+
 
 def test_create_tests(setup_tool):
     tool = setup_tool
@@ -2203,3 +1850,23 @@ def test_define_tests_with_valid_example(setup_tool):
     tool.get_test_dictionary.assert_called_once_with(api_dict=api_dict, process=process)
     tool.get_test_examples.assert_called_once_with(data=api_dict)
     tool.create_tests.assert_called_with(examples=example_list)
+
+
+def test_define_tests_with_path_index(setup_tool):
+    tool = setup_tool
+    example = {"inputs": {"exp": "im1b1"}, "outputs": {}, "response": "document"}
+    api_dict = {
+        "/processes/OTB.BandMath/execution": {
+            "post": {"requestBody": {"content": {"application/json": {"examples": {"ex": {"value": example}}}}}}
+        }
+    }
+    path_index = ApiPathIndex(paths=api_dict)
+    tool.get_test_dictionary = MagicMock()
+    tool.create_tests = MagicMock()
+
+    result = tool.define_tests(api_dict, "OTB.BandMath", path_index=path_index)
+
+    # The index replaces the scan over all paths
+    tool.get_test_dictionary.assert_not_called()
+    tool.create_tests.assert_called_once_with(examples=[example])
+    assert result == tool.create_tests.return_value
@@ -0,0 +1,197 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Tools", "Code")))
+
+from Tools.Code.http_client import HttpClient
+
+FILE_CONTENT = bytes(range(256)) * 40
+
+
+class JobServerStandInHandler(BaseHTTPRequestHandler):
+    """
+    Keep-alive stand-in for the ZOO-Project server. "/flaky" fails once with 503 and "/file" serves
+    a small binary file. "/dropping" drops the connection halfway through the first response and
+    supports Range requests, "/dropping-no-range" does the same but ignores Range headers and
+    "/truncated" always drops the connection halfway through.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.record()
+        self.server.range_headers.append(self.headers.get("Range"))
+        first_request = self.server.requests.count(("GET", self.path)) == 1
+        if self.path == "/flaky" and first_request:
+            self.respond(503, b"")
+        elif self.path in ("/flaky", "/status"):
+            self.respond(200, b'{"status": "running"}')
+        elif self.path == "/file":
+            self.respond(200, FILE_CONTENT)
+        elif self.path in ("/dropping", "/dropping-no-range") and first_request or self.path == "/truncated":
+            self.drop_connection()
+        elif self.path == "/dropping" and self.headers.get("Range"):
+            start = int(self.headers["Range"][len("bytes=") : -1])
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(FILE_CONTENT) - 1}/{len(FILE_CONTENT)}")
+            self.send_header("Content-Length", str(len(FILE_CONTENT) - start))
+            self.end_headers()
+            self.wfile.write(FILE_CONTENT[start:])
+        elif self.path == "/dropping-no-range":
+            self.respond(200, FILE_CONTENT)
+        else:
+            self.respond(404, b"")
+
+    def drop_connection(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(FILE_CONTENT)))
+        self.end_headers()
+        self.wfile.write(FILE_CONTENT[: len(FILE_CONTENT) // 2])
+        self.close_connection = True
+
+    def do_POST(self):
+        self.record()
+        self.respond(503, b"")
+
+    def record(self):
+        self.server.requests.append((self.command, self.path))
+        self.server.client_ports.add(self.client_address[1])
+
+    def respond(self, status_code, body):
+        self.send_response(status_code)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def job_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), JobServerStandInHandler)
+    server.requests = []
+    server.client_ports = set()
+    server.range_headers = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client():
+    client = HttpClient(retries=2, backoff_factor=0)
+    yield client
+    client.close()
+
+
+def get_url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def test_get_reuses_connection(job_server, client):
+    for _ in range(3):
+        assert client.get(get_url(job_server, "/status")).json() == {"status": "running"}
+
+    assert len(job_server.client_ports) == 1
+
+
+def test_get_is_retried(job_server, client):
+    response = client.get(get_url(job_server, "/flaky"))
+
+    assert response.status_code == 200
+    assert job_server.requests == [("GET", "/flaky"), ("GET", "/flaky")]
+
+
+def test_post_is_not_retried(job_server, client):
+    response = client.post(get_url(job_server, "/execute"), json={})
+
+    assert response.status_code == 503
+    assert job_server.requests == [("POST", "/execute")]
+
+
+def test_download(job_server, client, tmp_path):
+    file_path = tmp_path / "output.dat"
+
+    client.download(get_url(job_server, "/file"), str(file_path))
+
+    assert file_path.read_bytes() == FILE_CONTENT
+    assert os.listdir(tmp_path) == ["output.dat"]
+
+
+def test_download_keeps_mode_of_existing_file(job_server, client, tmp_path):
+    file_path = tmp_path / "output.dat"
+    file_path.write_bytes(b"")
+    file_path.chmod(0o640)
+
+    client.download(get_url(job_server, "/file"), str(file_path))
+
+    assert file_path.stat().st_mode & 0o777 == 0o640
+
+
+def test_download_missing_file(job_server, client, tmp_path):
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.download(get_url(job_server, "/missing"), str(tmp_path / "output.dat"))
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_download_resumes_with_range(job_server, client, tmp_path):
+    file_path = tmp_path / "output.dat"
+
+    client.download(get_url(job_server, "/dropping"), str(file_path), chunk_size=256)
+
+    assert file_path.read_bytes() == FILE_CONTENT
+    assert job_server.range_headers == [None, f"bytes={len(FILE_CONTENT) // 2}-"]
+
+
+def test_download_restarts_if_range_is_ignored(job_server, client, tmp_path):
+    file_path = tmp_path / "output.dat"
+
+    client.download(get_url(job_server, "/dropping-no-range"), str(file_path), chunk_size=256)
+
+    assert file_path.read_bytes() == FILE_CONTENT
+
+
+def test_download_gives_up_after_max_resumes(job_server, client, tmp_path):
+    file_path = tmp_path / "output.dat"
+
+    with pytest.raises(requests.exceptions.RequestException):
+        client.download(get_url(job_server, "/truncated"), str(file_path), chunk_size=256, max_resumes=2)
+
+    assert job_server.requests.count(("GET", "/truncated")) == 3
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize(
+    "headers, offset, expected",
+    [
+        ({"Content-Length": "100"}, 0, 100),
+        ({"Content-Length": "60"}, 40, 100),
+        ({"Content-Range": "bytes 40-99/100", "Content-Length": "60"}, 40, 100),
+        ({"Content-Range": "bytes 40-99/*", "Content-Length": "60"}, 40, 100),
+        ({}, 0, None),
+    ],
+)
+def test_get_content_length(headers, offset, expected):
+    response = requests.Response()
+    response.headers.update(headers)
+
+    assert HttpClient.get_content_length(response, offset) == expected
+
+
+def test_get_timeout():
+    client = HttpClient(connect_timeout=5.0, read_timeout=30.0)
+
+    assert client.get_timeout() == (5.0, 30.0)
+    assert client.get_timeout(read_timeout=600.0) == (5.0, 600.0)
+    assert client.get_timeout(read_timeout=None) == (5.0, None)
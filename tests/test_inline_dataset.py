@@ -0,0 +1,115 @@
+import base64
+import json
+
+import pytest
+import requests
+
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Tools", "Code")))
+
+from Tools.Code.inline_dataset import InlineDataset, JsonPayloadStream
+
+TIFF_CONTENT = b"II*\x00" + bytes(range(256)) * 100
+
+
+@pytest.fixture
+def tiff_file(tmp_path):
+    file_path = tmp_path / "dataset_1.dat"
+    file_path.write_bytes(TIFF_CONTENT)
+    return str(file_path)
+
+
+def read_all(stream, block_size):
+    blocks = []
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            return b"".join(blocks)
+        blocks.append(block)
+
+
+@pytest.mark.parametrize(
+    "content, media_type",
+    [
+        (b"II*\x00rest", "image/tiff"),
+        (b"MM\x00*rest", "image/tiff"),
+        (b"\x89PNG\r\n\x1a\nrest", "image/png"),
+        (b"\xff\xd8\xff\xe0rest", "image/jpeg"),
+        (b"http://geolabs.fr/dl/Landsat8Extract1.tif\n", None),
+        (b"", None),
+    ],
+)
+def test_sniff_media_type(tmp_path, content, media_type):
+    file_path = tmp_path / "dataset.dat"
+    file_path.write_bytes(content)
+
+    assert InlineDataset.sniff_media_type(str(file_path)) == media_type
+
+
+def test_sniff_media_type_missing_file(tmp_path):
+    assert InlineDataset.sniff_media_type(str(tmp_path / "missing.dat")) is None
+
+
+def test_iter_encoded_in_chunks(tiff_file, monkeypatch):
+    monkeypatch.setattr(InlineDataset, "chunk_size", 3 * 100)
+    dataset = InlineDataset(tiff_file, "image/tiff")
+
+    chunks = list(dataset.iter_encoded())
+
+    assert len(chunks) == 86
+    assert all(len(chunk) == 400 for chunk in chunks[:-1])
+    assert b"".join(chunks) == base64.b64encode(TIFF_CONTENT)
+    assert dataset.get_encoded_size() == len(base64.b64encode(TIFF_CONTENT))
+
+
+def test_iter_encoded_empty_file(tmp_path):
+    file_path = tmp_path / "empty.dat"
+    file_path.write_bytes(b"")
+
+    assert list(InlineDataset(str(file_path), "image/tiff").iter_encoded()) == []
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 8192, -1])
+def test_payload_stream(tiff_file, block_size):
+    payload = {
+        "inputs": {"il": [InlineDataset(tiff_file, "image/tiff")], "exp": "im1b1"},
+        "response": "document",
+    }
+    stream = JsonPayloadStream(payload)
+
+    body = read_all(stream, block_size)
+
+    assert len(body) == len(stream)
+    assert json.loads(body) == {
+        "inputs": {
+            "il": [{"mediaType": "image/tiff", "encoding": "base64", "value": base64.b64encode(TIFF_CONTENT).decode()}],
+            "exp": "im1b1",
+        },
+        "response": "document",
+    }
+
+
+def test_payload_stream_without_datasets():
+    payload = {"inputs": {"exp": "im1b1"}, "response": "document"}
+    stream = JsonPayloadStream(payload)
+
+    assert stream.read() == json.dumps(payload).encode()
+    assert stream.read() == b""
+
+
+def test_payload_stream_rejects_other_objects():
+    with pytest.raises(TypeError):
+        JsonPayloadStream({"inputs": {"value": object()}})
+
+
+def test_payload_stream_is_sent_with_content_length(tiff_file):
+    stream = JsonPayloadStream({"inputs": {"il": InlineDataset(tiff_file, "image/tiff")}})
+
+    request = requests.Request("POST", "https://ospd.geolabs.fr:8300/ogc-api/processes/OTB.BandMath/execution", data=stream)
+    prepared = request.prepare()
+
+    assert prepared.headers["Content-Length"] == str(len(stream))
+    assert "Transfer-Encoding" not in prepared.headers
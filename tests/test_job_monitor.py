@@ -0,0 +1,156 @@
+import os
+import sys
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Tools", "Code")))
+
+from Tools.Code.job_monitor import JobMonitor
+from Tools.Code.polling_strategy import JobTimeoutError, PollingStrategy
+
+
+class FakeJobServer:
+    """
+    Stand-in for the job endpoints of the OGC API. Each job reports its statuses in turn and then
+    keeps the last one. The `/jobs` list endpoint responds with 404 unless `supports_list` is set.
+    """
+
+    def __init__(self, jobs, supports_list=True, list_errors=()):
+        self.jobs = {job_id: list(statuses) for job_id, statuses in jobs.items()}
+        self.supports_list = supports_list
+        self.list_errors = list(list_errors)
+        self.lock = threading.Lock()
+        self.requests = []
+
+    def get(self, url, headers):
+        path = url.split("/ogc-api/")[1]
+        with self.lock:
+            self.requests.append(path)
+            if path == "jobs":
+                if not self.supports_list:
+                    return self.create_response(404, {})
+                if self.list_errors:
+                    return self.create_response(self.list_errors.pop(0), {})
+                return self.create_response(
+                    200, {"jobs": [{"jobID": job_id, "status": self.next_status(job_id)} for job_id in self.jobs]}
+                )
+            job_id = path.split("/")[1]
+            if job_id not in self.jobs:
+                raise requests.exceptions.ConnectionError("unreachable")
+            return self.create_response(200, {"jobID": job_id, "status": self.next_status(job_id)})
+
+    def next_status(self, job_id):
+        statuses = self.jobs[job_id]
+        return statuses.pop(0) if len(statuses) > 1 else statuses[0]
+
+    @staticmethod
+    def create_response(status_code, data):
+        response = Mock(status_code=status_code, ok=status_code < 400, headers={})
+        response.json.return_value = data
+        if status_code >= 400:
+            response.raise_for_status.side_effect = requests.exceptions.HTTPError(f"{status_code} Error")
+        return response
+
+
+def create_monitor(server, timeout=60.0, **kwargs):
+    return JobMonitor(
+        http_client=server,
+        polling_strategy=PollingStrategy(initial_interval=0.01, max_interval=0.01, timeout=timeout),
+        max_requests_per_second=kwargs.pop("max_requests_per_second", 1000.0),
+        **kwargs,
+    )
+
+
+def test_register_polls_job_until_finished():
+    server = FakeJobServer({"job-1": ["accepted", "running", "successful"]})
+    with create_monitor(server) as monitor:
+        future = monitor.register("job-1")
+        assert future.result(timeout=5) == "successful"
+    assert server.requests == ["jobs/job-1"] * 3
+    assert monitor.jobs == {}
+
+
+def test_job_list_fetches_many_statuses_in_one_request():
+    server = FakeJobServer({f"job-{index}": ["running", "running", "successful"] for index in range(5)})
+    with create_monitor(server) as monitor:
+        # Register all jobs before the first round
+        with monitor.condition:
+            futures = [monitor.register(f"job-{index}") for index in range(5)]
+        assert [future.result(timeout=5) for future in futures] == ["successful"] * 5
+    assert server.requests == ["jobs"] * 3
+
+
+def test_job_list_not_supported_falls_back_to_individual_requests(capsys):
+    server = FakeJobServer({"job-1": ["running", "successful"], "job-2": ["failed"]}, supports_list=False)
+    with create_monitor(server) as monitor:
+        with monitor.condition:
+            futures = [monitor.register("job-1"), monitor.register("job-2")]
+        assert [future.result(timeout=5) for future in futures] == ["successful", "failed"]
+    assert monitor.use_job_list is False
+    assert server.requests.count("jobs") == 1
+    assert "polling every job individually" in capsys.readouterr().err
+
+
+def test_job_list_is_requested_again_after_server_errors(capsys):
+    jobs = {"job-1": ["running", "running", "running", "successful"], "job-2": ["running", "running", "running", "failed"]}
+    server = FakeJobServer(jobs, list_errors=[503, 429])
+    with create_monitor(server) as monitor:
+        with monitor.condition:
+            futures = [monitor.register("job-1"), monitor.register("job-2")]
+        assert [future.result(timeout=5) for future in futures] == ["successful", "failed"]
+    assert monitor.use_job_list is True
+    # The jobs are polled individually in the two rounds the list fails, and through the list afterwards
+    assert server.requests[:6] == ["jobs", "jobs/job-1", "jobs/job-2", "jobs", "jobs/job-1", "jobs/job-2"]
+    assert server.requests[6:] == ["jobs", "jobs"]
+    assert "polling every job individually" not in capsys.readouterr().err
+
+
+def test_callback_receives_finished_future():
+    server = FakeJobServer({"job-1": ["running", "successful"]})
+    finished = []
+    with create_monitor(server, use_job_list=False) as monitor:
+        future = monitor.register("job-1", callback=finished.append)
+        future.result(timeout=5)
+    assert finished == [future]
+
+
+def test_job_that_does_not_finish_times_out():
+    server = FakeJobServer({"job-1": ["running"]})
+    with create_monitor(server, timeout=0.05) as monitor:
+        future = monitor.register("job-1")
+        with pytest.raises(JobTimeoutError, match="job-1"):
+            future.result(timeout=5)
+
+
+def test_failed_status_request_is_retried(capsys):
+    server = FakeJobServer({"job-1": ["successful"]})
+    with create_monitor(server, timeout=0.2, use_job_list=False) as monitor:
+        future = monitor.register("job-2")
+        with pytest.raises(JobTimeoutError):
+            future.result(timeout=5)
+    assert server.requests.count("jobs/job-2") > 1
+    assert "Failed to get the status of job job-2: unreachable" in capsys.readouterr().err
+
+
+def test_status_requests_share_the_request_budget():
+    server = FakeJobServer({f"job-{index}": ["running", "successful"] for index in range(3)})
+    start = time.monotonic()
+    with create_monitor(server, use_job_list=False, max_requests_per_second=50.0) as monitor:
+        futures = [monitor.register(f"job-{index}") for index in range(3)]
+        for future in futures:
+            future.result(timeout=5)
+    # Six status requests at most 50 per second
+    assert len(server.requests) == 6
+    assert time.monotonic() - start >= 5 / 50.0
+
+
+def test_register_after_close_fails():
+    monitor = create_monitor(FakeJobServer({}))
+    monitor.close()
+    with pytest.raises(RuntimeError):
+        monitor.register("job-1")
@@ -45,3 +45,51 @@ def test_generate_xml(mock_element_tree):
 
         # Assertions
         mock_element_tree.write.assert_called_once_with(filename)
+
+
+def test_add_macro():
+    generator = MacrosXMLGenerator()
+
+    generator.add_macro(name="output_data_out", ftype="tiff", macro_name="file_inputs_out0")
+
+    macro = generator.root.find('xml[@name="file_inputs_out0"]')
+    output = macro.find("output")
+    assert output.get("name") == "output_data_out"
+    assert output.get("ftype") == "tiff"
+    assert output.find("assert_contents/has_n_lines").get("n") == "1"
+
+
+def test_commit_writes_once(tmp_path):
+    generator = MacrosXMLGenerator()
+    filename = tmp_path / "macros.xml"
+    generator.add_token("@TOOL_VERSION@", "1.0.0")
+    for index in range(3):
+        generator.add_macro(name="output_data_out", ftype="txt", macro_name=f"file_inputs_out{index}")
+
+    with patch.object(generator, "generate_xml", wraps=generator.generate_xml) as generate_xml:
+        generator.commit(str(filename))
+        # Nothing changed since the last commit, so the file is not written again
+        generator.commit(str(filename))
+
+    generate_xml.assert_called_once_with(str(filename))
+    root = ET.parse(filename).getroot()
+    assert len(root.findall("token")) == 1
+    assert len(root.findall("xml")) == 3
+
+
+def test_commit_matches_create_macro_file(tmp_path):
+    incremental_file = tmp_path / "incremental.xml"
+    generator = MacrosXMLGenerator()
+    generator.add_token("@TOOL_VERSION@", "1.0.0")
+    generator.generate_xml(str(incremental_file))
+    for index in range(2):
+        generator.create_macro_file(str(incremental_file), "output_data_out", "txt", f"file_inputs_out{index}")
+
+    single_pass_file = tmp_path / "single_pass.xml"
+    single_pass = MacrosXMLGenerator()
+    single_pass.add_token("@TOOL_VERSION@", "1.0.0")
+    for index in range(2):
+        single_pass.add_macro("output_data_out", "txt", f"file_inputs_out{index}")
+    single_pass.commit(str(single_pass_file))
+
+    assert single_pass_file.read_text() == incremental_file.read_text()
@@ -1,8 +1,18 @@
+import json
+
 import pytest
 import requests_mock
 
-from unittest.mock import patch, mock_open, MagicMock
-from main import GalaxyToolConverter, main
+from unittest.mock import ANY, patch, mock_open, MagicMock
+from main import (
+    GalaxyToolConverter,
+    fetch_process_descriptions,
+    main,
+    main_batch,
+    write_snapshot,
+    parse_arguments,
+    read_process_ids,
+)
 
 
 @pytest.fixture
@@ -157,10 +167,8 @@ def mock_api_data():
 def mock_galaxy_tool_converter():
     with patch("main.GalaxyToolConverter") as MockGalaxyToolConverter:
         instance = MockGalaxyToolConverter.return_value
-        instance.retrieve_json.side_effect = [
-            {"data": "collections_data"},  # Mock return for first call
-            {"data": "api_data"},  # Mock return for second call
-        ]
+        instance.retrieve_process_json.return_value = {"data": "collections_data"}
+        instance.retrieve_api_json.return_value = {"data": "api_data"}
         instance.json_to_galaxyxml = MagicMock()
         yield instance
 
@@ -201,7 +209,8 @@ def test_json_to_galaxyxml(mock_collections_data_2, mock_api_data):
         '    <requirement version="2.31.0" type="package">requests</requirement>\n'
         "  </requirements>\n"
         "  <version_command><![CDATA[interpreter filename.exe --version]]></version_command>\n"
-        "  <command><![CDATA[$__tool_directory__/Code/create_api_json.py output_data_Result $output_data_Result  name hellor S "
+        "  <command><![CDATA[$__tool_directory__/Code/create_api_json.py output_data_Result $output_data_Result  name hellor  "
+        "processVersion @TOOL_VERSION@ S "
         "'$S'\n"
         "prefer $Section_prefer.prefer\n"
         "response $Section_response.response\n"
@@ -266,8 +275,10 @@ def test_json_to_galaxyxml(mock_collections_data_2, mock_api_data):
         init.json_to_galaxyxml(process_data=mock_collections_data_2, api_data=mock_api_data)
 
         # Assert that open was called with the correct file path and write was called with the expected XML
-        mock_open_function.assert_called_with(f"Tools/{mock_collections_data_2['id']}.xml", "w")
-        written_xml = mock_file_handle.write.call_args[0][0].strip()  # Get the written XML and strip whitespace
+        mock_open_function.assert_called_with(f"Tools/{mock_collections_data_2['id']}.xml", "wb")
+        # The tool XML is streamed in binary pieces, the macros file is written as text to the same mock handle
+        written_chunks = [call.args[0] for call in mock_file_handle.write.call_args_list if isinstance(call.args[0], bytes)]
+        written_xml = b"".join(written_chunks).decode("utf-8").strip()
         assert written_xml == expected_xml, f"Expected:\n{expected_xml}\n\nActual:\n{written_xml}"
 
 
@@ -278,8 +289,243 @@ def test_main(mock_galaxy_tool_converter):
     main(base_url, process_name)
 
     # Assertions
-    mock_galaxy_tool_converter.retrieve_json.assert_any_call(url=f"{base_url}processes/{process_name}")
-    mock_galaxy_tool_converter.retrieve_json.assert_any_call(url=f"{base_url}api")
+    mock_galaxy_tool_converter.retrieve_process_json.assert_called_once_with(base_url=base_url, process_name=process_name)
+    mock_galaxy_tool_converter.retrieve_api_json.assert_called_once_with(url=f"{base_url}api")
     mock_galaxy_tool_converter.json_to_galaxyxml.assert_called_once_with(
         process_data={"data": "collections_data"}, api_data={"data": "api_data"}
     )
+
+
+def test_read_process_ids(tmp_path):
+    process_file = tmp_path / "processes.txt"
+    process_file.write_text("OTB.BandMath\n\nhellor\n")
+
+    assert read_process_ids(str(process_file)) == ["OTB.BandMath", "hellor"]
+
+
+def test_main_batch(mock_galaxy_tool_converter, tmp_path):
+    base_url = "https://ospd.geolabs.fr:8300/ogc-api/"
+    process_file = tmp_path / "processes.txt"
+    process_file.write_text("OTB.BandMath\nhellor\n")
+    mock_galaxy_tool_converter.retrieve_process_json.side_effect = lambda base_url, process_name: {"data": process_name}
+
+    timings = main_batch(base_url, str(process_file), manifest_path=None)
+
+    # The API document is retrieved only once for the whole batch
+    assert mock_galaxy_tool_converter.retrieve_process_json.call_count == 2
+    mock_galaxy_tool_converter.retrieve_api_json.assert_called_once_with(url=f"{base_url}api")
+    mock_galaxy_tool_converter.json_to_galaxyxml.assert_any_call(
+        process_data={"data": "hellor"}, api_data={"data": "api_data"}, path_index=ANY
+    )
+    assert sorted((name, status) for name, _, status in timings) == [("OTB.BandMath", "ok"), ("hellor", "ok")]
+
+
+def test_main_batch_continues_after_failure(mock_galaxy_tool_converter, tmp_path):
+    base_url = "https://ospd.geolabs.fr:8300/ogc-api/"
+    process_file = tmp_path / "processes.txt"
+    process_file.write_text("missing\nhellor\n")
+    mock_galaxy_tool_converter.retrieve_process_json.side_effect = lambda base_url, process_name: (
+        None if process_name == "missing" else {"data": "hellor"}
+    )
+
+    timings = main_batch(base_url, str(process_file), manifest_path=None)
+
+    mock_galaxy_tool_converter.json_to_galaxyxml.assert_called_once_with(
+        process_data={"data": "hellor"}, api_data={"data": "api_data"}, path_index=ANY
+    )
+    assert sorted((name, status) for name, _, status in timings) == [("hellor", "ok"), ("missing", "failed")]
+
+
+def test_parse_arguments():
+    assert parse_arguments(["--process", "OTB.BandMath"]).process == "OTB.BandMath"
+    assert parse_arguments(["--process-file", "ids.txt"]).process_file == "ids.txt"
+    assert parse_arguments(["--process-file", "ids.txt", "--workers", "16"]).workers == 16
+    assert parse_arguments(["--snapshot", "snapshot"]).snapshot == "snapshot"
+    assert parse_arguments(["--write-snapshot", "snapshot"]).write_snapshot == "snapshot"
+    with pytest.raises(SystemExit):
+        parse_arguments(["--process", "OTB.BandMath", "--process-file", "ids.txt"])
+    with pytest.raises(SystemExit):
+        parse_arguments(["--snapshot", "snapshot", "--write-snapshot", "snapshot"])
+    with pytest.raises(SystemExit):
+        parse_arguments([])
+
+
+def test_fetch_process_descriptions(tmp_path):
+    base_url = "https://ospd.geolabs.fr:8300/ogc-api/"
+    process_ids = [f"Process{index}" for index in range(20)]
+    with requests_mock.Mocker() as m:
+        for process_id in process_ids:
+            m.get(f"{base_url}processes/{process_id}", json={"id": process_id})
+        m.get(f"{base_url}processes/missing", status_code=404)
+        workflow = GalaxyToolConverter(cache_dir=str(tmp_path), pool_size=4)
+
+        results = list(
+            fetch_process_descriptions(
+                workflow=workflow, base_url=base_url, process_ids=process_ids + ["missing"], workers=4
+            )
+        )
+
+    descriptions = {process_id: process_data for process_id, process_data, _ in results}
+    assert descriptions == {**{process_id: {"id": process_id} for process_id in process_ids}, "missing": None}
+
+
+def test_converter_session_pool_size(tmp_path):
+    workflow = GalaxyToolConverter(cache_dir=str(tmp_path), pool_size=16)
+
+    adapter = workflow.session.get_adapter("https://ospd.geolabs.fr:8300/ogc-api/")
+    assert adapter._pool_maxsize == 16
+
+
+def test_converter_param_cache_is_opt_in(tmp_path):
+    assert GalaxyToolConverter(cache_dir=str(tmp_path)).param_cache is None
+    assert GalaxyToolConverter(cache_dir=str(tmp_path), param_cache=True).param_cache is not None
+    assert parse_arguments(["--process-file", "ids.txt"]).param_cache is False
+    assert parse_arguments(["--process-file", "ids.txt", "--param-cache"]).param_cache is True
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, mock_collections_data_2):
+    processes_dir = tmp_path / "snapshot" / "processes"
+    processes_dir.mkdir(parents=True)
+    (processes_dir / "hellor.json").write_text(json.dumps(mock_collections_data_2))
+    (tmp_path / "snapshot" / "api.json").write_text(json.dumps({"paths": {}}))
+    return str(tmp_path / "snapshot")
+
+
+def test_main_batch_from_snapshot(snapshot_dir, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "Tools" / "Macros").mkdir(parents=True)
+
+    with requests_mock.Mocker() as m:
+        timings = main_batch("https://ospd.geolabs.fr:8300/ogc-api/", None, snapshot_dir=snapshot_dir)
+
+        # No request reaches the server in snapshot mode
+        assert m.call_count == 0
+    assert [(name, status) for name, _, status in timings] == [("hellor", "ok")]
+    assert (tmp_path / "Tools" / "hellor.xml").exists()
+
+
+def test_retrieve_process_json_from_snapshot(snapshot_dir, mock_collections_data_2, tmp_path):
+    workflow = GalaxyToolConverter(cache_dir=str(tmp_path), snapshot_dir=snapshot_dir)
+
+    assert workflow.retrieve_process_json(base_url="unused", process_name="hellor") == mock_collections_data_2
+    assert workflow.retrieve_process_json(base_url="unused", process_name="missing") is None
+    assert workflow.retrieve_api_json(url="unused") == {"paths": {}}
+
+
+def test_write_snapshot():
+    with patch("main.ProcessCrawler") as MockProcessCrawler:
+        MockProcessCrawler.return_value.run.return_value = {"hellor": True, "missing": False}
+
+        results = write_snapshot("https://ospd.geolabs.fr:8300/ogc-api/", "snapshot", process_ids=["hellor", "missing"])
+
+    MockProcessCrawler.assert_called_once_with(
+        base_url="https://ospd.geolabs.fr:8300/ogc-api/", snapshot_dir="snapshot", concurrency=8, requests_per_second=None
+    )
+    MockProcessCrawler.return_value.run.assert_called_once_with(process_ids=["hellor", "missing"])
+    assert results == {"hellor": True, "missing": False}
+
+
+def test_write_snapshot_passes_rate_limit():
+    with patch("main.ProcessCrawler") as MockProcessCrawler:
+        MockProcessCrawler.return_value.run.return_value = {}
+
+        write_snapshot("https://ospd.geolabs.fr:8300/ogc-api/", "snapshot", requests_per_second=2.5)
+
+    assert MockProcessCrawler.call_args.kwargs["requests_per_second"] == 2.5
+    assert parse_arguments(["--write-snapshot", "snapshot", "--requests-per-second", "2.5"]).requests_per_second == 2.5
+
+
+def test_write_snapshot_reports_crawl_failure(capsys):
+    with patch("main.ProcessCrawler") as MockProcessCrawler:
+        MockProcessCrawler.return_value.run.side_effect = RuntimeError("Failed to retrieve the process list")
+
+        results = write_snapshot("https://ospd.geolabs.fr:8300/ogc-api/", "snapshot")
+
+    assert results is None
+    assert "Failed to write the snapshot: Failed to retrieve the process list" in capsys.readouterr().err
+
+
+def test_main_batch_skips_unchanged_tools(snapshot_dir, mock_collections_data_2, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "Tools" / "Macros").mkdir(parents=True)
+    base_url = "https://ospd.geolabs.fr:8300/ogc-api/"
+    manifest_path = str(tmp_path / "manifest.json")
+
+    first = main_batch(base_url, None, snapshot_dir=snapshot_dir, manifest_path=manifest_path)
+    second = main_batch(base_url, None, snapshot_dir=snapshot_dir, manifest_path=manifest_path)
+    forced = main_batch(base_url, None, snapshot_dir=snapshot_dir, manifest_path=manifest_path, force=True)
+
+    assert [status for _, _, status in first] == ["ok"]
+    assert [status for _, _, status in second] == ["unchanged"]
+    assert [status for _, _, status in forced] == ["ok"]
+
+    # A changed description or a missing output regenerates the tool
+    mock_collections_data_2["version"] = "2.0.1"
+    (tmp_path / "snapshot" / "processes" / "hellor.json").write_text(json.dumps(mock_collections_data_2))
+    changed = main_batch(base_url, None, snapshot_dir=snapshot_dir, manifest_path=manifest_path)
+    (tmp_path / "Tools" / "hellor.xml").unlink()
+    missing = main_batch(base_url, None, snapshot_dir=snapshot_dir, manifest_path=manifest_path)
+
+    assert [status for _, _, status in changed] == ["ok"]
+    assert [status for _, _, status in missing] == ["ok"]
+
+
+def test_main_batch_regenerates_missing_test_input(snapshot_dir, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "Tools" / "Macros").mkdir(parents=True)
+    example = {"inputs": {"S": {"href": "http://example.org/name.txt"}}, "outputs": {}, "response": "document"}
+    path_entry = {"post": {"requestBody": {"content": {"application/json": {"examples": {"a": {"value": example}}}}}}}
+    (tmp_path / "snapshot" / "api.json").write_text(json.dumps({"paths": {"/processes/hellor/execution": path_entry}}))
+    base_url = "https://ospd.geolabs.fr:8300/ogc-api/"
+    manifest_path = str(tmp_path / "manifest.json")
+    test_input = tmp_path / "Tools" / "test-data" / "hellor_test_input.txt"
+
+    first = main_batch(base_url, None, snapshot_dir=snapshot_dir, manifest_path=manifest_path)
+    assert test_input.exists()
+    assert (
+        "Tools/test-data/hellor_test_input.txt"
+        in json.loads((tmp_path / "manifest.json").read_text())["tools"]["hellor"]["outputs"]
+    )
+    test_input.unlink()
+    second = main_batch(base_url, None, snapshot_dir=snapshot_dir, manifest_path=manifest_path)
+
+    assert [status for _, _, status in first] == ["ok"]
+    assert [status for _, _, status in second] == ["ok"]
+    assert test_input.exists()
+
+
+def test_main_batch_with_process_pool(snapshot_dir, mock_collections_data_2, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "Tools" / "Macros").mkdir(parents=True)
+    processes_dir = tmp_path / "snapshot" / "processes"
+    for process_id in ["hellor2", "hellor3"]:
+        (processes_dir / f"{process_id}.json").write_text(json.dumps({**mock_collections_data_2, "id": process_id}))
+    (processes_dir / "broken.json").write_text(json.dumps({"id": "broken"}))
+
+    timings = main_batch("https://ospd.geolabs.fr:8300/ogc-api/", None, snapshot_dir=snapshot_dir, jobs=2)
+
+    assert sorted((name, status) for name, _, status in timings) == [
+        ("broken", "failed"),
+        ("hellor", "ok"),
+        ("hellor2", "ok"),
+        ("hellor3", "ok"),
+    ]
+    for process_id in ["hellor", "hellor2", "hellor3"]:
+        assert (tmp_path / "Tools" / f"{process_id}.xml").exists()
+        assert (tmp_path / "Tools" / "Macros" / f"{process_id}_macros_.xml").exists()
+    # Errors of the workers are collected by the parent
+    assert "Failed to convert broken: KeyError('version')" in capsys.readouterr().err
+
+
+def test_main_batch_shuts_down_process_pool_on_error(snapshot_dir, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with patch("main.ProcessPoolExecutor") as mock_executor, patch(
+        "main.fetch_process_descriptions", side_effect=RuntimeError("aborted")
+    ):
+        with pytest.raises(RuntimeError):
+            main_batch("https://ospd.geolabs.fr:8300/ogc-api/", None, snapshot_dir=snapshot_dir, manifest_path=None, jobs=2)
+
+    # The workers are spawned, not forked from a process with running threads
+    assert mock_executor.call_args.kwargs["mp_context"].get_start_method() == "spawn"
+    mock_executor.return_value.shutdown.assert_called_once_with(cancel_futures=True)
@@ -0,0 +1,100 @@
+from lxml import etree
+
+import galaxyxml.tool.parameters as gtpx
+
+from GeneratorXML.galaxyxml_creator import GalaxyXmlTool
+from GeneratorXML.param_cache import ParamCache
+from GeneratorXML.process_ir import CommandLineEmitter, GalaxyXmlEmitter, ProcessIRBuilder
+
+RAM_INPUT = {
+    "title": "Available RAM (MB)",
+    "description": "Available memory for processing (in MB)",
+    "schema": {"type": "integer", "default": 256, "nullable": True},
+}
+
+RASTER_INPUT = {
+    "title": "Input image",
+    "description": "Input image",
+    "schema": {"oneOf": [{"type": "string", "contentEncoding": "base64", "contentMediaType": "image/tiff"}]},
+    "extended-schema": {
+        "type": "array",
+        "items": {"oneOf": [{"properties": {"type": {"enum": ["image/tiff", "image/png"]}}, "type": "object"}]},
+    },
+}
+
+
+def create_tool(name):
+    return GalaxyXmlTool(name=name, id=name.lower(), version="1.0.0", description=name)
+
+
+def test_get_and_put_count_hits_and_misses():
+    cache = ParamCache()
+    param = gtpx.IntegerParam(name="ram", label="ram", value=256)
+
+    assert cache.get("key") is None
+    cache.put("key", param)
+    cached_param = cache.get("key")
+
+    assert etree.tostring(cached_param.node) == etree.tostring(param.node)
+    assert cached_param is not param
+    assert (cache.hits, cache.misses, cache.hit_rate) == (1, 1, 0.5)
+
+
+def test_least_recently_used_entry_is_dropped():
+    cache = ParamCache(max_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, gtpx.TextParam(name=key))
+    cache.get("a")
+    cache.put("c", gtpx.TextParam(name="c"))
+
+    assert list(cache.entries) == ["a", "c"]
+
+
+def test_zero_entries_disables_the_cache():
+    cache = ParamCache(max_entries=0)
+    cache.put("a", gtpx.TextParam(name="a"))
+
+    assert len(cache) == 0
+    assert cache.get("a") is None
+
+
+def test_clone_param_copies_the_subtree():
+    conditional = gtpx.Conditional(name="cond_ram", label="ram")
+    conditional.append(gtpx.SelectParam(name="select_ram", options={"yes": "yes", "no": "no"}, default="yes"))
+    when_yes = gtpx.When(value="yes")
+    when_yes.append(gtpx.IntegerParam(name="ram", label="ram", value=256))
+    conditional.append(when_yes)
+    inputs = gtpx.Inputs()
+    inputs.append(conditional)
+
+    clone = ParamCache.clone_param(conditional)
+
+    assert clone.parent is None
+    assert etree.tostring(clone.node) == etree.tostring(conditional.node)
+    assert [child.parent for child in clone.children] == [clone, clone]
+    assert clone.children[1].children[0].node.getparent() is clone.children[1].node
+    clone.children[1].children[0].node.set("value", "512")
+    assert when_yes.children[0].node.get("value") == "256"
+
+
+def test_cached_params_match_fresh_params():
+    cache = ParamCache()
+    process = {
+        "id": "OTB.BandMath",
+        "version": "1.0.0",
+        "title": "Band Math",
+        "inputs": {"ram": RAM_INPUT, "in": RASTER_INPUT},
+        "outputs": {},
+        "outputTransmission": [],
+    }
+
+    fresh_ir = ProcessIRBuilder().build(process)
+    fresh_xml = etree.tostring(GalaxyXmlEmitter(gxt=create_tool("OTB.BandMath")).emit_inputs(fresh_ir).node)
+    for name in ("OTB.BandMath", "OTB.Smoothing"):
+        tool = create_tool(name)
+        process_ir = ProcessIRBuilder().build({**process, "id": name})
+
+        assert etree.tostring(GalaxyXmlEmitter(gxt=tool, param_cache=cache).emit_inputs(process_ir).node) == fresh_xml
+        # The isArray flags are part of the IR, so a cached parameter needs no replay
+        assert CommandLineEmitter(gxt=tool).get_arguments(process_ir)["isArrayin"] is True
+    assert (cache.hits, cache.misses) == (2, 2)
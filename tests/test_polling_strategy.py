@@ -0,0 +1,99 @@
+import pytest
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import patch
+
+import sys
+import os
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Tools", "Code")))
+
+from Tools.Code.polling_strategy import PollingStrategy
+
+
+def test_get_interval_grows_up_to_max_interval():
+    strategy = PollingStrategy(initial_interval=1.0, max_interval=5.0, multiplier=2.0, timeout=None)
+    strategy.start()
+
+    assert [strategy.get_interval(attempt) for attempt in range(5)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+
+def test_get_interval_uses_retry_after():
+    strategy = PollingStrategy(initial_interval=1.0, max_interval=5.0, timeout=None)
+    strategy.start()
+
+    assert strategy.get_interval(0, retry_after="12") == 12.0
+    assert strategy.get_interval(0, retry_after="soon") == 1.0
+
+
+def test_get_interval_does_not_exceed_remaining_time():
+    strategy = PollingStrategy(initial_interval=10.0, timeout=3.0)
+    with patch("time.monotonic", return_value=100.0):
+        strategy.start()
+    with patch("time.monotonic", return_value=101.0):
+        assert strategy.get_interval(0) == pytest.approx(2.0)
+        assert strategy.get_interval(0, retry_after="60") == pytest.approx(2.0)
+
+
+def test_is_expired():
+    strategy = PollingStrategy(timeout=3.0)
+    with patch("time.monotonic", return_value=100.0):
+        strategy.start()
+        assert not strategy.is_expired()
+    with patch("time.monotonic", return_value=103.0):
+        assert strategy.is_expired()
+
+
+def test_is_expired_without_timeout():
+    strategy = PollingStrategy(timeout=None)
+    strategy.start()
+
+    assert not strategy.is_expired()
+
+
+def test_parse_retry_after_seconds():
+    assert PollingStrategy.parse_retry_after(" 7 ") == 7.0
+
+
+def test_parse_retry_after_http_date():
+    retry_date = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+    seconds = PollingStrategy.parse_retry_after(format_datetime(retry_date, usegmt=True))
+
+    assert 25.0 <= seconds <= 30.0
+
+
+def test_parse_retry_after_date_in_the_past():
+    assert PollingStrategy.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_parse_retry_after_invalid():
+    assert PollingStrategy.parse_retry_after(None) is None
+    assert PollingStrategy.parse_retry_after("") is None
+    assert PollingStrategy.parse_retry_after("later") is None
+
+
+def test_from_environment(monkeypatch):
+    monkeypatch.setenv("OGC_POLL_INITIAL_INTERVAL", "5")
+    monkeypatch.setenv("OGC_POLL_TIMEOUT", "600")
+
+    strategy = PollingStrategy.from_environment(initial_interval=30.0, max_interval=300.0)
+
+    assert (strategy.initial_interval, strategy.max_interval, strategy.multiplier, strategy.timeout) == (
+        5.0,
+        300.0,
+        1.5,
+        600.0,
+    )
+
+
+def test_from_environment_without_timeout(monkeypatch):
+    monkeypatch.setenv("OGC_POLL_TIMEOUT", "0")
+    monkeypatch.delenv("OGC_POLL_INITIAL_INTERVAL", raising=False)
+
+    strategy = PollingStrategy.from_environment()
+
+    assert strategy.timeout is None
+    assert strategy.initial_interval == 1.0
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from GeneratorXML.process_crawler import HostRateLimiter, ProcessCrawler
+from GeneratorXML.process_snapshot import ProcessSnapshot
+
+
+class ZooStandInHandler(BaseHTTPRequestHandler):
+    """
+    Serves the GetCapabilities list, the API document and process descriptions like the
+    ZOO-Project OGC API. "Flaky" fails once with 503, "missing" always returns 404.
+    """
+
+    documents = {
+        "/ogc-api/processes": {"processes": [{"id": "OTB.BandMath"}, {"id": "hellor"}, {"id": "Flaky"}]},
+        "/ogc-api/api": {"paths": {}},
+        "/ogc-api/processes/OTB.BandMath": {"id": "OTB.BandMath"},
+        "/ogc-api/processes/hellor": {"id": "hellor"},
+        "/ogc-api/processes/Flaky": {"id": "Flaky"},
+    }
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path == "/ogc-api/processes/Flaky" and self.server.requests.count(self.path) == 1:
+            self.send_response(503)
+            self.end_headers()
+            return
+        document = self.documents.get(self.path)
+        if document is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = json.dumps(document).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def zoo_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ZooStandInHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def get_base_url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/ogc-api/"
+
+
+def test_crawl_writes_snapshot(zoo_server, tmp_path):
+    crawler = ProcessCrawler(base_url=get_base_url(zoo_server), snapshot_dir=str(tmp_path), backoff=0.01)
+
+    results = crawler.run()
+
+    assert results == {"OTB.BandMath": True, "hellor": True, "Flaky": True}
+    assert json.loads((tmp_path / "api.json").read_text()) == {"paths": {}}
+    assert json.loads((tmp_path / "processes.json").read_text())["processes"][0] == {"id": "OTB.BandMath"}
+    for process_id in results:
+        assert json.loads((tmp_path / "processes" / f"{process_id}.json").read_text()) == {"id": process_id}
+    # The failed request was retried once
+    assert zoo_server.requests.count("/ogc-api/processes/Flaky") == 2
+
+
+def test_crawl_selected_processes(zoo_server, tmp_path):
+    crawler = ProcessCrawler(base_url=get_base_url(zoo_server), snapshot_dir=str(tmp_path), backoff=0.01)
+
+    results = crawler.run(process_ids=["hellor", "missing"])
+
+    assert results == {"hellor": True, "missing": False}
+    assert sorted(path.name for path in (tmp_path / "processes").iterdir()) == ["hellor.json"]
+    # Client errors are not retried
+    assert zoo_server.requests.count("/ogc-api/processes/missing") == 1
+
+
+def write_snapshot(snapshot, capabilities, descriptions):
+    os.makedirs(snapshot.processes_dir)
+    if capabilities is not None:
+        with open(snapshot.capabilities_path, "w") as file:
+            json.dump(capabilities, file)
+    for process_data in descriptions:
+        with open(snapshot.get_process_path(process_data["id"]), "w") as file:
+            json.dump(process_data, file)
+
+
+def test_snapshot_process_ids_keep_separators(tmp_path):
+    snapshot = ProcessSnapshot(str(tmp_path))
+    process_ids = ["hellor", f"OTB{os.sep}BandMath", "missing"]
+    descriptions = [{"id": process_id} for process_id in process_ids[:2]]
+    write_snapshot(snapshot, {"processes": [{"id": process_id} for process_id in process_ids]}, descriptions)
+
+    # Processes of the list without a description are left out
+    assert snapshot.get_process_ids() == [f"OTB{os.sep}BandMath", "hellor"]
+    assert snapshot.load_process(f"OTB{os.sep}BandMath") == {"id": f"OTB{os.sep}BandMath"}
+
+
+def test_snapshot_process_ids_from_descriptions_without_list(tmp_path):
+    snapshot = ProcessSnapshot(str(tmp_path))
+    write_snapshot(snapshot, None, [{"id": f"OTB{os.sep}BandMath"}, {"id": "hellor"}])
+
+    assert snapshot.get_process_ids() == [f"OTB{os.sep}BandMath", "hellor"]
+
+
+def test_crawl_fails_without_process_list(tmp_path):
+    crawler = ProcessCrawler(base_url="http://127.0.0.1:9/ogc-api/", snapshot_dir=str(tmp_path), retries=0)
+
+    with pytest.raises(RuntimeError):
+        crawler.run()
+
+
+def test_host_rate_limiter_spaces_requests():
+    limiter = HostRateLimiter(requests_per_second=50)
+
+    async def acquire_all():
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire("http://127.0.0.1/ogc-api/") for _ in range(5)))
+        await limiter.acquire("http://other-host/ogc-api/")
+        return time.monotonic() - start
+
+    # Five requests to one host need at least four intervals of 20 ms
+    assert asyncio.run(acquire_all()) >= 0.079
@@ -0,0 +1,183 @@
+import pytest
+from lxml import etree
+
+from GeneratorXML.galaxyxml_creator import GalaxyXmlTool
+from GeneratorXML.param_cache import ParamCache
+from GeneratorXML.process_ir import (
+    CommandLineEmitter,
+    DataParamNode,
+    GalaxyXmlEmitter,
+    NumberParamNode,
+    ObjectParamNode,
+    OutputNode,
+    ProcessIRBuilder,
+    SelectParamNode,
+    TestEmitter,
+    TextParamNode,
+)
+
+RASTER_TYPES = ["image/tiff", "image/png"]
+
+PROCESS = {
+    "id": "OTB.BandMath",
+    "version": "1.0.0",
+    "title": "Band Math",
+    "description": "Outputs a monoband image from a mathematical expression",
+    "inputs": {
+        "il": {
+            "title": "Input image list",
+            "description": "Image list to perform computation on",
+            "schema": {"oneOf": [{"type": "string", "contentMediaType": "image/tiff"}]},
+            "extended-schema": {
+                "type": "array",
+                "items": {"oneOf": [{"properties": {"type": {"enum": RASTER_TYPES}}, "type": "object"}]},
+            },
+        },
+        "mask": {
+            "title": "Mask",
+            "description": "Mask",
+            "schema": {"oneOf": [{"type": "string", "contentMediaType": "image/tiff"}]},
+            "extended-schema": {"oneOf": [{"properties": {"type": {"enum": ["image/tiff"]}}}], "nullable": True},
+        },
+        "exp": {"title": "Expression", "description": "The expression", "schema": {"type": "string", "default": "im1b1"}},
+        "ram": {
+            "title": "Available RAM (MB)",
+            "description": "Available RAM (MB)",
+            "schema": {"type": "integer", "default": 256, "nullable": True},
+        },
+        "scale": {"title": "Scale", "description": "Scale", "schema": {"type": "number", "default": 1.5}},
+        "out.type": {
+            "title": "Pixel type",
+            "description": "The pixel type",
+            "schema": {"type": "string", "enum": ["uint8", "float"], "default": "float"},
+        },
+        "verbose": {"title": "Verbose", "description": "Verbose", "schema": {"type": "boolean", "default": False}},
+        "bbox": {
+            "title": "Bounding box",
+            "description": "Bounding box",
+            "schema": {
+                "type": "object",
+                "required": ["crs", "bbox"],
+                "properties": {
+                    "crs": {"type": "string", "enum": ["EPSG:4326", "EPSG:3857"], "default": "EPSG:4326"},
+                    "bbox": {"type": "array", "oneOf": [{"minItems": 4, "maxItems": 4}], "items": {"type": "number"}},
+                },
+            },
+        },
+    },
+    "outputs": {
+        "out": {
+            "title": "Output image",
+            "description": "Output image",
+            "schema": {"oneOf": [{"type": "string", "contentMediaType": "image/tiff"}]},
+            "extended-schema": {"oneOf": [{"properties": {"type": {"enum": RASTER_TYPES}}}]},
+        },
+        "format": {
+            "title": "Format",
+            "description": "Format",
+            "schema": {"type": "string", "enum": ["text/plain", "application/json"], "default": "text/plain"},
+        },
+        "count": {"title": "Count", "description": "Count", "schema": {"type": "integer"}},
+    },
+    "outputTransmission": ["value", "reference"],
+}
+
+
+def create_tool():
+    return GalaxyXmlTool(name=PROCESS["id"], id="otb_bandmath", version=PROCESS["version"], description=PROCESS["title"])
+
+
+def test_builder_creates_one_node_per_input_and_output():
+    process_ir = ProcessIRBuilder().build(PROCESS)
+
+    assert [type(node) for node in process_ir.inputs] == [
+        DataParamNode,
+        DataParamNode,
+        TextParamNode,
+        NumberParamNode,
+        NumberParamNode,
+        SelectParamNode,
+        SelectParamNode,
+        ObjectParamNode,
+    ]
+    il, mask = process_ir.inputs[:2]
+    assert (il.is_array, il.media_types, il.nullable) == (True, tuple(RASTER_TYPES), False)
+    assert (mask.is_array, mask.media_types, mask.nullable) == (False, ("image/tiff",), True)
+    assert process_ir.inputs[5].name == "out_type"
+    assert process_ir.inputs[3].description == "Available RAM (MB)"
+    assert process_ir.inputs[2].description == "Expression The expression"
+    assert [field.name for field in process_ir.inputs[7].fields] == ["crs", "bbox"]
+    assert [(node.name, node.format_choice) for node in process_ir.outputs] == [
+        ("out", "media_type"),
+        ("format", "enum"),
+        ("count", None),
+    ]
+
+
+def test_nodes_use_slots_and_compare_by_value():
+    first = ProcessIRBuilder().build(PROCESS)
+    second = ProcessIRBuilder().build(PROCESS)
+
+    assert first == second
+    assert first.inputs[0].get_key() == second.inputs[0].get_key()
+    assert first.inputs[0].get_key() != first.inputs[1].get_key()
+    assert hash(first.inputs[0]) == hash(second.inputs[0])
+    assert len({*first.inputs, *second.inputs}) == len(first.inputs)
+    assert not hasattr(first.inputs[0], "__dict__")
+    with pytest.raises(AttributeError):
+        first.inputs[0].unknown = True
+    assert OutputNode(name="out").to_dict()["media_types"] is None
+
+
+def test_tool_methods_render_the_process_ir():
+    wrapped_tool = create_tool()
+    wrapped_inputs = wrapped_tool.create_params(
+        input_schema=PROCESS["inputs"],
+        output_schema=PROCESS["outputs"],
+        transmission_schema=PROCESS["outputTransmission"],
+    )
+    wrapped_outputs = wrapped_tool.define_output_options()
+    wrapped_command = wrapped_tool.define_command(PROCESS["id"])
+
+    tool = create_tool()
+    process_ir = ProcessIRBuilder().build(PROCESS)
+    emitter = GalaxyXmlEmitter(gxt=tool)
+
+    assert wrapped_tool.process_ir.inputs == process_ir.inputs
+    assert wrapped_tool.process_ir.outputs == process_ir.outputs
+    assert etree.tostring(emitter.emit_inputs(process_ir).node) == etree.tostring(wrapped_inputs.node)
+    assert etree.tostring(emitter.emit_outputs(process_ir).node) == etree.tostring(wrapped_outputs.node)
+    assert CommandLineEmitter(gxt=tool).emit(process_ir) == wrapped_command
+    assert CommandLineEmitter(gxt=tool).get_arguments(process_ir)["isArrayil"] is True
+
+
+def test_replace_changes_a_copy_of_the_node():
+    node = OutputNode(name="out", media_types=("image/tiff",))
+
+    changed = node.replace(name="result")
+
+    assert (changed.name, changed.media_types) == ("result", ("image/tiff",))
+    assert node.name == "out"
+
+
+def test_galaxy_xml_emitter_reuses_cached_params():
+    cache = ParamCache()
+    process_ir = ProcessIRBuilder().build(PROCESS)
+    fresh = etree.tostring(GalaxyXmlEmitter(gxt=create_tool()).emit_inputs(process_ir).node)
+
+    first = etree.tostring(GalaxyXmlEmitter(gxt=create_tool(), param_cache=cache).emit_inputs(process_ir).node)
+    second = etree.tostring(GalaxyXmlEmitter(gxt=create_tool(), param_cache=cache).emit_inputs(process_ir).node)
+
+    assert first == second == fresh
+    assert (cache.hits, cache.misses) == (8, 8)
+
+
+def test_test_emitter_creates_default_test_without_examples():
+    tool = create_tool()
+    process_ir = ProcessIRBuilder().build(PROCESS)
+
+    tests = TestEmitter(gxt=tool).emit(process_ir, examples=None)
+
+    assert etree.tostring(tests.node) == etree.tostring(
+        tool.create_default_tests(output_names=["out", "format", "count"]).node
+    )
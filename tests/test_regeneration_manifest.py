@@ -0,0 +1,73 @@
+import json
+
+from GeneratorXML.regeneration_manifest import RegenerationManifest
+
+
+def test_compute_hash_is_canonical():
+    assert RegenerationManifest.compute_hash({"a": 1, "b": [1, 2]}) == RegenerationManifest.compute_hash(
+        {"b": [1, 2], "a": 1}
+    )
+    assert RegenerationManifest.compute_hash({"a": 1}) != RegenerationManifest.compute_hash({"a": 2})
+
+
+def test_compute_generator_version(tmp_path):
+    source = tmp_path / "generator.py"
+    source.write_text("version = 1\n")
+    version = RegenerationManifest.compute_generator_version([str(source)])
+
+    source.write_text("version = 2\n")
+
+    assert RegenerationManifest.compute_generator_version([str(source)]) != version
+
+
+def test_is_up_to_date(tmp_path):
+    output = tmp_path / "tool.xml"
+    output.write_text("<tool/>")
+    manifest = RegenerationManifest(manifest_path=str(tmp_path / "manifest.json"), generator_version="v1")
+    fingerprint = manifest.get_fingerprint(process_data={"id": "hellor"}, path_entry=None)
+
+    assert not manifest.is_up_to_date("hellor", fingerprint)
+
+    manifest.update("hellor", fingerprint, [str(output)])
+
+    assert manifest.is_up_to_date("hellor", fingerprint)
+    changed = manifest.get_fingerprint(process_data={"id": "hellor"}, path_entry={"post": {}})
+    assert not manifest.is_up_to_date("hellor", changed)
+    output.unlink()
+    assert not manifest.is_up_to_date("hellor", fingerprint)
+
+
+def test_entry_of_older_format_is_not_up_to_date(tmp_path):
+    manifest = RegenerationManifest(manifest_path=str(tmp_path / "manifest.json"), generator_version="v1")
+    fingerprint = manifest.get_fingerprint(process_data={"id": "hellor"}, path_entry=None)
+    manifest.entries["hellor"] = fingerprint
+
+    assert not manifest.is_up_to_date("hellor", fingerprint)
+
+
+def test_generator_version_change_invalidates_entries(tmp_path):
+    manifest_path = str(tmp_path / "manifest.json")
+    manifest = RegenerationManifest(manifest_path=manifest_path, generator_version="v1")
+    manifest.update("hellor", manifest.get_fingerprint(process_data={"id": "hellor"}, path_entry=None))
+    manifest.save()
+
+    reloaded = RegenerationManifest(manifest_path=manifest_path, generator_version="v2")
+    fingerprint = reloaded.get_fingerprint(process_data={"id": "hellor"}, path_entry=None)
+
+    assert not reloaded.is_up_to_date("hellor", fingerprint)
+
+
+def test_save_and_remove(tmp_path):
+    manifest_path = tmp_path / "nested" / "manifest.json"
+    manifest = RegenerationManifest(manifest_path=str(manifest_path), generator_version="v1")
+    manifest.update("hellor", {"process": "a", "api": "b", "generator": "v1"}, ["Tools/hellor.xml"])
+    manifest.update("OTB.BandMath", {"process": "c", "api": "d", "generator": "v1"})
+    manifest.remove("OTB.BandMath")
+    manifest.save()
+
+    assert json.loads(manifest_path.read_text()) == {
+        "tools": {
+            "hellor": {"fingerprint": {"process": "a", "api": "b", "generator": "v1"}, "outputs": ["Tools/hellor.xml"]}
+        }
+    }
+    assert not list(manifest_path.parent.glob("*.tmp"))
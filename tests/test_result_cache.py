@@ -0,0 +1,151 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import sys
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Tools", "Code")))
+
+from Tools.Code.inline_dataset import InlineDataset
+from Tools.Code.result_cache import ResultCache
+
+EXECUTE = "processes/OTB.BandMath/execution"
+PAYLOAD = {
+    "inputs": {"exp": "im1b1+im1b2", "il": [{"href": "http://geolabs.fr/dl/Landsat8Extract1.tif"}]},
+    "outputs": {"out": {"format": {"mediaType": "image/tiff"}, "transmissionMode": "value"}},
+    "response": "document",
+}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(cache_dir=str(tmp_path / "cache"), max_size=1000)
+
+
+@pytest.fixture
+def output_files(tmp_path):
+    output_path = tmp_path / "out.dat"
+    output_path.write_bytes(b"raster" * 10)
+    return {"out": str(output_path)}
+
+
+def test_compute_key_is_canonical():
+    reordered = {"response": "document", "outputs": PAYLOAD["outputs"], "inputs": PAYLOAD["inputs"]}
+
+    assert ResultCache.compute_key(EXECUTE, "1.0.0", PAYLOAD) == ResultCache.compute_key(EXECUTE, "1.0.0", reordered)
+
+
+def test_compute_key_depends_on_process_and_version():
+    key = ResultCache.compute_key(EXECUTE, "1.0.0", PAYLOAD)
+
+    assert key != ResultCache.compute_key(EXECUTE, "1.0.1", PAYLOAD)
+    assert key != ResultCache.compute_key("processes/OTB.Other/execution", "1.0.0", PAYLOAD)
+    assert key != ResultCache.compute_key(EXECUTE, "1.0.0", {**PAYLOAD, "inputs": {"exp": "im1b1"}})
+
+
+def test_compute_key_depends_on_output_choices():
+    key = ResultCache.compute_key(EXECUTE, "1.0.0", PAYLOAD, response_input="document", transmission_mode={"out": "value"})
+
+    assert key != ResultCache.compute_key(
+        EXECUTE, "1.0.0", PAYLOAD, response_input="raw", transmission_mode={"out": "value"}
+    )
+    assert key != ResultCache.compute_key(
+        EXECUTE, "1.0.0", PAYLOAD, response_input="document", transmission_mode={"out": "reference"}
+    )
+    assert key != ResultCache.compute_key(
+        EXECUTE,
+        "1.0.0",
+        PAYLOAD,
+        response_input="document",
+        transmission_mode={"out": "value"},
+        output_formats={"out": "image/png"},
+    )
+
+
+def test_compute_key_ignores_subscriber():
+    with_subscriber = {**PAYLOAD, "subscriber": {"successUri": "http://galaxy.example.org:8765/token/successful"}}
+
+    assert ResultCache.compute_key(EXECUTE, "1.0.0", with_subscriber) == ResultCache.compute_key(EXECUTE, "1.0.0", PAYLOAD)
+
+
+def test_compute_key_hashes_inline_dataset_content(tmp_path):
+    first = tmp_path / "first.dat"
+    second = tmp_path / "second.dat"
+    third = tmp_path / "third.dat"
+    first.write_bytes(b"II*\x00same")
+    second.write_bytes(b"II*\x00same")
+    third.write_bytes(b"II*\x00other")
+
+    def compute_key(path):
+        return ResultCache.compute_key(EXECUTE, "1.0.0", {"inputs": {"in": InlineDataset(str(path), "image/tiff")}})
+
+    assert compute_key(first) == compute_key(second)
+    assert compute_key(first) != compute_key(third)
+
+
+def test_store_and_restore(cache, output_files, tmp_path):
+    cache.store("key", {"out": {"value": "raster"}}, output_files)
+    restored_path = tmp_path / "restored.dat"
+
+    result = cache.restore("key", {"out": str(restored_path)})
+
+    assert result == {"out": {"value": "raster"}}
+    assert restored_path.read_bytes() == b"raster" * 10
+    assert [name for name in os.listdir(cache.cache_dir) if name.startswith(".entry-")] == []
+
+
+def test_restore_miss(cache, tmp_path):
+    assert cache.restore("missing", {"out": str(tmp_path / "restored.dat")}) is None
+
+
+def test_restore_incomplete_entry(cache, output_files, tmp_path):
+    cache.store("key", {}, output_files)
+
+    assert cache.restore("key", {"out": str(tmp_path / "a.dat"), "mask": str(tmp_path / "b.dat")}) is None
+
+
+def test_evicts_least_recently_used(cache, tmp_path):
+    for key in ("first", "second", "third"):
+        output_path = tmp_path / f"{key}.dat"
+        output_path.write_bytes(b"x" * 400)
+        cache.store(key, {}, {"out": str(output_path)})
+        # Entries are ordered by modification time, so make them distinct
+        past = time.time() - {"first": 30, "second": 20, "third": 10}[key]
+        os.utime(cache.get_entry_dir(key), (past, past))
+        if key == "second":
+            # Using "first" makes "second" the least recently used entry
+            cache.restore("first", {"out": str(tmp_path / "restored.dat")})
+
+    assert sorted(os.listdir(cache.entries_dir)) == ["first", "third"]
+
+
+def test_concurrent_store_and_restore(cache, output_files, tmp_path):
+    def store_and_restore(index):
+        cache.store("key", {"index": index}, output_files)
+        return cache.restore("key", {"out": str(tmp_path / f"restored_{index}.dat")})
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(store_and_restore, range(16)))
+
+    assert all(result is not None for result in results)
+    assert all((tmp_path / f"restored_{index}.dat").read_bytes() == b"raster" * 10 for index in range(16))
+    assert os.listdir(cache.entries_dir) == ["key"]
+
+
+def test_from_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv("OGC_RESULT_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("OGC_RESULT_CACHE_SIZE", "2048")
+
+    cache = ResultCache.from_environment()
+
+    assert cache.cache_dir == str(tmp_path / "cache")
+    assert cache.max_size == 2048
+
+
+def test_from_environment_not_configured(monkeypatch):
+    monkeypatch.delenv("OGC_RESULT_CACHE_DIR", raising=False)
+
+    assert ResultCache.from_environment() is None
@@ -0,0 +1,139 @@
+import json
+from unittest.mock import Mock
+
+import requests
+
+from GeneratorXML.galaxyxml_creator import GalaxyXmlTool
+from GeneratorXML.schema_resolver import SchemaResolver
+
+LINK_URL = "http://zoo-project.org/dl/link.json"
+
+EXTENDED_SCHEMA = {
+    "oneOf": [
+        {"allOf": [{"$ref": LINK_URL}, {"properties": {"type": {"enum": ["image/tiff", "image/png"]}}, "type": "object"}]},
+        {"allOf": [{"$ref": LINK_URL}, {"properties": {"type": {"enum": ["image/jpeg"]}}, "type": "object"}]},
+    ]
+}
+
+
+class FakeSession:
+    """
+    Serves JSON documents by URL and counts the requests. Unknown URLs fail with a connection error.
+    """
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.requests = []
+
+    def get(self, url, timeout):
+        self.requests.append(url)
+        if url not in self.documents:
+            raise requests.exceptions.ConnectionError("unreachable")
+        response = Mock(status_code=200)
+        response.json.return_value = self.documents[url]
+        return response
+
+
+def test_bundled_link_schema_resolves_offline():
+    resolver = SchemaResolver(offline=True)
+
+    resolved = resolver.resolve(EXTENDED_SCHEMA)
+
+    link = resolved["oneOf"][0]["allOf"][0]
+    assert link["required"] == ["href"]
+    # A repeated reference is resolved once and shared
+    assert resolved["oneOf"][1]["allOf"][0] is link
+    # The schema itself is not changed, and the parts without references are shared
+    assert EXTENDED_SCHEMA["oneOf"][0]["allOf"][0] == {"$ref": LINK_URL}
+    assert resolved["oneOf"][0]["allOf"][1] is EXTENDED_SCHEMA["oneOf"][0]["allOf"][1]
+    assert resolver.resolve(EXTENDED_SCHEMA["oneOf"][0]["allOf"][1]) is EXTENDED_SCHEMA["oneOf"][0]["allOf"][1]
+
+
+def test_fetched_schema_is_stored_on_disk(tmp_path):
+    url = "http://example.org/format.json"
+    session = FakeSession({url: {"definitions": {"format": {"enum": ["text/csv"]}}}})
+    schema = {"items": {"$ref": f"{url}#/definitions/format"}}
+
+    first = SchemaResolver(cache_dir=str(tmp_path), bundled_dir=None, session=session)
+    assert first.resolve(schema) == {"items": {"enum": ["text/csv"]}}
+    assert first.resolve({"$ref": f"{url}#/definitions/format"}) == {"enum": ["text/csv"]}
+    assert session.requests == [url]
+
+    second = SchemaResolver(cache_dir=str(tmp_path), bundled_dir=None, session=session, offline=True)
+    assert second.resolve(schema) == {"items": {"enum": ["text/csv"]}}
+    assert session.requests == [url]
+
+
+def test_unreachable_reference_is_requested_once_and_kept(capsys):
+    session = FakeSession({})
+    resolver = SchemaResolver(bundled_dir=None, session=session)
+    schema = {"allOf": [{"$ref": "http://example.org/missing.json"}, {"$ref": "http://example.org/missing.json"}]}
+
+    assert resolver.resolve(schema) == schema
+    assert session.requests == ["http://example.org/missing.json"]
+    assert "Failed to retrieve referenced schema http://example.org/missing.json" in capsys.readouterr().out
+
+
+def test_relative_references_and_cycles():
+    session = FakeSession(
+        {
+            "http://example.org/a.json": {"title": "a", "properties": {"b": {"$ref": "b.json"}}},
+            "http://example.org/b.json": {"title": "b", "properties": {"a": {"$ref": "a.json"}}},
+        }
+    )
+    resolver = SchemaResolver(bundled_dir=None, session=session)
+
+    resolved = resolver.resolve({"$ref": "http://example.org/a.json"})
+
+    assert resolved["properties"]["b"]["title"] == "b"
+    # The reference back to a.json is a cycle and stays in place
+    assert resolved["properties"]["b"]["properties"]["a"] == {"$ref": "a.json"}
+
+
+def test_keywords_next_to_a_reference_override_the_referenced_schema():
+    resolver = SchemaResolver(offline=True)
+
+    resolved = resolver.resolve({"$ref": LINK_URL, "title": "Input link", "nullable": True})
+
+    assert (resolved["title"], resolved["nullable"], resolved["type"]) == ("Input link", True, "object")
+    assert "$ref" not in resolved
+
+
+def test_local_references_without_base_url_are_kept():
+    schema = {"definitions": {"a": {"enum": ["x"]}}, "oneOf": [{"$ref": "#/definitions/a"}]}
+
+    assert SchemaResolver(bundled_dir=None, offline=True).resolve(schema) == schema
+
+
+def test_deep_schema_is_resolved_without_recursion():
+    schema = {"$ref": LINK_URL}
+    for _ in range(5000):
+        schema = {"oneOf": [schema]}
+
+    resolved = SchemaResolver(offline=True).resolve(schema)
+
+    for _ in range(5000):
+        resolved = resolved["oneOf"][0]
+    assert resolved["required"] == ["href"]
+
+
+def test_galaxy_xml_tool_builds_data_param_from_resolved_schema(tmp_path):
+    schemas_dir = tmp_path / "schemas"
+    schemas_dir.mkdir()
+    url = "http://example.org/raster.json"
+    (schemas_dir / "raster.json").write_text(json.dumps({"$id": url, "properties": {"type": {"enum": ["image/tiff"]}}}))
+    resolver = SchemaResolver(bundled_dir=str(schemas_dir), offline=True)
+    tool = GalaxyXmlTool(name="tool", id="tool", version="1.0.0", description="tool", schema_resolver=resolver)
+    param_info = {
+        "title": "Raster",
+        "description": "Raster",
+        "schema": {"oneOf": [{"type": "string"}]},
+        "extended-schema": {"oneOf": [{"$ref": url}]},
+    }
+
+    inputs = tool.create_params(input_schema={"raster": param_info}, output_schema={}, transmission_schema=[])
+
+    assert tool.process_ir.inputs[0].media_types == ("image/tiff",)
+    assert (
+        inputs.children[0].node.get("help").startswith("Raster The following data types are allowed in the txt file: tiff.")
+    )
@@ -0,0 +1,50 @@
+import math
+
+from GeneratorXML.schema_resolver import SchemaResolver
+from GeneratorXML.schema_utils import get_array_items, replace_dot_with_underscore, resolve_extended_schema
+
+
+def test_replace_dot_with_underscore():
+    assert replace_dot_with_underscore("example.test") == "example_test"
+    assert replace_dot_with_underscore("another.test.case") == "another_test_case"
+    assert replace_dot_with_underscore("no_dots_here") == "no_dots_here"
+    assert replace_dot_with_underscore("") == ""
+    assert replace_dot_with_underscore("only.one.dot.") == "only_one_dot_"
+
+
+def test_get_array_items():
+    # Test case 1: Empty constraints
+    schema = {"oneOf": []}
+    assert get_array_items(schema) == (math.inf, -math.inf)
+
+    # Test case 2: Single constraint with minItems and maxItems
+    schema = {"oneOf": [{"minItems": 2, "maxItems": 5}]}
+    assert get_array_items(schema) == (2, 5)
+
+    # Test case 3: Multiple constraints
+    schema = {"oneOf": [{"minItems": 1, "maxItems": 4}, {"minItems": 3, "maxItems": 6}]}
+    assert get_array_items(schema) == (1, 6)
+
+    # Test case 4: Constraints with only minItems
+    schema = {"oneOf": [{"minItems": 2}, {"minItems": 4}]}
+    assert get_array_items(schema) == (2, -math.inf)
+
+    # Test case 5: Constraints with only maxItems
+    schema = {"oneOf": [{"maxItems": 5}, {"maxItems": 7}]}
+    assert get_array_items(schema) == (math.inf, 7)
+
+    # Test case 6: Constraints with minItems and one maxItems
+    schema = {"oneOf": [{"minItems": 2}, {"minItems": 1, "maxItems": 3}, {"minItems": 4}]}
+    assert get_array_items(schema) == (1, 3)
+
+    # Test case 7: Constraints with maxItems and no minItems
+    schema = {"oneOf": [{"maxItems": 4}, {"maxItems": 2}, {"maxItems": 5}]}
+    assert get_array_items(schema) == (math.inf, 5)
+
+
+def test_resolve_extended_schema():
+    schema = {"oneOf": [{"$ref": "http://zoo-project.org/dl/link.json"}]}
+
+    assert resolve_extended_schema(None, SchemaResolver(offline=True)) is None
+    assert resolve_extended_schema(schema, None) is schema
+    assert resolve_extended_schema(schema, SchemaResolver(offline=True))["oneOf"][0]["required"] == ["href"]
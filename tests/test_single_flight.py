@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+
+import sys
+
+# Add the parent directory to the system path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Tools", "Code")))
+
+from Tools.Code.single_flight import SingleFlight
+
+
+def run_leader(lock_dir, locked, record):
+    with SingleFlight(lock_dir).run("key") as flight:
+        locked.set()
+        time.sleep(0.3)
+        if record:
+            flight.record("12345", {"out": {"href": "https://ospd.geolabs.fr:8300/temp/out.tiff"}})
+
+
+@pytest.fixture
+def start_leader(tmp_path):
+    processes = []
+
+    def start(record):
+        locked = multiprocessing.Event()
+        process = multiprocessing.Process(target=run_leader, args=(str(tmp_path), locked, record))
+        process.start()
+        processes.append(process)
+        assert locked.wait(timeout=10)
+
+    yield start
+    for process in processes:
+        process.join(timeout=10)
+
+
+def test_first_job_executes(tmp_path):
+    with SingleFlight(str(tmp_path)).run("key") as flight:
+        assert flight.result is None
+
+
+def test_waiting_job_reuses_result(tmp_path, start_leader):
+    start_leader(record=True)
+
+    with SingleFlight(str(tmp_path)).run("key") as flight:
+        assert flight.job_id == "12345"
+        assert flight.result == {"out": {"href": "https://ospd.geolabs.fr:8300/temp/out.tiff"}}
+
+
+def test_waiting_job_executes_if_first_job_failed(tmp_path, start_leader):
+    start_leader(record=False)
+
+    with SingleFlight(str(tmp_path)).run("key") as flight:
+        assert flight.result is None
+
+
+def test_old_result_is_not_reused(tmp_path, start_leader):
+    with SingleFlight(str(tmp_path)).run("key") as flight:
+        flight.record("old", {})
+    past = time.time() - 60
+    os.utime(flight.result_path, (past, past))
+    start_leader(record=False)
+
+    with SingleFlight(str(tmp_path)).run("key") as flight:
+        assert flight.result is None
+
+
+def test_prune_removes_old_results(tmp_path):
+    single_flight = SingleFlight(str(tmp_path), max_age=10)
+    old_result = tmp_path / "old.result.json"
+    old_result.write_text("{}")
+    past = time.time() - 60
+    os.utime(old_result, (past, past))
+    (tmp_path / "new.result.json").write_text("{}")
+    (tmp_path / "old.lock").write_text("")
+    os.utime(tmp_path / "old.lock", (past, past))
+
+    single_flight.prune()
+
+    assert sorted(os.listdir(tmp_path)) == ["new.result.json", "old.lock"]
+
+
+def test_from_environment(monkeypatch, tmp_path):
+    monkeypatch.setenv("OGC_SINGLE_FLIGHT_DIR", str(tmp_path))
+
+    assert SingleFlight.from_environment().lock_dir == str(tmp_path)
+
+
+def test_from_environment_not_configured(monkeypatch):
+    monkeypatch.delenv("OGC_SINGLE_FLIGHT_DIR", raising=False)
+
+    assert SingleFlight.from_environment() is None
@@ -0,0 +1,119 @@
+import io
+import tracemalloc
+
+import galaxyxml.tool.parameters as gtpx
+import pytest
+
+from GeneratorXML.xml_stream_writer import StreamingTool, ToolXMLStreamWriter
+
+
+@pytest.fixture
+def streaming_tool():
+    tool = StreamingTool(
+        name="hellor",
+        id="hellor",
+        version="1.0",
+        description="Hello World",
+        executable="",
+        macros=["Macros/hellor_macros_.xml"],
+    )
+    tool.inputs = gtpx.Inputs()
+    tool.inputs.append(gtpx.TextParam("name", label="Name", help="Your name", value="World"))
+    select = gtpx.SelectParam("format", label="Format", options={"text/plain": "text/plain", "text/html": "text/html"})
+    tool.inputs.append(select)
+    tool.outputs = gtpx.Outputs()
+    tool.outputs.append(gtpx.OutputData("output_data", format="txt", from_work_dir="out.txt"))
+    tool.help = "Output and Hello World string"
+    return tool
+
+
+def test_export_still_returns_string(streaming_tool):
+    xml = streaming_tool.export()
+
+    assert isinstance(xml, str)
+    assert xml.startswith("<tool")
+
+
+def test_export_root(streaming_tool):
+    root = streaming_tool.export_root()
+
+    assert root.tag == "tool"
+    assert root.find("inputs") is not None
+    assert streaming_tool.capture_root is False
+
+
+def test_export_root_in_place(streaming_tool):
+    root = streaming_tool.export_root(in_place=True)
+
+    # The sections of the tool itself are moved below the root instead of copies
+    assert root.find("inputs") is streaming_tool.inputs.node
+    assert streaming_tool.export_in_place is False
+
+
+def test_write_matches_export(streaming_tool):
+    expected = streaming_tool.export()
+    buffer = io.BytesIO()
+
+    ToolXMLStreamWriter().write(streaming_tool, buffer)
+
+    assert buffer.getvalue().decode("utf-8") == expected
+
+
+def test_write_without_pretty_print(streaming_tool):
+    buffer = io.BytesIO()
+
+    ToolXMLStreamWriter(pretty_print=False).write(streaming_tool, buffer)
+
+    written = buffer.getvalue().decode("utf-8")
+    assert "\n  <inputs>" not in written
+    assert "<inputs><param" in written
+    assert written.startswith("<tool") and written.endswith("</tool>")
+
+
+def test_write_file(streaming_tool, tmp_path):
+    expected = streaming_tool.export()
+    file_path = tmp_path / "hellor.xml"
+
+    ToolXMLStreamWriter().write_file(streaming_tool, str(file_path))
+
+    assert file_path.read_text() == expected
+
+
+def test_write_nested_params_matches_export(streaming_tool):
+    section = gtpx.Section("advanced", title="Advanced")
+    conditional = gtpx.Conditional("mode", label="Mode")
+    conditional.append(gtpx.SelectParam("select", label="Select", options={"a": "a", "b": "b"}))
+    conditional.append(gtpx.When("a"))
+    section.append(conditional)
+    streaming_tool.inputs.append(section)
+    expected = streaming_tool.export()
+    buffer = io.BytesIO()
+
+    ToolXMLStreamWriter().write(streaming_tool, buffer)
+
+    assert buffer.getvalue().decode("utf-8") == expected
+
+
+def test_write_does_not_copy_large_select(tmp_path):
+    def create_tool():
+        tool = StreamingTool(name="epsg", id="epsg", version="1.0", description="EPSG", executable="", macros=[])
+        tool.inputs = gtpx.Inputs()
+        tool.inputs.append(gtpx.SelectParam("crs", label="CRS", options={f"EPSG:{i}": f"EPSG:{i}" for i in range(5000)}))
+        tool.help = "EPSG"
+        return tool
+
+    def measure_peak(write):
+        tool = create_tool()
+        tracemalloc.start()
+        try:
+            write(tool)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    export_peak = measure_peak(lambda tool: (tmp_path / "export.xml").write_text(tool.export()))
+    stream_peak = measure_peak(lambda tool: ToolXMLStreamWriter().write_file(tool, str(tmp_path / "stream.xml")))
+
+    assert (tmp_path / "stream.xml").read_text() == (tmp_path / "export.xml").read_text()
+    # Neither a copy of the parameters nor the whole document is held in memory
+    assert stream_peak < export_peak / 5